@@ -1,12 +1,15 @@
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
-from utils.data_fetcher import get_crypto_data, get_market_overview, get_historical_data
+from utils.data_fetcher import get_crypto_data, get_market_overview, get_historical_data, get_coin_symbol
 from utils.bias_detector import BiasDetector, analyze_trading_behavior, simulate_trading_decision
 from utils.sentiment_analyzer import SentimentAnalyzer
 from utils.news_scraper import scrape_crypto_news
 from utils.ml_models import CryptoPredictor
+from utils.indicators import IndicatorHistory
 from utils.database import get_database
+from utils.correlation_engine import build_panel, get_correlation_engine
+from utils.sentiment_snapshot import get_sentiment_snapshot_service
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -322,8 +325,19 @@ def market_data_page():
                 prices = [point[1] for point in historical_data['prices']]
                 dates = [datetime.fromtimestamp(point[0]/1000) for point in historical_data['prices']]
                 if len(prices) >= 20:
-                    sma_20 = pd.Series(prices).rolling(window=20).mean().tolist()
-                    sma_50 = pd.Series(prices).rolling(window=50).mean().tolist() if len(prices) >= 50 else None
+                    # Indicators are kept per coin/range and only fed ticks newer than the last refresh
+                    history_key = f"indicators_{crypto_id}_{selected_range}"
+                    if history_key not in st.session_state:
+                        st.session_state[history_key] = IndicatorHistory()
+                    indicator_history = st.session_state[history_key]
+                    indicator_history.extend(
+                        [point[0] for point in historical_data['prices']],
+                        prices,
+                        [point[1] for point in historical_data['total_volumes']]
+                    )
+                    sma_timestamps, sma_20 = indicator_history.series('bb_middle', since=historical_data['prices'][0][0])
+                    sma_dates = [datetime.fromtimestamp(t/1000) for t in sma_timestamps]
+                    sma_50 = indicator_history.series('ma_50', since=sma_timestamps[0])[1] if len(prices) >= 50 else None
                     fig_tech = go.Figure()
                     fig_tech.add_trace(go.Scatter(
                         x=dates,
@@ -333,7 +347,7 @@ def market_data_page():
                         line=dict(color='#FF6B35')
                     ))
                     fig_tech.add_trace(go.Scatter(
-                        x=dates,
+                        x=sma_dates,
                         y=sma_20,
                         mode='lines',
                         name='SMA 20',
@@ -341,7 +355,7 @@ def market_data_page():
                     ))
                     if sma_50:
                         fig_tech.add_trace(go.Scatter(
-                            x=dates,
+                            x=sma_dates,
                             y=sma_50,
                             mode='lines',
                             name='SMA 50',
@@ -796,6 +810,22 @@ def bias_analysis_page():
     st.markdown("**Remember**: Awareness of biases is the first step to overcoming them. Regular self-assessment and mindful trading practices are key to improvement.")
     # --- End migrated content ---
 
+# CoinGecko ids for the sentiment page's coin names
+SENTIMENT_COIN_IDS = {
+    'Bitcoin': 'bitcoin', 'Ethereum': 'ethereum', 'Binance Coin': 'binancecoin', 'Cardano': 'cardano',
+    'Solana': 'solana', 'Polkadot': 'polkadot', 'Dogecoin': 'dogecoin', 'Polygon': 'matic-network',
+    'Avalanche': 'avalanche-2', 'Chainlink': 'chainlink'
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_price_series(coin_id, days):
+    """Price history as a timestamp-indexed Series (cached, the API is rate limited)"""
+    data = get_historical_data(coin_id, days)
+    if not data or not data.get('prices'):
+        return pd.Series(dtype=float)
+    return pd.Series([point[1] for point in data['prices']],
+                     index=pd.to_datetime([point[0] for point in data['prices']], unit='ms'))
+
 def sentiment_analysis_page():
     # Page header with gradient background
     st.markdown('''
@@ -838,7 +868,7 @@ def sentiment_analysis_page():
         st.header(f"📊 Real-time Sentiment Analysis: {selected_crypto}")
         col1, col2, col3, col4 = st.columns(4)
         try:
-            current_sentiment = sentiment_analyzer.get_current_sentiment(selected_crypto.lower())
+            current_sentiment = get_sentiment_snapshot_service().current(SENTIMENT_COIN_IDS[selected_crypto])
             with col1:
                 sentiment_score = current_sentiment.get('overall_score', 0)
                 sentiment_label = sentiment_analyzer.get_sentiment_label(sentiment_score)
@@ -949,7 +979,7 @@ def sentiment_analysis_page():
             key="sentiment_hist_range"
         )
         days = {"7 Days": 7, "30 Days": 30, "90 Days": 90, "180 Days": 180}[time_range]
-        historical_data = sentiment_analyzer.get_historical_sentiment(selected_crypto.lower(), days)
+        historical_data = sentiment_analyzer.get_historical_sentiment(SENTIMENT_COIN_IDS[selected_crypto], days)
         st.subheader(f"Sentiment Trend - {time_range}")
         if historical_data:
             df_hist = pd.DataFrame(historical_data)
@@ -981,15 +1011,58 @@ def sentiment_analysis_page():
                 min_sentiment = df_hist['sentiment_score'].min()
                 st.metric("Most Negative", f"{min_sentiment:.3f}")
             st.subheader("Sentiment vs Price Correlation")
-            correlation_score = 0.65
-            st.metric("Sentiment-Price Correlation", f"{correlation_score:.2f}", 
-                     "Strong positive correlation" if correlation_score > 0.5 else "Weak correlation")
+            heatmap_coins = st.multiselect(
+                "Coins to compare",
+                crypto_options,
+                default=list(dict.fromkeys([selected_crypto] + crypto_options[:4])),
+                key="sentiment_corr_coins"
+            )
+            if selected_crypto not in heatmap_coins:
+                heatmap_coins = [selected_crypto] + heatmap_coins
+            sentiment_by_coin, prices_by_coin = {}, {}
+            for coin in heatmap_coins:
+                coin_hist = df_hist if coin == selected_crypto else pd.DataFrame(
+                    sentiment_analyzer.get_historical_sentiment(SENTIMENT_COIN_IDS[coin], days)
+                )
+                prices = load_price_series(SENTIMENT_COIN_IDS[coin], days)
+                if coin_hist.empty or prices.empty:
+                    continue
+                sentiment_by_coin[coin] = pd.Series(coin_hist['sentiment_score'].to_numpy(),
+                                                    index=pd.to_datetime(coin_hist['date']))
+                prices_by_coin[coin] = prices
+            if selected_crypto in sentiment_by_coin:
+                sentiment_panel, returns_panel = build_panel(sentiment_by_coin, prices_by_coin)
+                correlation = get_correlation_engine().analyze(sentiment_panel, returns_panel)
+                same_day = correlation['lagged'].loc[selected_crypto, 0]
+                strongest = correlation['strongest'].loc[selected_crypto]
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Sentiment-Price Correlation (same day)",
+                              f"{same_day:.2f}" if np.isfinite(same_day) else "n/a")
+                with col2:
+                    st.metric("Strongest Lag",
+                              f"{strongest['lag']:+.0f} days" if np.isfinite(strongest['lag']) else "n/a",
+                              f"{strongest['correlation']:.2f}" if np.isfinite(strongest['correlation']) else None)
+                if np.isfinite(same_day):
+                    st.caption(sentiment_analyzer.interpret_correlation(same_day))
+                fig_lags = px.imshow(
+                    correlation['lagged'],
+                    color_continuous_scale='RdBu',
+                    zmin=-1,
+                    zmax=1,
+                    aspect='auto',
+                    labels=dict(x="Lag (days, positive = sentiment leads price)", y="Coin", color="Correlation"),
+                    title="Sentiment vs. Daily Return Correlation by Lag"
+                )
+                st.plotly_chart(fig_lags, use_container_width=True)
+            else:
+                st.info("Not enough price data to correlate with sentiment.")
             st.subheader("Sentiment Distribution")
             fig_dist = px.histogram(df_hist, x='sentiment_score', nbins=20,
                                    title="Distribution of Sentiment Scores")
             st.plotly_chart(fig_dist, use_container_width=True)
         else:
-            st.warning("Unable to fetch historical sentiment data.")
+            st.info("No stored sentiment history yet for this coin; it fills in as sentiment is ingested.")
     elif analysis_type == "News Analysis":
         st.header(f"📰 News Sentiment Analysis: {selected_crypto}")
         news_sources = st.multiselect(
@@ -1003,8 +1076,11 @@ def sentiment_analysis_page():
             if news_data:
                 st.subheader("Recent News Articles")
                 analyzed_news = []
-                for article in news_data[:10]:
-                    sentiment_score = sentiment_analyzer.analyze_text(article['content'])
+                sentiment_scores = sentiment_analyzer.analyze_batch([article['content'] for article in news_data[:10]])
+                cache_stats = sentiment_analyzer.cache.stats()
+                st.caption(f"Sentiment score cache: {cache_stats['hit_rate']:.0%} hit rate, "
+                           f"{cache_stats['entries']} cached texts")
+                for article, sentiment_score in zip(news_data[:10], sentiment_scores):
                     analyzed_news.append({
                         'title': article['title'],
                         'source': article['source'],
@@ -1209,7 +1285,7 @@ def ml_forecasting_page():
             if model_type == "Ensemble Model":
                 st.header(f"🎯 Ensemble Model Predictions: {selected_crypto}")
                 with st.spinner("Training ensemble model..."):
-                    ensemble_results = predictor.train_ensemble_model(df, prediction_days)
+                    ensemble_results = predictor.train_ensemble_model(df, prediction_days, crypto_symbol=crypto_id)
                 if ensemble_results:
                     col1, col2, col3, col4 = st.columns(4)
                     with col1:
@@ -1243,15 +1319,16 @@ def ml_forecasting_page():
                         name='Predicted Price',
                         line=dict(color='#00FF00', width=2, dash='dash')
                     ))
-                    upper_bound = [p * (1 + ensemble_results['volatility']/100) for p in ensemble_results['predictions']]
-                    lower_bound = [p * (1 - ensemble_results['volatility']/100) for p in ensemble_results['predictions']]
+                    intervals = ensemble_results['prediction_intervals']
+                    upper_bound = list(intervals['p95'])
+                    lower_bound = list(intervals['p5'])
                     fig.add_trace(go.Scatter(
                         x=future_dates + future_dates[::-1],
                         y=upper_bound + lower_bound[::-1],
                         fill='toself',
                         fillcolor='rgba(0,255,0,0.1)',
                         line=dict(color='rgba(255,255,255,0)'),
-                        name='Confidence Interval'
+                        name='90% Prediction Interval'
                     ))
                     fig.update_layout(
                         title=f"{selected_crypto} Price Prediction - Ensemble Model",
@@ -1370,7 +1447,7 @@ def ml_forecasting_page():
             elif model_type == "All Models Comparison":
                 st.header(f"📊 All Models Comparison: {selected_crypto}")
                 with st.spinner("Training all models... This may take a few minutes."):
-                    all_results = predictor.compare_all_models(df, prediction_days)
+                    all_results = predictor.compare_all_models(df, prediction_days, crypto_symbol=crypto_id)
                 if all_results:
                     st.subheader("Model Performance Comparison")
                     comparison_data = []
@@ -1479,6 +1556,13 @@ def ml_forecasting_page():
             st.error("Unable to fetch historical data for model training.")
     except Exception as e:
         st.error(f"Error in ML forecasting: {str(e)}")
+    live_accuracy = get_database().get_model_accuracy(get_coin_symbol(crypto_id))
+    if live_accuracy:
+        st.subheader("Live Model Accuracy")
+        st.caption("Forecast error against realised prices, updated as stored predictions mature.")
+        df_live = pd.DataFrame(live_accuracy)[['model_type', 'sample_count', 'mae', 'rmse', 'mape', 'recent_mape', 'updated_at']]
+        df_live.columns = ['Model', 'Reconciled Predictions', 'MAE', 'RMSE', 'MAPE (%)', 'Recent MAPE (%)', 'Last Updated']
+        st.dataframe(df_live.round(2), use_container_width=True)
     st.header("🔍 Model Insights & Recommendations")
     insights = [
         "🎯 **Ensemble Advantage**: Ensemble models typically provide more stable predictions by combining multiple algorithms.",
@@ -0,0 +1,72 @@
+"""Benchmark compiled tree inference against native sklearn/XGBoost predict.
+
+Run from the backend directory:
+    python -m benchmarks.bench_compiled_inference
+"""
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.preprocessing import StandardScaler
+
+from utils.compiled_models import compile_tree_model
+from utils.ml_models import CryptoPredictor
+
+
+def synthetic_prices(n_rows, seed=0):
+    """Seeded random-walk price/volume frame"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=n_rows, freq='h'),
+        'price': 45000 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows))),
+        'volume': rng.uniform(2e10, 3e10, n_rows)
+    })
+
+
+def best_time(fn, repeats):
+    """Best wall time of `repeats` calls, in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    X, y, feature_cols, _ = CryptoPredictor().prepare_feature_matrix(synthetic_prices(5000), dtype=np.float64)
+    scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
+    X_frame = pd.DataFrame(X, columns=feature_cols)
+
+    # Same hyperparameters as CryptoPredictor.train_random_forest / train_ensemble_model / train_xgboost
+    models = {
+        'random_forest': (RandomForestRegressor(n_estimators=200, max_depth=10, random_state=42, n_jobs=-1), True),
+        'gradient_boosting': (GradientBoostingRegressor(n_estimators=100, random_state=42), True),
+        'xgboost': (xgb.XGBRegressor(n_estimators=200, max_depth=6, learning_rate=0.1, random_state=42, n_jobs=-1), False)
+    }
+
+    print(f"{'model':<18} {'rows':>6} {'native ms':>10} {'compiled ms':>12} {'speedup':>8} {'max rel err':>12}")
+    for name, (model, scaled) in models.items():
+        model.fit(X_scaled if scaled else X_frame, y)
+        compiled = compile_tree_model(model, scaler=scaler if scaled else None)
+
+        for n_rows, repeats in ((1, 200), (len(X), 5)):
+            raw = X[-n_rows:]
+
+            def native():
+                if scaled:
+                    return model.predict(scaler.transform(raw))
+                return model.predict(pd.DataFrame(raw, columns=feature_cols))
+
+            native_ms = best_time(native, repeats)
+            compiled_ms = best_time(lambda: compiled.predict(raw), repeats)
+            error = np.max(np.abs(native() - compiled.predict(raw)) / np.abs(native()))
+            print(f"{name:<18} {n_rows:>6} {native_ms:>10.3f} {compiled_ms:>12.3f} "
+                  f"{native_ms / compiled_ms:>7.1f}x {error:>12.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Accuracy/time trade-off of per-coin feature selection.
+
+Trains each tree model with all features and with the cached selection, and reports
+feature count, train time, single-row inference time and test-set accuracy.
+
+Run from the backend directory:
+    python -m benchmarks.bench_feature_selection
+"""
+import tempfile
+
+import numpy as np
+
+from benchmarks.bench_compiled_inference import synthetic_prices, best_time
+from utils import model_registry
+from utils.feature_selection import FeatureSelector
+from utils.ml_models import CryptoPredictor
+
+
+def main():
+    df = synthetic_prices(5000, seed=1)
+    X_all, _, feature_cols, _ = CryptoPredictor().prepare_feature_matrix(df, dtype=np.float64)
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        # Keeps the ensemble's stacking cache out of the real registry (and cold on every run)
+        model_registry.model_registry = model_registry.ModelRegistry(root_dir)
+        selector = FeatureSelector(root_dir)
+        print(f"{'model':<24} {'features':>8} {'train s':>8} {'infer ms':>9} {'rmse':>10} {'r2':>7}")
+        for trainer in ('train_random_forest', 'train_xgboost', 'train_ensemble_model'):
+            for label, predictor in (('all', CryptoPredictor()),
+                                     ('selected', CryptoPredictor(feature_selector=selector))):
+                result = getattr(predictor, trainer)(df, crypto_symbol='bench')
+                name = {'train_random_forest': 'random_forest', 'train_xgboost': 'xgboost',
+                        'train_ensemble_model': 'xgb'}[trainer]
+                model, inputs = predictor.models[name], predictor.model_inputs[name]
+                columns = inputs['feature_columns']
+                row = X_all[-1:, [feature_cols.index(col) for col in columns]]
+                if inputs['scaler'] is not None:
+                    row = inputs['scaler'].transform(row)
+                infer_ms = best_time(lambda: model.predict(row), 50)
+                print(f"{trainer[6:] + ' ' + label:<24} {len(columns):>8} {result['train_time']:>8.2f} "
+                      f"{infer_ms:>9.3f} {result['rmse']:>10.2f} {result['r2_score']:>7.3f}")
+
+        selection = selector.get('bench')
+        print(f"\nSelected ({len(selection['selected_columns'])}/{len(feature_cols)}): "
+              f"{', '.join(selection['selected_columns'])}")
+
+
+if __name__ == '__main__':
+    main()
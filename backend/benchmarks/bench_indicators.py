@@ -0,0 +1,69 @@
+"""Incremental IndicatorEngine vs. recomputing prepare_features on every tick.
+
+Streams a seeded random walk through the engine and, for each tick, through
+CryptoPredictor.prepare_features on the history so far; times both and checks that the
+engine's feature_vector matches the last prepare_features row on every model feature
+column (what a trained model is fed).
+
+Run from the backend directory:
+    python -m benchmarks.bench_indicators
+"""
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import IndicatorEngine
+from utils.ml_models import CryptoPredictor
+
+
+def synthetic_ticks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    volumes = rng.uniform(1e9, 5e9, n)
+    return pd.DataFrame({'date': pd.date_range('2024-01-01', periods=n, freq='h'),
+                         'price': prices, 'volume': volumes})
+
+
+def max_rel_diff(engine_values, frame_values):
+    worst = 0.0
+    for ours, theirs in zip(engine_values, frame_values):
+        if math.isnan(ours) or math.isnan(theirs):
+            if math.isnan(ours) != math.isnan(theirs):
+                return math.inf
+            continue
+        worst = max(worst, abs(ours - theirs) / max(abs(theirs), 1e-12))
+    return worst
+
+
+def main():
+    predictor = CryptoPredictor()
+    print(f"{'ticks':>6} {'engine us/tick':>15} {'recompute us/tick':>18} {'columns':>8} {'max rel diff':>13}")
+    for n in (200, 1000):
+        df = synthetic_ticks(n)
+        feature_columns = predictor.get_feature_columns(predictor.prepare_features(df))
+
+        engine = IndicatorEngine()
+        start = time.perf_counter()
+        vectors = []
+        for price, volume in zip(df['price'], df['volume']):
+            engine.update(price, volume)
+            vectors.append(engine.feature_vector(feature_columns))
+        engine_s = time.perf_counter() - start
+
+        # Recomputing per tick is slow, so time and compare it on the last 50 ticks
+        checked = range(n - 50, n)
+        worst = 0.0
+        start = time.perf_counter()
+        for i in checked:
+            row = predictor.prepare_features(df.iloc[:i + 1]).iloc[-1]
+            worst = max(worst, max_rel_diff(vectors[i], row[feature_columns].astype(float).tolist()))
+        recompute_s = (time.perf_counter() - start) / len(checked) * n
+
+        print(f"{n:>6} {engine_s / n * 1e6:>15.1f} {recompute_s / n * 1e6:>18.1f} "
+              f"{len(feature_columns):>8} {worst:>13.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Substring keyword scans vs. the single-scan KeywordMatcher.
+
+Times the crypto lexicon adjustment (per text and for a whole batch) and article
+relevance scoring (one coin, and every coin at once) over the seeded synthetic corpus from
+bench_sentiment. The lexicon adjustment ships the substring path; article relevance
+ships the per-coin matcher, which is slower than substring tests but only counts whole
+words, and the last line counts the articles where the two disagree.
+
+Run from the backend directory:
+    python -m benchmarks.bench_keyword_matcher
+"""
+import math
+import time
+
+from benchmarks.bench_sentiment import synthetic_corpus
+from utils.keyword_matcher import KeywordMatcher, keyword_matcher_for
+from utils.news_scraper import RELEVANCE_KEYWORDS
+from utils.sentiment_analyzer import MAX_ADJUSTMENT, TERM_WEIGHTS, SentimentAnalyzer
+
+TERM_WEIGHT_BY_TERM = dict(TERM_WEIGHTS)
+TERM_MATCHER = KeywordMatcher({term: [term] for term, _ in TERM_WEIGHTS}, whole_words=False)
+RELEVANCE_MATCHER = KeywordMatcher(RELEVANCE_KEYWORDS)
+
+
+def matcher_adjustment(text):
+    adjustment = math.fsum(TERM_WEIGHT_BY_TERM[term] for term in TERM_MATCHER.find_terms(text))
+    return max(-MAX_ADJUSTMENT, min(MAX_ADJUSTMENT, adjustment))
+
+
+def substring_relevance(article, coins):
+    title_lower, content_lower = article['title'].lower(), article['content'].lower()
+    return {
+        coin: sum(3 * (kw in title_lower) + (kw in content_lower) for kw in RELEVANCE_KEYWORDS[coin])
+        for coin in coins
+    }
+
+
+def matcher_relevance(article, coins):
+    if len(coins) == 1:
+        # Per-coin matcher: only that coin's vocabulary is compiled
+        matcher = keyword_matcher_for(tuple(RELEVANCE_KEYWORDS[coins[0]]))
+        return {coins[0]: 3 * len(matcher.find_terms(article['title'])) +
+                len(matcher.find_terms(article['content']))}
+    title_hits = RELEVANCE_MATCHER.count_by_label(article['title'])
+    content_hits = RELEVANCE_MATCHER.count_by_label(article['content'])
+    return {coin: 3 * title_hits.get(coin, 0) + content_hits.get(coin, 0) for coin in coins}
+
+
+def per_second(fn, items, repeat=5, batched=False):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if batched:
+            fn(items)
+        else:
+            for item in items:
+                fn(item)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+def main():
+    texts = synthetic_corpus(10_000)
+    articles = [{'title': texts[i], 'content': ' '.join(texts[i + 1:i + 6])} for i in range(0, 10_000, 6)]
+    all_coins = list(RELEVANCE_KEYWORDS)
+    analyzer = SentimentAnalyzer(cache=False)
+
+    print(f"{'case':<22} {'substring/s':>12} {'matcher/s':>12}")
+    print(f"{'lexicon, per text':<22} {per_second(analyzer.get_crypto_sentiment_adjustment, texts):>12.0f} "
+          f"{per_second(matcher_adjustment, texts):>12.0f}")
+    print(f"{'lexicon, batch':<22} "
+          f"{per_second(analyzer.get_crypto_sentiment_adjustments, texts, batched=True):>12.0f} "
+          f"{per_second(lambda batch: [matcher_adjustment(t) for t in batch], texts, batched=True):>12.0f}")
+    for label, coins in ((f'relevance, {len(all_coins)} coins', all_coins),) + tuple(
+            (f'relevance, {coin}', [coin]) for coin in ('bitcoin', 'ethereum', 'cardano')):
+        print(f"{label:<22} {per_second(lambda a: substring_relevance(a, coins), articles):>12.0f} "
+              f"{per_second(lambda a: matcher_relevance(a, coins), articles):>12.0f}")
+
+    substring_hits = sum(substring_relevance(a, ['ethereum'])['ethereum'] > 0 for a in articles)
+    matcher_hits = sum(matcher_relevance(a, ['ethereum'])['ethereum'] > 0 for a in articles)
+    print(f"ethereum-relevant articles: substring {substring_hits}, matcher {matcher_hits}")
+
+    # Single-text and batch adjustments must agree exactly (they share cache entries)
+    single = [analyzer.get_crypto_sentiment_adjustment(text) for text in texts]
+    batch = analyzer.get_crypto_sentiment_adjustments(texts)
+    print(f"per-text/batch adjustment mismatches: {sum(a != b for a, b in zip(single, batch))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""Benchmark suite for utils/ml_models.py.
+
+Times prepare_features, every CryptoPredictor trainer and compare_all_models on seeded
+synthetic price series, records peak memory, saves the run as JSON under
+benchmarks/results/ and compares it with the previous saved run to flag regressions.
+
+Run from the backend directory:
+    python -m benchmarks.bench_ml_models                      # 1k, 10k and 100k rows
+    python -m benchmarks.bench_ml_models --sizes 1000 10000 --cases prepare_features xgboost
+    python -m benchmarks.bench_ml_models --baseline benchmarks/results/<run>.json --fail-on-regression
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import sklearn
+import xgboost as xgb
+
+from benchmarks.bench_compiled_inference import synthetic_prices
+from utils.ml_models import CryptoPredictor, TENSORFLOW_AVAILABLE
+from utils.profiling import TrainingProfiler
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+PREDICTION_DAYS = 7
+
+# Case name -> callable(predictor, df); trainers report their own stage breakdown
+CASES = {
+    'prepare_features': lambda predictor, df: predictor.prepare_features(df),
+    'train_ensemble_model': lambda predictor, df: predictor.train_ensemble_model(df, PREDICTION_DAYS),
+    'train_random_forest': lambda predictor, df: predictor.train_random_forest(df, PREDICTION_DAYS),
+    'train_xgboost': lambda predictor, df: predictor.train_xgboost(df, PREDICTION_DAYS),
+    'train_lstm_model': lambda predictor, df: predictor.train_lstm_model(df, PREDICTION_DAYS),
+    'compare_all_models': lambda predictor, df: predictor.compare_all_models(df, PREDICTION_DAYS),
+}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scikit-learn': sklearn.__version__,
+        'xgboost': xgb.__version__,
+        'tensorflow': TENSORFLOW_AVAILABLE,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run_case(name, df, repeats):
+    """Best-of-`repeats` wall time, its CPU time and peak memory for one case"""
+    best = None
+    for _ in range(repeats):
+        # Memory is profiled by the benchmark itself, so the trainer's own profiler skips it
+        predictor = CryptoPredictor(profile_memory=None)
+        profiler = TrainingProfiler(name).start()
+        output = CASES[name](predictor, df)
+        profiler.lap('total')
+        report = profiler.stop()
+        if best is None or report['total_wall_seconds'] < best['wall_seconds']:
+            best = {
+                'wall_seconds': report['total_wall_seconds'],
+                'cpu_seconds': report['total_cpu_seconds'],
+                'peak_memory_mb': report['peak_memory_mb'],
+                'ok': output is not None
+            }
+            if isinstance(output, dict) and 'timings' in output:
+                best['stages'] = {
+                    stage: stats['wall_seconds'] for stage, stats in output['timings']['stages'].items()
+                }
+    return best
+
+
+def latest_result(exclude=None):
+    """Most recent saved run, or None"""
+    runs = sorted(RESULTS_DIR.glob('*.json'))
+    runs = [run for run in runs if run != exclude]
+    return runs[-1] if runs else None
+
+
+def compare(current, baseline, threshold):
+    """Rows of (case, rows, baseline s, current s, ratio, status) for cases in both runs"""
+    previous = {(r['case'], r['rows']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = previous.get((result['case'], result['rows']))
+        if before is None or not before['wall_seconds']:
+            continue
+        ratio = result['wall_seconds'] / before['wall_seconds']
+        if ratio > 1 + threshold:
+            status = 'REGRESSION'
+        elif ratio < 1 - threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append((result['case'], result['rows'], before['wall_seconds'], result['wall_seconds'], ratio, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=None)
+    parser.add_argument('--repeats', type=int, default=1, help='runs per case; the best is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', type=Path, default=None,
+                        help='run to compare against (default: the latest saved run)')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown reported as a regression')
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    cases = args.cases or [
+        name for name in CASES if name != 'train_lstm_model' or TENSORFLOW_AVAILABLE
+    ]
+    run = {
+        'recorded_at': datetime.utcnow().isoformat(),
+        'git_revision': git_revision(),
+        'environment': environment(),
+        'seed': args.seed,
+        'results': []
+    }
+
+    print(f"{'case':<22} {'rows':>8} {'wall s':>9} {'cpu s':>9} {'peak MB':>9}")
+    for n_rows in args.sizes:
+        df = synthetic_prices(n_rows, seed=args.seed)
+        for name in cases:
+            result = run_case(name, df, args.repeats)
+            run['results'].append({'case': name, 'rows': n_rows, **result})
+            peak = f"{result['peak_memory_mb']:.1f}" if result['peak_memory_mb'] is not None else 'n/a'
+            print(f"{name:<22} {n_rows:>8} {result['wall_seconds']:>9.3f} {result['cpu_seconds']:>9.3f} "
+                  f"{peak:>9}{'' if result['ok'] else '  (no result)'}")
+
+    saved = None
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        saved = RESULTS_DIR / f"{stamp}-{run['git_revision'] or 'nogit'}.json"
+        with open(saved, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nSaved {saved}")
+
+    baseline_path = args.baseline or latest_result(exclude=saved)
+    if baseline_path is None:
+        return 0
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    comparison = compare(run, baseline, args.threshold)
+    print(f"\nCompared with {baseline_path.name} (revision {baseline.get('git_revision')}):")
+    print(f"{'case':<22} {'rows':>8} {'before s':>9} {'now s':>9} {'ratio':>7}  status")
+    for case, n_rows, before, now, ratio, status in comparison:
+        print(f"{case:<22} {n_rows:>8} {before:>9.3f} {now:>9.3f} {ratio:>6.2f}x  {status}")
+
+    regressions = [row for row in comparison if row[-1] == 'REGRESSION']
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
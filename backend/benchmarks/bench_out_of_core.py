@@ -0,0 +1,65 @@
+"""Peak memory and time of chunked (out-of-core) training vs. in-memory training.
+
+Writes seeded synthetic minute-level history to CSV, then trains XGBoost in memory and
+through the external-memory path, plus the partial_fit SGD learner.
+
+Run from the backend directory:
+    python -m benchmarks.bench_out_of_core
+"""
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from utils.ml_models import CryptoPredictor
+from utils.out_of_core import ChunkedFeatureSource, IncrementalRegressor, train_xgboost_external
+from utils.profiling import TrainingProfiler
+
+NUM_BOOST_ROUND = 50
+CHUNK_ROWS = 100_000
+
+
+def write_history(path, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=n_rows, freq='min'),
+        'price': 45000 * np.exp(np.cumsum(rng.normal(0, 0.001, n_rows))),
+        'volume': rng.uniform(2e7, 3e7, n_rows)
+    }).to_csv(path, index=False)
+
+
+def run_method(method, path, tmp_dir):
+    """Train with one method and return its profiler report"""
+    profiler = TrainingProfiler(method).start()
+    if method == 'xgboost in-memory':
+        X, y, _, _ = CryptoPredictor().prepare_feature_matrix(pd.read_csv(path, parse_dates=['date']))
+        xgb.train({'max_depth': 6, 'learning_rate': 0.1, 'tree_method': 'hist', 'seed': 42},
+                  xgb.QuantileDMatrix(X, y), num_boost_round=NUM_BOOST_ROUND)
+    elif method == 'xgboost external':
+        train_xgboost_external(ChunkedFeatureSource(path, chunk_rows=CHUNK_ROWS),
+                               num_boost_round=NUM_BOOST_ROUND, cache_dir=tmp_dir)
+    else:
+        IncrementalRegressor(epochs=1).fit(ChunkedFeatureSource(path, chunk_rows=CHUNK_ROWS))
+    return profiler.stop()
+
+
+def main():
+    methods = ('xgboost in-memory', 'xgboost external', 'sgd partial_fit')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"{'rows':>9} {'method':<22} {'wall s':>8} {'peak MB':>8}")
+        for n_rows in (250_000, 1_000_000):
+            path = os.path.join(tmp_dir, f'history_{n_rows}.csv')
+            write_history(path, n_rows)
+            for method in methods:
+                # A fresh process per run, so one run's freed memory doesn't hide the next one's peak
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    report = pool.submit(run_method, method, path, tmp_dir).result()
+                print(f"{n_rows:>9} {method:<22} {report['total_wall_seconds']:>8.2f} "
+                      f"{report['peak_memory_mb'] or float('nan'):>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""Benchmark Monte-Carlo prediction interval simulation.
+
+Run from the backend directory:
+    python -m benchmarks.bench_prediction_intervals
+"""
+import time
+
+import numpy as np
+
+from utils.ml_models import monte_carlo_intervals
+
+
+def bench(n_paths, horizon, repeats=5):
+    """Return the best wall time in milliseconds for one interval simulation"""
+    rng = np.random.default_rng(0)
+    point = 45000 * np.cumprod(1 + rng.normal(0, 0.01, horizon))
+    residuals = rng.normal(0, 0.02, 73)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        monte_carlo_intervals(point, residuals, n_paths=n_paths)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    print(f"{'paths':>8} {'horizon':>8} {'best ms':>10}")
+    for horizon in (7, 30):
+        for n_paths in (1_000, 10_000, 100_000):
+            print(f"{n_paths:>8} {horizon:>8} {bench(n_paths, horizon):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Sentiment scoring throughput in texts/second.
+
+Compares the per-text analyze_text loop with SentimentAnalyzer.analyze_batch, in-process
+and on a process pool, over a seeded corpus of synthetic crypto headlines and posts, then
+re-scores the corpus against a warm score cache.
+
+Run from the backend directory:
+    python -m benchmarks.bench_sentiment
+"""
+import os
+import random
+import time
+
+import numpy as np
+
+from utils.sentiment_analyzer import SentimentAnalyzer, TERM_WEIGHTS
+from utils.sentiment_cache import SentimentCache
+
+COINS = ['bitcoin', 'ethereum', 'solana', 'cardano', 'dogecoin', 'chainlink']
+PHRASES = [
+    "is ready to go to the moon", "bulls are back, feeling bullish", "whales dump their bags",
+    "market crash wipes out leverage", "just a healthy dip before the rally", "total scam, avoid",
+    "volatility is rising again", "HODL with diamond hands", "traders got rekt overnight",
+    "consolidation continues near support", "network upgrade went smoothly", "fees are too high",
+    "institutional demand keeps growing", "panic sell pressure is fading", "price surge continues",
+]
+
+
+def synthetic_corpus(n_texts, seed=0):
+    """Seeded posts mixing coins, lexicon terms, URLs, mentions and hashtags"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n_texts):
+        words = [f"#{rng.choice(COINS)}", rng.choice(PHRASES), rng.choice(PHRASES)]
+        if rng.random() < 0.3:
+            words.append(f"@{rng.choice(COINS)}_news https://example.com/{rng.randrange(10**6)}")
+        if rng.random() < 0.5:
+            words.append(rng.choice(TERM_WEIGHTS)[0])
+        texts.append(' '.join(words))
+    return texts
+
+
+def throughput(fn, n_texts):
+    start = time.perf_counter()
+    result = fn()
+    return n_texts / (time.perf_counter() - start), result
+
+
+def main():
+    # Uncached, so every method really scores every text
+    analyzer = SentimentAnalyzer(cache=False)
+    workers = os.cpu_count() or 1
+    print(f"{'texts':>7} {'method':<28} {'texts/s':>10}")
+    try:
+        for n_texts in (1_000, 10_000):
+            texts = synthetic_corpus(n_texts)
+            loop_rate, loop_scores = throughput(lambda: [analyzer.analyze_text(t) for t in texts], n_texts)
+            serial_rate, serial_scores = throughput(lambda: analyzer.analyze_batch(texts, n_jobs=1), n_texts)
+            # First pool call includes worker start-up; time the warm pool
+            analyzer.analyze_batch(texts[:1000], n_jobs=workers)
+            pool_rate, pool_scores = throughput(lambda: analyzer.analyze_batch(texts, n_jobs=workers), n_texts)
+            assert np.allclose(loop_scores, serial_scores) and np.allclose(serial_scores, pool_scores)
+
+            print(f"{n_texts:>7} {'analyze_text loop':<28} {loop_rate:>10.0f}")
+            print(f"{n_texts:>7} {'analyze_batch (1 process)':<28} {serial_rate:>10.0f}")
+            print(f"{n_texts:>7} {f'analyze_batch (pool of {workers})':<28} {pool_rate:>10.0f}")
+
+            cache = SentimentCache(max_entries=n_texts)
+            cached_analyzer = SentimentAnalyzer(cache=cache)
+            cached_analyzer.analyze_batch(texts, n_jobs=1)
+            warm_rate, warm_scores = throughput(lambda: cached_analyzer.analyze_batch(texts, n_jobs=1), n_texts)
+            assert np.allclose(serial_scores, warm_scores)
+            print(f"{n_texts:>7} {'analyze_batch (warm cache)':<28} {warm_rate:>10.0f}"
+                  f"   cumulative hit rate {cache.stats()['hit_rate']:.0%}")
+    finally:
+        analyzer.close()
+
+
+if __name__ == '__main__':
+    main()
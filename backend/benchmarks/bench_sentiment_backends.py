@@ -0,0 +1,88 @@
+"""Speed and agreement of the fast lexicon sentiment backend against the TextBlob/VADER blend.
+
+Runs backend_agreement_report on a small hand-labeled set of crypto headlines (accuracy
+against the labels) and on the seeded synthetic corpus from bench_sentiment (speed and
+agreement with the blend).
+
+Run from the backend directory:
+    python -m benchmarks.bench_sentiment_backends
+"""
+from benchmarks.bench_sentiment import synthetic_corpus
+from utils.sentiment_analyzer import SENTIMENT_BACKENDS, backend_agreement_report
+
+LABELED_SAMPLE = [
+    ("Bitcoin surges past resistance as institutional demand keeps growing", 'Positive'),
+    ("Ethereum upgrade goes live smoothly, fees drop sharply", 'Positive'),
+    ("Solana network suffers another outage, validators scramble", 'Negative'),
+    ("Analysts are optimistic about Cardano's long-term prospects", 'Positive'),
+    ("Exchange halts withdrawals amid insolvency fears", 'Negative'),
+    ("Dogecoin trades sideways ahead of the weekend", 'Neutral'),
+    ("Regulators sue crypto lender over alleged fraud", 'Negative'),
+    ("Chainlink announces new partnership with major bank", 'Positive'),
+    ("Bitcoin price unchanged after Fed meeting", 'Neutral'),
+    ("Investors panic sell as market crash wipes out billions", 'Negative'),
+    ("Polygon sees record daily active addresses", 'Positive'),
+    ("Hackers drain bridge in massive exploit", 'Negative'),
+    ("Avalanche foundation publishes quarterly report", 'Neutral'),
+    ("Great week for altcoins, bulls are back", 'Positive'),
+    ("Traders got rekt overnight after a brutal liquidation cascade", 'Negative'),
+    ("Binance lists two new trading pairs", 'Neutral'),
+    ("This rally is not sustainable, warns strategist", 'Negative'),
+    ("Strong support holds and the outlook remains bullish", 'Positive'),
+    ("Polkadot parachain auction concludes on schedule", 'Neutral'),
+    ("Whales dump their bags as sentiment sours", 'Negative'),
+    ("Happy to see adoption growing so fast!", 'Positive'),
+    ("Terrible liquidity makes this token a scam", 'Negative'),
+    ("Miners move coins to exchanges", 'Neutral'),
+    ("Excellent earnings lift crypto stocks", 'Positive'),
+    ("Ethereum gas fees are too high and users are frustrated", 'Negative'),
+    ("Bitcoin hash rate reaches new all-time high, a healthy sign for security", 'Positive'),
+    ("The token's volatility worries cautious investors", 'Negative'),
+    ("Stablecoin supply stays flat this month", 'Neutral'),
+    ("Amazing comeback for the market, HODL pays off", 'Positive'),
+    ("Not a great day: prices slide across the board", 'Negative'),
+    # Negation, dampeners and idioms, where a reduced rule set drifts from the blend
+    ("Never been so happy about a pump", 'Positive'),
+    ("Not bad, not great: Bitcoin ends the quarter flat", 'Neutral'),
+    ("Bitcoin is the bomb this cycle", 'Positive'),
+    ("Can't say I'm happy with this listing", 'Negative'),
+    ("Don't panic, the dip is not that bad", 'Positive'),
+    ("The new wallet is kind of good", 'Positive'),
+    ("Never this confident about Ethereum", 'Positive'),
+    ("No gains or profits for miners this week", 'Negative'),
+    ("The merge went off without doubt the best upgrade yet", 'Positive'),
+    ("Yeah right, another 'guaranteed' 100x coin", 'Negative'),
+    ("This airdrop is not worth the gas fees", 'Negative'),
+    ("At least the exchange did not lose user funds", 'Positive'),
+    ("Not really a good sign for altcoins", 'Negative'),
+    ("That roadmap was the kiss of death for the project", 'Negative'),
+    ("Fees are NOT low, users are NOT happy!", 'Negative'),
+    ("Hardly a bullish signal, but the outlook is still decent", 'Positive'),
+]
+
+
+def print_report(title, report):
+    print(f"\n{title} ({report['n']} texts)")
+    print(f"  {report['backend_name']:<8} {report['backend_ms_per_text']:.3f} ms/text")
+    print(f"  {report['reference_name']:<8} {report['reference_ms_per_text']:.3f} ms/text "
+          f"(x{report['speedup']:.1f} slower)")
+    print(f"  pearson r {report['pearson_r']:.4f}, mean |diff| {report['mean_abs_diff']:.4f}, "
+          f"label agreement {report['label_agreement']:.1%}")
+    if 'backend_accuracy' in report:
+        print(f"  accuracy vs. labels: {report['backend_name']} {report['backend_accuracy']:.1%}, "
+              f"{report['reference_name']} {report['reference_accuracy']:.1%}")
+
+
+def main():
+    texts, labels = zip(*LABELED_SAMPLE)
+    for name in SENTIMENT_BACKENDS:
+        if name == 'blend':
+            continue
+        print_report(f"Labeled headlines, {name} vs. blend",
+                     backend_agreement_report(list(texts), name, labels=list(labels)))
+        print_report(f"Synthetic corpus, {name} vs. blend",
+                     backend_agreement_report(synthetic_corpus(10_000), name))
+
+
+if __name__ == '__main__':
+    main()
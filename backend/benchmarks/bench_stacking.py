@@ -0,0 +1,75 @@
+"""Benchmark stacked-ensemble retraining: cold fit vs. cached base models.
+
+Also appends a month of rows and compares a full retrain with `refit_meta_only`, which
+keeps the base models and refits the meta-learner on out-of-fold predictions extended
+with the new rows, and replays the batch job's rolling window (a fixed number of rows,
+moved forward a day at a time) to show when cached base models are reused.
+
+Run from the backend directory:
+    python -m benchmarks.bench_stacking
+"""
+import tempfile
+import time
+
+from benchmarks.bench_compiled_inference import synthetic_prices
+from utils import model_registry
+from utils.ml_models import STACKING_MAX_NEW_ROWS, CryptoPredictor
+
+
+def timed(fn):
+    """(result, wall time in seconds) of one call"""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root_dir:
+        model_registry.model_registry = model_registry.ModelRegistry(root_dir)
+
+        print(f"{'rows':>6} {'cold s':>8} {'cached s':>9} {'speedup':>8} {'weights (rf/gbr/xgb)':>24} {'r2':>7}")
+        for n_rows in (365, 2000):
+            df = synthetic_prices(n_rows)
+            cold, cold_s = timed(lambda: CryptoPredictor().train_ensemble_model(df, crypto_symbol=f'bench{n_rows}'))
+            # Drop the in-memory copy so the cached run includes loading state from disk
+            model_registry.model_registry._stacking.clear()
+            cached, cached_s = timed(lambda: CryptoPredictor().train_ensemble_model(df, crypto_symbol=f'bench{n_rows}'))
+            assert cached['reused_base_models'] and abs(cached['r2_score'] - cold['r2_score']) < 1e-9
+
+            weights = '/'.join(f"{w:.2f}" for w in cold['model_weights'].values())
+            print(f"{n_rows:>6} {cold_s:>8.2f} {cached_s:>9.3f} {cold_s / cached_s:>7.1f}x {weights:>24} "
+                  f"{cold['r2_score']:>7.3f}")
+
+        print(f"\n{'rows':>6} {'+rows':>6} {'retrain s':>10} {'meta-only s':>12} {'oof rows':>9} "
+              f"{'r2 retrain':>11} {'r2 meta-only':>13}")
+        for n_rows in (365, 2000):
+            df = synthetic_prices(n_rows + 30)
+            base = df.iloc[:n_rows]
+            symbol = f'append{n_rows}'
+            before = CryptoPredictor().train_ensemble_model(base, crypto_symbol=symbol)
+            retrained, retrain_s = timed(lambda: CryptoPredictor().train_ensemble_model(df))
+            extended, extend_s = timed(
+                lambda: CryptoPredictor().train_ensemble_model(df, crypto_symbol=symbol, refit_meta_only=True)
+            )
+            assert extended['reused_base_models']
+            assert extended['meta_training_rows'] > before['meta_training_rows']
+            print(f"{n_rows:>6} {30:>6} {retrain_s:>10.2f} {extend_s:>12.3f} "
+                  f"{before['meta_training_rows']:>4}->{extended['meta_training_rows']:<4} "
+                  f"{retrained['r2_score']:>11.3f} {extended['r2_score']:>13.3f}")
+
+
+        print(f"\n{'window':>6} {'shift':>6} {'seconds':>8} {'reused':>7} {'oof rows':>9} {'r2':>7}")
+        for n_rows in (365, 1000):
+            df = synthetic_prices(n_rows + STACKING_MAX_NEW_ROWS + 10)
+            symbol = f'rolling{n_rows}'
+            # Day 0 trains cold; later days reuse until the window has moved past
+            # STACKING_MAX_NEW_ROWS new training rows
+            for shift in (0, 1, 2, 7, STACKING_MAX_NEW_ROWS + 10):
+                window = df.iloc[shift:shift + n_rows].reset_index(drop=True)
+                result, seconds = timed(lambda: CryptoPredictor().train_ensemble_model(window, crypto_symbol=symbol))
+                print(f"{n_rows:>6} {shift:>6} {seconds:>8.2f} {str(result['reused_base_models']):>7} "
+                      f"{result['meta_training_rows']:>9} {result['r2_score']:>7.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import os
+
+from flask import Flask, jsonify, request
+from flask_cors import CORS
+
+from utils.forecast_cache import ForecastCache
+
+app = Flask(__name__)
+CORS(app, resources={r"/forecast/*": {"origins": "*"}}, expose_headers=["ETag"])
+
+cache = ForecastCache()
+
+# Clients may reuse a forecast for this long before revalidating with If-None-Match
+FORECAST_MAX_AGE = int(os.getenv("FORECAST_MAX_AGE", "60"))
+
+
+def cached_response(body, etag):
+    """JSON response for a precomputed body; answers 304 when If-None-Match matches"""
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = FORECAST_MAX_AGE
+    return response.make_conditional(request)
+
+
+@app.get("/forecast/health")
+def health():
+    return jsonify({"status": "ok", "coins": cache.list_coins()}), 200
+
+
+@app.get("/forecast/<coin>")
+def get_coin_forecasts(coin):
+    """All cached model forecasts for a coin"""
+    cached = cache.get(coin)
+    if cached is None:
+        return jsonify({"error": f"No forecasts available for {coin}"}), 404
+    return cached_response(*cached)
+
+
+@app.get("/forecast/<coin>/<model_type>")
+def get_model_forecast(coin, model_type):
+    """Cached forecast for one coin/model pair"""
+    cached = cache.get(coin, model_type)
+    if cached is None:
+        return jsonify({"error": f"No {model_type} forecast available for {coin}"}), 404
+    return cached_response(*cached)
+
+
+if __name__ == "__main__":
+    refresh_minutes = float(os.getenv("FORECAST_REFRESH_MINUTES", "0"))
+    if refresh_minutes > 0:
+        # In-process refresh for single-node setups; otherwise run forecast_worker.py
+        from utils.forecast_jobs import BatchForecastJob
+        BatchForecastJob(cache=cache).start(refresh_minutes * 60)
+    port = int(os.getenv("FORECAST_API_PORT", "5003"))
+    app.run(port=port, debug=True, use_reloader=False)
@@ -0,0 +1,46 @@
+import argparse
+import os
+
+from utils.forecast_jobs import BatchForecastJob
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Precompute ML forecasts for all tracked coins")
+    parser.add_argument("--interval-minutes", type=float,
+                        default=float(os.getenv("FORECAST_INTERVAL_MINUTES", "60")),
+                        help="Minutes between batch runs")
+    parser.add_argument("--once", action="store_true", help="Run a single batch and exit")
+    parser.add_argument("--coins", help="Comma separated CoinGecko ids (defaults to FORECAST_COINS)")
+    parser.add_argument("--models", help="Comma separated model types (ensemble,random_forest,xgboost,lstm)")
+    parser.add_argument("--days", type=int, default=7, help="Forecast horizon in days")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel training workers")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--register-models", action="store_true",
+                        help="Save fitted models and compiled artifacts to the model registry")
+    parser.add_argument("--select-features", action="store_true",
+                        help="Train tree models on each coin's cached feature selection")
+    parser.add_argument("--cross-asset", action="store_true",
+                        help="Add shared cross-asset features (BTC returns, market index, correlations)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    job = BatchForecastJob(
+        coins=args.coins.split(",") if args.coins else None,
+        model_types=args.models.split(",") if args.models else None,
+        prediction_days=args.days,
+        max_workers=args.workers,
+        executor=args.executor,
+        register_models=args.register_models,
+        select_features=args.select_features,
+        cross_asset=args.cross_asset
+    )
+    if args.once:
+        print(job.run_once())
+    else:
+        job.run_forever(args.interval_minutes * 60)
+
+
+if __name__ == "__main__":
+    main()
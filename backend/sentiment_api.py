@@ -0,0 +1,49 @@
+import os
+
+from flask import Flask, jsonify, request
+from flask_cors import CORS
+
+from utils.sentiment_snapshot import SNAPSHOT_REFRESH_SECONDS, get_sentiment_snapshot_service
+
+app = Flask(__name__)
+CORS(app, resources={r"/sentiment/*": {"origins": "*"}}, expose_headers=["ETag"])
+
+snapshots = get_sentiment_snapshot_service()
+
+# Clients may reuse a snapshot for this long before revalidating with If-None-Match
+SENTIMENT_MAX_AGE = int(os.getenv("SENTIMENT_MAX_AGE", "30"))
+
+
+def cached_response(body, etag):
+    """JSON response for a precomputed body; answers 304 when If-None-Match matches"""
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = SENTIMENT_MAX_AGE
+    return response.make_conditional(request)
+
+
+@app.get("/sentiment/health")
+def health():
+    return jsonify({"status": "ok", "coins": snapshots.coins}), 200
+
+
+@app.get("/sentiment/snapshot")
+def get_snapshot():
+    """Current sentiment for every tracked coin"""
+    return cached_response(*snapshots.get())
+
+
+@app.get("/sentiment/snapshot/<coin>")
+def get_coin_snapshot(coin):
+    """Current sentiment for one coin, by CoinGecko id or symbol"""
+    cached = snapshots.get(coin)
+    if cached is None:
+        return jsonify({"error": f"No sentiment snapshot available for {coin}"}), 404
+    return cached_response(*cached)
+
+
+if __name__ == "__main__":
+    snapshots.start(SNAPSHOT_REFRESH_SECONDS)
+    port = int(os.getenv("SENTIMENT_API_PORT", "5004"))
+    app.run(port=port, debug=True, use_reloader=False)
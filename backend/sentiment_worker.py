@@ -0,0 +1,59 @@
+import argparse
+import os
+import time
+
+from utils.forecast_cache import get_forecast_coins
+from utils.sentiment_alerts import get_sentiment_alert_engine
+from utils.sentiment_analyzer import DEFAULT_SENTIMENT_BACKEND, SENTIMENT_BACKENDS, SentimentAnalyzer
+from utils.sentiment_pipeline import SentimentPipeline, news_fetcher
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Stream news sentiment for tracked coins into the database")
+    parser.add_argument("--interval-minutes", type=float,
+                        default=float(os.getenv("SENTIMENT_INTERVAL_MINUTES", "15")),
+                        help="Minutes between polls of each news fetcher")
+    parser.add_argument("--once", action="store_true", help="Poll every fetcher once, drain and exit")
+    parser.add_argument("--coins", help="Comma separated CoinGecko ids (defaults to FORECAST_COINS)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Texts per scoring micro-batch")
+    parser.add_argument("--scorers", type=int, default=1, help="Scoring threads")
+    parser.add_argument("--jobs", type=int, default=1, help="Processes per large scoring batch")
+    parser.add_argument("--backend", choices=sorted(SENTIMENT_BACKENDS), default=DEFAULT_SENTIMENT_BACKEND,
+                        help="Sentiment scoring backend")
+    parser.add_argument("--alerts", action="store_true", help="Evaluate sentiment alert rules and print alerts")
+    return parser.parse_args()
+
+
+def print_alerts(alerts):
+    for alert in alerts:
+        print(f"[{alert['severity']}] {alert['message']}")
+
+
+def main():
+    args = parse_args()
+    coins = args.coins.split(",") if args.coins else get_forecast_coins()
+    interval_seconds = args.interval_minutes * 60
+    pipeline = SentimentPipeline(
+        analyzer=SentimentAnalyzer(backend=args.backend),
+        fetchers=[news_fetcher(coin) for coin in coins],
+        batch_size=args.batch_size,
+        scorer_workers=args.scorers,
+        n_jobs=args.jobs,
+        poll_interval=interval_seconds
+    )
+    if args.alerts:
+        get_sentiment_alert_engine().attach(pipeline).subscribe(print_alerts)
+    if args.once:
+        print(pipeline.run_once())
+        return
+    pipeline.start()
+    try:
+        while True:
+            time.sleep(interval_seconds)
+            print(f"Sentiment pipeline: {pipeline.metrics()}")
+    except KeyboardInterrupt:
+        print(pipeline.stop())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import json
+
+import numpy as np
+
+# Rows are evaluated in blocks so the (rows x trees) working arrays stay small
+MAX_BLOCK_CELLS = 1_000_000
+
+
+class CompiledTreeEnsemble:
+    """Fitted tree ensemble flattened into NumPy arrays for fast, dependency-light inference.
+
+    Every node of every tree lives in one set of flat arrays (split feature, threshold,
+    left/right child, missing-value direction, leaf value). Prediction walks all trees for
+    all rows together, one vectorized step per tree level, then combines the leaf values as
+    base_score + scale * sum(leaves). Optional input_mean/input_scale reproduce a
+    StandardScaler in front of the trees, so serving only needs NumPy.
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots,
+                 max_depth, base_score=0.0, scale=1.0, strict=False, n_features=None,
+                 input_mean=None, input_scale=None, source=''):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.base_score = float(base_score)
+        self.scale = float(scale)
+        # XGBoost sends x < threshold left, sklearn sends x <= threshold left
+        self.strict = bool(strict)
+        self.n_features = n_features
+        self.input_mean = None if input_mean is None else np.asarray(input_mean, dtype=np.float64)
+        self.input_scale = None if input_scale is None else np.asarray(input_scale, dtype=np.float64)
+        self.source = source
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def attach_scaler(self, scaler):
+        """Fold a fitted StandardScaler into the compiled model"""
+        if scaler is not None:
+            self.input_mean = np.asarray(scaler.mean_, dtype=np.float64)
+            self.input_scale = np.asarray(scaler.scale_, dtype=np.float64)
+        return self
+
+    def predict(self, X):
+        """Predict for a 2D array (or a single 1D row) of raw feature values"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.input_mean is not None:
+            X = (X - self.input_mean) / self.input_scale
+        # Both sklearn and XGBoost compare features in float32
+        X = X.astype(np.float32)
+
+        block = max(1, MAX_BLOCK_CELLS // max(self.n_trees, 1))
+        if len(X) <= block:
+            return self._predict_block(X)
+        return np.concatenate([
+            self._predict_block(X[start:start + block]) for start in range(0, len(X), block)
+        ])
+
+    def _predict_block(self, X):
+        """Walk every tree for a block of rows, one tree level per iteration"""
+        rows = np.arange(len(X))[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees))
+
+        for _ in range(self.max_depth):
+            feat = self.feature[nodes]
+            is_split = feat >= 0
+            if not is_split.any():
+                break
+            x = X[rows, np.where(is_split, feat, 0)]
+            threshold = self.threshold[nodes]
+            go_left = x < threshold if self.strict else x <= threshold
+            missing = np.isnan(x)
+            if missing.any():
+                go_left = np.where(missing, self.default_left[nodes], go_left)
+            next_nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            nodes = np.where(is_split, next_nodes, nodes)
+
+        return self.base_score + self.scale * self.value[nodes].sum(axis=1)
+
+    def save(self, path):
+        """Save the compiled arrays to an .npz file"""
+        meta = {
+            'max_depth': self.max_depth,
+            'base_score': self.base_score,
+            'scale': self.scale,
+            'strict': self.strict,
+            'n_features': self.n_features,
+            'source': self.source
+        }
+        arrays = {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'left': self.left,
+            'right': self.right,
+            'default_left': self.default_left,
+            'value': self.value,
+            'roots': self.roots,
+            'meta': np.array(json.dumps(meta))
+        }
+        if self.input_mean is not None:
+            arrays['input_mean'] = self.input_mean
+            arrays['input_scale'] = self.input_scale
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Load a compiled model saved with save()"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(
+                feature=data['feature'],
+                threshold=data['threshold'],
+                left=data['left'],
+                right=data['right'],
+                default_left=data['default_left'],
+                value=data['value'],
+                roots=data['roots'],
+                input_mean=data['input_mean'] if 'input_mean' in data else None,
+                input_scale=data['input_scale'] if 'input_scale' in data else None,
+                **meta
+            )
+
+
+def _flatten_sklearn_trees(trees):
+    """Concatenate sklearn tree_ structures into flat arrays with global node ids"""
+    parts = {'feature': [], 'threshold': [], 'left': [], 'right': [], 'default_left': [], 'value': []}
+    roots = []
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        t = tree.tree_
+        is_leaf = t.children_left < 0
+        # Leaves point to themselves so the traversal can keep indexing them safely
+        own = np.arange(t.node_count) + offset
+        parts['feature'].append(np.where(is_leaf, -1, t.feature))
+        parts['threshold'].append(t.threshold)
+        parts['left'].append(np.where(is_leaf, own, t.children_left + offset))
+        parts['right'].append(np.where(is_leaf, own, t.children_right + offset))
+        missing_left = getattr(t, 'missing_go_to_left', None)
+        parts['default_left'].append(
+            np.zeros(t.node_count, dtype=bool) if missing_left is None else missing_left.astype(bool)
+        )
+        parts['value'].append(t.value.reshape(t.node_count, -1)[:, 0])
+        roots.append(offset)
+        max_depth = max(max_depth, t.max_depth)
+        offset += t.node_count
+    flat = {key: np.concatenate(values) for key, values in parts.items()}
+    return flat, roots, max_depth
+
+
+def compile_random_forest(model):
+    """Compile a fitted RandomForestRegressor"""
+    flat, roots, max_depth = _flatten_sklearn_trees(model.estimators_)
+    return CompiledTreeEnsemble(
+        roots=roots, max_depth=max_depth, base_score=0.0, scale=1.0 / len(roots),
+        n_features=model.n_features_in_, source='random_forest', **flat
+    )
+
+
+def compile_gradient_boosting(model):
+    """Compile a fitted GradientBoostingRegressor (squared-error style losses)"""
+    init = model.init_
+    if isinstance(init, str) and init == 'zero':
+        base_score = 0.0
+    elif hasattr(init, 'constant_'):
+        base_score = float(np.ravel(init.constant_)[0])
+    else:
+        raise ValueError("Only constant initial estimators can be compiled")
+    flat, roots, max_depth = _flatten_sklearn_trees(model.estimators_[:, 0])
+    return CompiledTreeEnsemble(
+        roots=roots, max_depth=max_depth, base_score=base_score, scale=model.learning_rate,
+        n_features=model.n_features_in_, source='gradient_boosting', **flat
+    )
+
+
+def _xgb_base_score(booster):
+    """Read the global bias from an XGBoost booster config ("0.5" or "[4.5E4]" style)"""
+    config = json.loads(booster.save_config())
+    raw = config['learner']['learner_model_param']['base_score']
+    return float(str(raw).strip('[]').split(',')[0])
+
+
+def compile_xgboost(model):
+    """Compile a fitted XGBRegressor with an identity-link objective"""
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    config = json.loads(booster.save_config())
+    objective = config['learner']['objective']['name']
+    if objective not in ('reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror'):
+        raise ValueError(f"XGBoost objective '{objective}' cannot be compiled")
+
+    feature_names = booster.feature_names
+    feature_index = {name: i for i, name in enumerate(feature_names)} if feature_names else {}
+
+    def resolve_feature(name):
+        if name in feature_index:
+            return feature_index[name]
+        return int(name.lstrip('f'))
+
+    parts = {'feature': [], 'threshold': [], 'left': [], 'right': [], 'default_left': [], 'value': []}
+    roots = []
+    offset = 0
+    max_depth = 0
+    for dump in booster.get_dump(dump_format='json'):
+        nodes = {}
+        stack = [(json.loads(dump), 0)]
+        while stack:
+            node, depth = stack.pop()
+            nodes[node['nodeid']] = node
+            max_depth = max(max_depth, depth)
+            stack.extend((child, depth + 1) for child in node.get('children', []))
+
+        n_nodes = max(nodes) + 1
+        feature = np.full(n_nodes, -1, dtype=np.int32)
+        threshold = np.zeros(n_nodes)
+        own = np.arange(n_nodes) + offset
+        left = own.copy()
+        right = own.copy()
+        default_left = np.zeros(n_nodes, dtype=bool)
+        value = np.zeros(n_nodes)
+        for node_id, node in nodes.items():
+            if 'leaf' in node:
+                value[node_id] = node['leaf']
+                continue
+            feature[node_id] = resolve_feature(node['split'])
+            # XGBoost stores split values as float32
+            threshold[node_id] = np.float32(node['split_condition'])
+            left[node_id] = node['yes'] + offset
+            right[node_id] = node['no'] + offset
+            default_left[node_id] = node['missing'] == node['yes']
+
+        parts['feature'].append(feature)
+        parts['threshold'].append(threshold)
+        parts['left'].append(left)
+        parts['right'].append(right)
+        parts['default_left'].append(default_left)
+        parts['value'].append(value)
+        roots.append(offset)
+        offset += n_nodes
+
+    flat = {key: np.concatenate(values) for key, values in parts.items()}
+    return CompiledTreeEnsemble(
+        roots=roots, max_depth=max_depth, base_score=_xgb_base_score(booster), scale=1.0,
+        strict=True, n_features=booster.num_features(), source='xgboost', **flat
+    )
+
+
+def compile_tree_model(model, scaler=None):
+    """Compile a fitted RandomForest, GradientBoosting or XGBoost regressor"""
+    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+
+    if isinstance(model, RandomForestRegressor):
+        compiled = compile_random_forest(model)
+    elif isinstance(model, GradientBoostingRegressor):
+        compiled = compile_gradient_boosting(model)
+    elif hasattr(model, 'get_booster'):
+        compiled = compile_xgboost(model)
+    else:
+        raise ValueError(f"Unsupported model type: {type(model).__name__}")
+    return compiled.attach_scaler(scaler)
@@ -0,0 +1,196 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+MAX_LAG = 7
+ROLLING_WINDOW = 30
+MIN_PERIODS = 10
+
+
+def build_panel(sentiment_by_coin, prices_by_coin, freq='D'):
+    """Aligned (sentiment, returns) frames, one column per coin, on a shared `freq` index
+
+    Takes {coin: Series indexed by timestamp} for sentiment scores and prices. Sentiment is
+    averaged per period and prices take the period's last value before returns are
+    computed; periods missing for a coin stay NaN instead of being dropped for every coin.
+    """
+    def to_frame(series_by_coin, how):
+        columns = {}
+        for coin, series in series_by_coin.items():
+            series = pd.Series(series, dtype=float)
+            series.index = pd.to_datetime(series.index).floor(freq)
+            columns[coin] = getattr(series.groupby(level=0), how)()
+        return pd.DataFrame(columns).sort_index()
+
+    sentiment = to_frame(sentiment_by_coin, 'mean')
+    prices = to_frame(prices_by_coin, 'last')
+    coins = [coin for coin in sentiment.columns if coin in prices.columns]
+    index = sentiment.index.union(prices.index)
+    returns = prices[coins].reindex(index).pct_change(fill_method=None)
+    return sentiment[coins].reindex(index), returns
+
+
+def _centered(values):
+    """Float copy with each column's mean removed (keeps the sums below well conditioned)"""
+    values = np.asarray(values, dtype=float)
+    with np.errstate(invalid='ignore'):
+        means = np.nanmean(np.where(np.isfinite(values), values, np.nan), axis=0)
+    return values - np.nan_to_num(means)
+
+
+def _pearson(x, y, axis, min_periods):
+    """NaN-aware Pearson correlation along `axis` plus the pairwise observation counts"""
+    mask = np.isfinite(x) & np.isfinite(y)
+    n = mask.sum(axis=axis)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sx, sy = x.sum(axis=axis), y.sum(axis=axis)
+        cov = (x * y).sum(axis=axis) - sx * sy / n
+        var_x = (x * x).sum(axis=axis) - sx * sx / n
+        var_y = (y * y).sum(axis=axis) - sy * sy / n
+        corr = cov / np.sqrt(var_x * var_y)
+    valid = (n >= min_periods) & (var_x > 0) & (var_y > 0)
+    return np.where(valid, np.clip(corr, -1.0, 1.0), np.nan), n
+
+
+def _shift_rows(values, lag):
+    """values[t + lag] at row t, NaN where that falls outside the array"""
+    shifted = np.full_like(values, np.nan)
+    if lag >= 0:
+        shifted[:len(values) - lag] = values[lag:]
+    else:
+        shifted[-lag:] = values[:lag]
+    return shifted
+
+
+def lagged_correlations(sentiment, returns, max_lag=MAX_LAG, min_periods=MIN_PERIODS):
+    """Cross-correlation of sentiment with returns for every coin and lag -max_lag..max_lag
+
+    Lag k pairs sentiment on day t with the return on day t + k, so positive lags mean
+    sentiment leads price. All coins and lags are computed at once on a
+    (lags, time, coins) array. Returns (correlations, observations), both coins x lags.
+    """
+    lags = np.arange(-max_lag, max_lag + 1)
+    x = _centered(sentiment.to_numpy())
+    y = _centered(returns[sentiment.columns].to_numpy())
+    n_rows = len(y)
+
+    padded = np.full((n_rows + 2 * max_lag, y.shape[1]), np.nan)
+    padded[max_lag:max_lag + n_rows] = y
+    # shifted[l, t] = y[t + lags[l]]
+    shifted = padded[np.arange(n_rows)[None, :] + max_lag + lags[:, None]]
+
+    corr, n = _pearson(x[None, :, :], shifted, axis=1, min_periods=min_periods)
+    correlations = pd.DataFrame(corr.T, index=sentiment.columns, columns=lags)
+    observations = pd.DataFrame(n.T, index=sentiment.columns, columns=lags)
+    correlations.columns.name = observations.columns.name = 'lag'
+    return correlations, observations
+
+
+def rolling_correlations(sentiment, returns, window=ROLLING_WINDOW, lag=0, min_periods=None):
+    """Rolling `window`-period correlation of sentiment with `lag`-shifted returns, per coin
+
+    Uses running sums over the whole panel, so each window costs O(1) per coin.
+    """
+    min_periods = min_periods or window
+    x = _centered(sentiment.to_numpy())
+    y = _shift_rows(_centered(returns[sentiment.columns].to_numpy()), lag)
+    mask = np.isfinite(x) & np.isfinite(y)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+
+    def window_sums(values):
+        totals = np.cumsum(np.vstack([np.zeros((1, values.shape[1])), values]), axis=0)
+        sums = totals[1:].copy()
+        sums[window:] -= totals[1:-window]
+        return sums
+
+    n = window_sums(mask.astype(float))
+    sx, sy = window_sums(x), window_sums(y)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = window_sums(x * y) - sx * sy / n
+        var_x = window_sums(x * x) - sx * sx / n
+        var_y = window_sums(y * y) - sy * sy / n
+        corr = cov / np.sqrt(var_x * var_y)
+    # Running sums leave rounding noise where a window's variance is really zero
+    scale = window_sums(x * x + y * y)
+    valid = (n >= min_periods) & (var_x > 1e-12 * scale) & (var_y > 1e-12 * scale)
+    return pd.DataFrame(np.where(valid, np.clip(corr, -1.0, 1.0), np.nan),
+                        index=sentiment.index, columns=sentiment.columns)
+
+
+def strongest_lags(correlations):
+    """Per coin, the lag with the largest absolute correlation and that correlation"""
+    values = correlations.to_numpy()
+    best = np.full(len(values), np.nan)
+    best_corr = np.full(len(values), np.nan)
+    has_value = np.isfinite(values).any(axis=1)
+    if has_value.any():
+        picks = np.nanargmax(np.abs(values[has_value]), axis=1)
+        best[has_value] = correlations.columns.to_numpy()[picks]
+        best_corr[has_value] = values[has_value][np.arange(len(picks)), picks]
+    return pd.DataFrame({'lag': best, 'correlation': best_corr}, index=correlations.index)
+
+
+class CorrelationEngine:
+    """Lagged and rolling sentiment/return correlations for many coins, cached per day.
+
+    `analyze(sentiment, returns)` takes the aligned frames from build_panel and returns the
+    coin x lag correlation matrix (for a heatmap), the observation counts, each coin's
+    strongest lag and the rolling lag-0 correlations. Results are kept until the day
+    changes or the panel gets a new last date, different coins or different values.
+    """
+
+    def __init__(self, max_lag=MAX_LAG, window=ROLLING_WINDOW, min_periods=MIN_PERIODS):
+        self.max_lag = max_lag
+        self.window = window
+        self.min_periods = min_periods
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def analyze(self, sentiment, returns, as_of=None):
+        day = (as_of or datetime.utcnow()).date()
+        # Content digests catch same-shape panels whose values changed, e.g. today's rollup mean
+        key = (day, tuple(sentiment.columns), sentiment.index[-1] if len(sentiment) else None, len(sentiment),
+               int(pd.util.hash_pandas_object(sentiment).sum()), int(pd.util.hash_pandas_object(returns).sum()))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            # Yesterday's results are never served again
+            for stale in [k for k in self._cache if k[0] != day]:
+                del self._cache[stale]
+
+        correlations, observations = lagged_correlations(sentiment, returns, self.max_lag, self.min_periods)
+        result = {
+            'lagged': correlations,
+            'observations': observations,
+            'strongest': strongest_lags(correlations),
+            'rolling': rolling_correlations(sentiment, returns, self.window),
+            'computed_at': datetime.utcnow()
+        }
+        with self._lock:
+            # Older versions of the same panel are superseded
+            for outdated in [k for k in self._cache if k[:2] == key[:2]]:
+                del self._cache[outdated]
+            self._cache[key] = result
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Global correlation engine instance
+correlation_engine = None
+
+
+def get_correlation_engine():
+    """Get correlation engine instance"""
+    global correlation_engine
+    if correlation_engine is None:
+        correlation_engine = CorrelationEngine()
+    return correlation_engine
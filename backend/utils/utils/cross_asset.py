@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+BENCHMARK_COIN = 'bitcoin'
+CORRELATION_WINDOW = 30
+INDEX_BASE = 100.0
+
+
+class MultiAssetFeatureBuilder:
+    """Cross-asset features computed once for a set of coins on a shared time index.
+
+    `build(frames)` takes {coin: DataFrame with date/price/volume[/market_cap]}, buckets every
+    series into `freq` periods (last observation per period, so coins sampled at slightly
+    different times within a period line up) and aligns them all with a single concat join
+    into wide price/volume/market-cap matrices. Market-wide features (benchmark
+    returns, a market-cap weighted index) and per-coin features (rolling correlation and
+    beta against the benchmark and the index, return relative to the index) are then
+    computed column-wise on those matrices, so adding a coin costs one more column instead
+    of one more rebuild.
+    `features_for(coin)` returns the rows a per-coin model merges in through
+    CryptoPredictor.prepare_features(df, cross_asset_features=...).
+
+    Index weights use the previous period's market caps; without market caps every coin is
+    weighted equally. `freq` should match the data's granularity: a period's features use
+    its last observation, which is later than the period's earlier rows when it holds several.
+    """
+
+    def __init__(self, benchmark=BENCHMARK_COIN, window=CORRELATION_WINDOW, freq='D', how='inner'):
+        self.benchmark = benchmark
+        self.window = window
+        self.freq = freq
+        self.how = how
+        self.aligned = None
+        self.market = None
+        self.per_coin = None
+
+    def align(self, frames):
+        """Wide frame with (field, coin) columns on a common date index"""
+        series = {}
+        for coin, df in frames.items():
+            columns = [col for col in ('price', 'volume', 'market_cap') if col in df]
+            snapped = df.assign(date=pd.to_datetime(df['date']).dt.floor(self.freq))
+            series[coin] = snapped.groupby('date', sort=True)[columns].last()
+        aligned = pd.concat(series, axis=1, join=self.how).sort_index()
+        # (coin, field) -> (field, coin) so each field is one matrix
+        return aligned.swaplevel(axis=1).sort_index(axis=1)
+
+    def build(self, frames):
+        """Compute the shared market and per-coin feature frames"""
+        aligned = self.align(frames)
+        prices = aligned['price']
+        returns = prices.pct_change(fill_method=None)
+
+        if 'market_cap' in aligned.columns.get_level_values(0):
+            caps = aligned['market_cap'].reindex(columns=prices.columns)
+            weights = caps.div(caps.sum(axis=1), axis=0).shift(1)
+        else:
+            weights = pd.DataFrame(1.0 / prices.shape[1], index=prices.index, columns=prices.columns)
+        index_return = (weights * returns).sum(axis=1, min_count=1)
+        market_index = INDEX_BASE * (1 + index_return.fillna(0)).cumprod()
+
+        market = pd.DataFrame({
+            'market_index': market_index,
+            'market_index_return': index_return
+        })
+        if self.benchmark in returns:
+            benchmark_return = returns[self.benchmark]
+            market['btc_return'] = benchmark_return
+            corr_btc = returns.rolling(self.window).corr(benchmark_return)
+        else:
+            corr_btc = None
+
+        rolling = returns.rolling(self.window)
+        corr_market = rolling.corr(index_return)
+        beta_market = rolling.cov(index_return).div(index_return.rolling(self.window).var(), axis=0)
+        relative = returns.sub(index_return, axis=0)
+
+        per_coin = {'corr_market': corr_market, 'beta_market': beta_market, 'relative_return': relative}
+        if corr_btc is not None:
+            per_coin['corr_btc'] = corr_btc
+        self.aligned = aligned
+        self.market = market
+        self.per_coin = pd.concat(per_coin, axis=1)
+        return self
+
+    def features_for(self, coin):
+        """Market-wide plus `coin`-specific features, indexed by the aligned date"""
+        if self.per_coin is None:
+            raise RuntimeError("build() must be called before features_for()")
+        coin_features = self.per_coin.xs(coin, axis=1, level=1)
+        coin_features.columns = [f'{name}_{self.window}' if name != 'relative_return' else name
+                                 for name in coin_features.columns]
+        return pd.concat([self.market, coin_features], axis=1).replace([np.inf, -np.inf], np.nan)
+
+    @property
+    def coins(self):
+        return [] if self.aligned is None else list(self.aligned['price'].columns)
+
+
+def merge_cross_asset_features(df, cross_asset_features):
+    """Attach cross-asset features to a single coin's frame by date (as-of, backwards)
+
+    Each row gets the features of the latest aligned period starting at or before its own
+    timestamp.
+    """
+    features = cross_asset_features.sort_index()
+    features.index = features.index.astype('datetime64[ns]')
+    left = df.assign(date=pd.to_datetime(df['date']).astype('datetime64[ns]'))
+    order = np.argsort(left['date'].to_numpy(), kind='stable')
+    merged = pd.merge_asof(
+        left.iloc[order], features, left_on='date', right_index=True, direction='backward'
+    )
+    # Restore the caller's row order
+    merged.index = left.index[order]
+    return merged.loc[left.index]
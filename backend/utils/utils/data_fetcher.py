@@ -4,6 +4,24 @@ from datetime import datetime, timedelta
 import time
 from utils.database import get_database
 
+# CoinGecko ids and the ticker symbols used as crypto_symbol in the database
+COIN_SYMBOLS = {
+    'bitcoin': 'BTC',
+    'ethereum': 'ETH',
+    'binancecoin': 'BNB',
+    'cardano': 'ADA',
+    'solana': 'SOL',
+    'polkadot': 'DOT',
+    'dogecoin': 'DOGE',
+    'matic-network': 'MATIC',
+    'avalanche-2': 'AVAX',
+    'chainlink': 'LINK'
+}
+
+def get_coin_symbol(crypto_id):
+    """Map a CoinGecko id to its ticker symbol (falls back to the upper-cased id)"""
+    return COIN_SYMBOLS.get(crypto_id, crypto_id.upper()[:10])
+
 class DataFetcher:
     def __init__(self):
         self.base_url = "https://api.coingecko.com/api/v3"
@@ -165,3 +183,21 @@ def get_historical_data(crypto_id, days):
             'market_caps': [[p[0], p[1] * 19500000] for p in prices],
             'total_volumes': volumes
         }
+
+def get_price_history_frame(crypto_id, days=365, include_market_cap=False):
+    """Get historical prices as a date/price/volume DataFrame for the ML models"""
+    import pandas as pd
+    
+    historical_data = get_historical_data(crypto_id, days)
+    if not historical_data:
+        return None
+    
+    frame = pd.DataFrame({
+        'date': [datetime.fromtimestamp(point[0] / 1000) for point in historical_data['prices']],
+        'price': [point[1] for point in historical_data['prices']],
+        'volume': [point[1] for point in historical_data['total_volumes']]
+    })
+    market_caps = historical_data.get('market_caps')
+    if include_market_cap and market_caps and len(market_caps) == len(frame):
+        frame['market_cap'] = [point[1] for point in market_caps]
+    return frame
@@ -3,16 +3,20 @@ import sqlite3
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean
-from sqlalchemy import inspect, text, or_
+from sqlalchemy import Index, UniqueConstraint
+from sqlalchemy import inspect, text, or_, and_, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 from passlib.context import CryptContext
 
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL')
+# Latest a market price may be stored after a prediction's target time and still settle it
+PRICE_MATCH_WINDOW = timedelta(hours=int(os.getenv('PRICE_MATCH_WINDOW_HOURS', '24')))
 Base = declarative_base()
 
 # Database Models
@@ -42,6 +46,10 @@ class MarketData(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     price_change_24h = Column(Float)
     volume_change_24h = Column(Float)
+    
+    __table_args__ = (
+        Index('ix_market_data_symbol_timestamp', 'crypto_symbol', 'timestamp'),
+    )
 
 class SentimentData(Base):
     __tablename__ = 'sentiment_data'
@@ -55,6 +63,66 @@ class SentimentData(Base):
     article_content = Column(Text)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
+# Credibility weight per source in the rollups' weighted score; unknown sources weigh 1.0
+SENTIMENT_SOURCE_WEIGHTS = {'news': 1.0, 'social': 0.6, 'reddit': 0.6, 'twitter': 0.5}
+SENTIMENT_GRANULARITIES = ('hour', 'day')
+
+class SentimentRollup(Base):
+    __tablename__ = 'sentiment_rollups'
+    
+    # Running sums per (symbol, granularity, bucket start, source), updated as scores arrive
+    id = Column(Integer, primary_key=True)
+    crypto_symbol = Column(String(10), nullable=False)
+    granularity = Column(String(10), nullable=False)  # 'hour', 'day'
+    bucket_start = Column(DateTime, nullable=False)
+    source = Column(String(50), nullable=False)
+    sample_count = Column(Integer, default=0)
+    sum_score = Column(Float, default=0.0)
+    sum_squared_score = Column(Float, default=0.0)
+    positive_count = Column(Integer, default=0)
+    negative_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('crypto_symbol', 'granularity', 'bucket_start', 'source',
+                         name='uq_sentiment_rollup_bucket'),
+    )
+
+def sentiment_bucket_start(timestamp, granularity):
+    """Start of the hour or day containing `timestamp`"""
+    if granularity == 'hour':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def dialect_insert(engine):
+    """The engine dialect's insert(), which supports on_conflict_do_update"""
+    if engine.dialect.name == 'postgresql':
+        return postgresql.insert
+    return sqlite.insert
+
+def shifted_timestamp(engine, column, delta):
+    """`column + delta` as SQL; SQLite keeps DateTime as text, so it is shifted with strftime"""
+    if engine.dialect.name == 'sqlite':
+        return func.strftime('%Y-%m-%d %H:%M:%f', column, f'{delta.total_seconds():+.0f} seconds')
+    return column + delta
+
+def sentiment_polarity(label, score):
+    """1 for a Positive, -1 for a Negative and 0 for a Neutral record (from the score if unlabeled)"""
+    label = (label or '').lower()
+    if label in ('positive', 'negative', 'neutral'):
+        return {'positive': 1, 'negative': -1, 'neutral': 0}[label]
+    return 1 if score > 0.1 else -1 if score < -0.1 else 0
+
+def fold_sentiment_record(batch, crypto_symbol, source, timestamp, score, label=None):
+    """Add one scored text to `batch`, keyed by (symbol, granularity, bucket, source)"""
+    score = float(score)
+    polarity = sentiment_polarity(label, score)
+    for granularity in SENTIMENT_GRANULARITIES:
+        key = (crypto_symbol, granularity, sentiment_bucket_start(timestamp, granularity), source)
+        count, total, total_squared, positive, negative = batch.get(key, (0, 0.0, 0.0, 0, 0))
+        batch[key] = (count + 1, total + score, total_squared + score * score,
+                      positive + (polarity > 0), negative + (polarity < 0))
+
 class TradingSimulation(Base):
     __tablename__ = 'trading_simulations'
     
@@ -78,9 +146,32 @@ class MLPredictions(Base):
     predicted_price = Column(Float, nullable=False)
     confidence_score = Column(Float)
     prediction_days = Column(Integer)
-    actual_price = Column(Float)  # To be filled later for model evaluation
+    actual_price = Column(Float)  # Filled by backfill_actual_prices once the prediction matures
     timestamp = Column(DateTime, default=datetime.utcnow)
     model_metrics = Column(Text)  # JSON string of model performance metrics
+    target_timestamp = Column(DateTime)  # timestamp + prediction_days
+    reconciled_at = Column(DateTime)  # When actual_price was filled in
+    
+    __table_args__ = (
+        Index('ix_ml_predictions_pending', 'actual_price', 'target_timestamp'),
+    )
+
+class ModelAccuracy(Base):
+    __tablename__ = 'model_accuracy'
+    
+    id = Column(Integer, primary_key=True)
+    crypto_symbol = Column(String(10), nullable=False)
+    model_type = Column(String(50), nullable=False)
+    sample_count = Column(Integer, default=0)
+    sum_abs_error = Column(Float, default=0.0)
+    sum_squared_error = Column(Float, default=0.0)
+    sum_abs_pct_error = Column(Float, default=0.0)
+    ewm_abs_pct_error = Column(Float)  # Exponentially weighted MAPE, tracks recent drift
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('crypto_symbol', 'model_type', name='uq_model_accuracy_symbol_model'),
+    )
 
 class BiasAssessment(Base):
     __tablename__ = 'bias_assessments'
@@ -115,6 +206,8 @@ class DatabaseManager:
             Base.metadata.create_all(self.engine)
             self.Session = sessionmaker(bind=self.engine)
             self._ensure_user_table_columns()
+            self._ensure_ml_prediction_columns()
+            self._ensure_sentiment_rollup_columns()
             print("Database initialized successfully")
         except Exception as e:
             print(f"Database initialization error: {str(e)}")
@@ -123,6 +216,8 @@ class DatabaseManager:
             Base.metadata.create_all(self.engine)
             self.Session = sessionmaker(bind=self.engine)
             self._ensure_user_table_columns()
+            self._ensure_ml_prediction_columns()
+            self._ensure_sentiment_rollup_columns()
             print("Fallback to SQLite database")
 
     def _ensure_user_table_columns(self):
@@ -145,6 +240,34 @@ class DatabaseManager:
             # but in case of errors we log and continue so legacy databases still function.
             print(f"User table migration warning: {str(e)}")
     
+    def _ensure_ml_prediction_columns(self):
+        """Add reconciliation columns and lookup indexes to databases created before them."""
+        try:
+            inspector = inspect(self.engine)
+            columns = {col['name'] for col in inspector.get_columns('ml_predictions')}
+            with self.engine.begin() as conn:
+                if 'target_timestamp' not in columns:
+                    conn.execute(text("ALTER TABLE ml_predictions ADD COLUMN target_timestamp TIMESTAMP"))
+                if 'reconciled_at' not in columns:
+                    conn.execute(text("ALTER TABLE ml_predictions ADD COLUMN reconciled_at TIMESTAMP"))
+            for table in (MarketData.__table__, MLPredictions.__table__):
+                for index in table.indexes:
+                    index.create(self.engine, checkfirst=True)
+        except Exception as e:
+            print(f"ML prediction table migration warning: {str(e)}")
+    
+    def _ensure_sentiment_rollup_columns(self):
+        """Add the label counts to sentiment rollups created before them (older buckets count 0)."""
+        try:
+            inspector = inspect(self.engine)
+            columns = {col['name'] for col in inspector.get_columns('sentiment_rollups')}
+            with self.engine.begin() as conn:
+                for column in ('positive_count', 'negative_count'):
+                    if column not in columns:
+                        conn.execute(text(f"ALTER TABLE sentiment_rollups ADD COLUMN {column} INTEGER DEFAULT 0"))
+        except Exception as e:
+            print(f"Sentiment rollup table migration warning: {str(e)}")
+    
     def get_session(self):
         """Get database session"""
         return self.Session()
@@ -268,23 +391,210 @@ class DatabaseManager:
     
     def save_sentiment_data(self, crypto_symbol, source, sentiment_score, sentiment_label, article_title=None, article_content=None):
         """Save sentiment data to database"""
+        return self.ingest_sentiment_batch([{
+            'crypto_symbol': crypto_symbol,
+            'source': source,
+            'sentiment_score': sentiment_score,
+            'sentiment_label': sentiment_label,
+            'article_title': article_title,
+            'article_content': article_content
+        }]) == 1
+    
+    def ingest_sentiment_batch(self, records, store_raw=True):
+        """Store scored texts and fold them into the hourly/daily rollups in one transaction
+
+        `records` are dicts with crypto_symbol, source and sentiment_score, plus optional
+        sentiment_label, article_title, article_content and timestamp (default: now, UTC).
+        Rollups also count Positive and Negative records (by sentiment_label, else by score).
+        The batch is aggregated per (symbol, granularity, bucket, source) first, so each
+        touched bucket is one INSERT ... ON CONFLICT DO UPDATE however many records fall into
+        it. Returns the number of records ingested.
+        """
+        if not records:
+            return 0
+        now = datetime.utcnow()
+        rows = [{**record, 'timestamp': record.get('timestamp') or now} for record in records]
+        
+        batch = {}
+        for row in rows:
+            fold_sentiment_record(batch, row['crypto_symbol'], row['source'], row['timestamp'],
+                                  row['sentiment_score'], row.get('sentiment_label'))
+        
         session = self.get_session()
         try:
-            sentiment_data = SentimentData(
-                crypto_symbol=crypto_symbol,
-                source=source,
-                sentiment_score=sentiment_score,
-                sentiment_label=sentiment_label,
-                article_title=article_title,
-                article_content=article_content
+            if store_raw:
+                raw_columns = {column.name for column in SentimentData.__table__.columns}
+                session.execute(insert(SentimentData), [
+                    {key: value for key, value in row.items() if key in raw_columns} for row in rows
+                ])
+            
+            self._upsert_sentiment_rollups(session, batch, now)
+            session.commit()
+            return len(rows)
+        except Exception as e:
+            session.rollback()
+            print(f"Error ingesting sentiment data: {str(e)}")
+            return 0
+        finally:
+            session.close()
+    
+    def _upsert_sentiment_rollups(self, session, batch, now):
+        """Add a fold_sentiment_record() batch to the rollup rows, one upsert per bucket"""
+        if not batch:
+            return
+        # Increment in SQL: concurrent ingesters add to the same bucket without losing updates
+        upsert = dialect_insert(self.engine)(SentimentRollup)
+        table = SentimentRollup.__table__
+        session.execute(upsert.on_conflict_do_update(
+            index_elements=['crypto_symbol', 'granularity', 'bucket_start', 'source'],
+            set_={
+                'sample_count': func.coalesce(table.c.sample_count, 0) + upsert.excluded.sample_count,
+                'sum_score': func.coalesce(table.c.sum_score, 0.0) + upsert.excluded.sum_score,
+                'sum_squared_score': func.coalesce(table.c.sum_squared_score, 0.0) + upsert.excluded.sum_squared_score,
+                'positive_count': func.coalesce(table.c.positive_count, 0) + upsert.excluded.positive_count,
+                'negative_count': func.coalesce(table.c.negative_count, 0) + upsert.excluded.negative_count,
+                'updated_at': upsert.excluded.updated_at
+            }
+        ), [{
+            'crypto_symbol': symbol, 'granularity': granularity, 'bucket_start': bucket_start, 'source': source,
+            'sample_count': count, 'sum_score': total, 'sum_squared_score': total_squared,
+            'positive_count': positive, 'negative_count': negative, 'updated_at': now
+        } for (symbol, granularity, bucket_start, source), (count, total, total_squared, positive, negative)
+            in batch.items()])
+    
+    def backfill_sentiment_rollups(self, chunk_size=5000):
+        """One-off: fold sentiment_data rows stored before the rollups existed into SentimentRollup
+
+        Only rows older than the earliest daily rollup bucket are folded (all rows if there are
+        no rollups yet), so texts already counted by ingest_sentiment_batch are not added twice
+        and running it again is a no-op. Rows are streamed and upserted `chunk_size` at a time.
+        Returns the number of rows folded.
+        """
+        now = datetime.utcnow()
+        session = self.get_session()
+        try:
+            cutoff = session.query(func.min(SentimentRollup.bucket_start)).filter(
+                SentimentRollup.granularity == 'day'
+            ).scalar()
+            query = select(SentimentData.crypto_symbol, SentimentData.source, SentimentData.timestamp,
+                           SentimentData.sentiment_score, SentimentData.sentiment_label).where(
+                SentimentData.timestamp.isnot(None), SentimentData.sentiment_score.isnot(None)
             )
-            session.add(sentiment_data)
+            if cutoff is not None:
+                query = query.where(SentimentData.timestamp < cutoff)
+            
+            folded = 0
+            batch = {}
+            for row in session.execute(query.execution_options(yield_per=chunk_size)):
+                fold_sentiment_record(batch, row.crypto_symbol, row.source, row.timestamp,
+                                      row.sentiment_score, row.sentiment_label)
+                folded += 1
+                if folded % chunk_size == 0:
+                    self._upsert_sentiment_rollups(session, batch, now)
+                    batch = {}
+            self._upsert_sentiment_rollups(session, batch, now)
             session.commit()
-            return True
+            return folded
         except Exception as e:
             session.rollback()
-            print(f"Error saving sentiment data: {str(e)}")
-            return False
+            print(f"Error backfilling sentiment rollups: {str(e)}")
+            return 0
+        finally:
+            session.close()
+    
+    def get_sentiment_rollups(self, crypto_symbol, granularity='day', days=30, end=None, source_weights=None):
+        """Per-bucket sentiment for the last `days` days, oldest first
+
+        Reads one rollup row per bucket and source, so the cost depends on the number of
+        buckets, not on how many texts were scored. Each bucket has the plain mean, the
+        source-weighted mean (SENTIMENT_SOURCE_WEIGHTS unless `source_weights` is given), the
+        population standard deviation, the sample count and the number of distinct sources.
+        """
+        weights = source_weights or SENTIMENT_SOURCE_WEIGHTS
+        end = end or datetime.utcnow()
+        start = sentiment_bucket_start(end - timedelta(days=days), granularity)
+        session = self.get_session()
+        try:
+            rollups = session.query(SentimentRollup).filter(
+                SentimentRollup.crypto_symbol == crypto_symbol,
+                SentimentRollup.granularity == granularity,
+                SentimentRollup.bucket_start >= start,
+                SentimentRollup.bucket_start <= end
+            ).order_by(SentimentRollup.bucket_start).all()
+            
+            buckets = {}
+            for rollup in rollups:
+                bucket = buckets.setdefault(rollup.bucket_start, {
+                    'count': 0, 'sum': 0.0, 'sum_squared': 0.0, 'weight': 0.0, 'weighted_sum': 0.0, 'sources': 0
+                })
+                weight = weights.get(rollup.source, 1.0)
+                bucket['count'] += rollup.sample_count
+                bucket['sum'] += rollup.sum_score
+                bucket['sum_squared'] += rollup.sum_squared_score
+                bucket['weight'] += weight * rollup.sample_count
+                bucket['weighted_sum'] += weight * rollup.sum_score
+                bucket['sources'] += 1
+            
+            history = []
+            for bucket_start, bucket in buckets.items():
+                if not bucket['count']:
+                    continue
+                mean = bucket['sum'] / bucket['count']
+                history.append({
+                    'bucket_start': bucket_start,
+                    'sample_count': bucket['count'],
+                    'source_count': bucket['sources'],
+                    'mean_score': mean,
+                    'weighted_score': bucket['weighted_sum'] / bucket['weight'] if bucket['weight'] else mean,
+                    'std_score': max(bucket['sum_squared'] / bucket['count'] - mean * mean, 0.0) ** 0.5
+                })
+            return history
+        except Exception as e:
+            print(f"Error fetching sentiment rollups: {str(e)}")
+            return []
+        finally:
+            session.close()
+    
+    def get_sentiment_source_summaries(self, since, granularity='hour', symbols=None):
+        """Sample count, mean score and Positive/Negative counts per symbol and source since `since`
+
+        One grouped query over the rollups for every symbol at once (or only `symbols`);
+        returns {symbol: {source: {...}}}. Buckets are included whole, so `since` is
+        rounded down to the start of its bucket.
+        """
+        session = self.get_session()
+        try:
+            query = session.query(
+                SentimentRollup.crypto_symbol,
+                SentimentRollup.source,
+                func.sum(SentimentRollup.sample_count),
+                func.sum(SentimentRollup.sum_score),
+                func.sum(func.coalesce(SentimentRollup.positive_count, 0)),
+                func.sum(func.coalesce(SentimentRollup.negative_count, 0)),
+                func.max(SentimentRollup.updated_at)
+            ).filter(
+                SentimentRollup.granularity == granularity,
+                SentimentRollup.bucket_start >= sentiment_bucket_start(since, granularity)
+            )
+            if symbols is not None:
+                query = query.filter(SentimentRollup.crypto_symbol.in_(symbols))
+            rows = query.group_by(SentimentRollup.crypto_symbol, SentimentRollup.source).all()
+            
+            summaries = {}
+            for symbol, source, count, total, positive, negative, updated_at in rows:
+                if not count:
+                    continue
+                summaries.setdefault(symbol, {})[source] = {
+                    'sample_count': int(count),
+                    'mean_score': float(total) / count,
+                    'positive_count': int(positive or 0),
+                    'negative_count': int(negative or 0),
+                    'updated_at': updated_at
+                }
+            return summaries
+        except Exception as e:
+            print(f"Error fetching sentiment summaries: {str(e)}")
+            return {}
         finally:
             session.close()
     
@@ -314,6 +624,7 @@ class DatabaseManager:
     def save_ml_prediction(self, crypto_symbol, model_type, predicted_price, confidence_score, prediction_days, model_metrics):
         """Save ML prediction to database"""
         session = self.get_session()
+        created_at = datetime.utcnow()
         try:
             ml_prediction = MLPredictions(
                 crypto_symbol=crypto_symbol,
@@ -321,7 +632,9 @@ class DatabaseManager:
                 predicted_price=predicted_price,
                 confidence_score=confidence_score,
                 prediction_days=prediction_days,
-                model_metrics=json.dumps(model_metrics) if isinstance(model_metrics, dict) else model_metrics
+                model_metrics=json.dumps(model_metrics) if isinstance(model_metrics, dict) else model_metrics,
+                timestamp=created_at,
+                target_timestamp=created_at + timedelta(days=prediction_days) if prediction_days else None
             )
             session.add(ml_prediction)
             session.commit()
@@ -333,6 +646,174 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def save_ml_predictions_bulk(self, predictions):
+        """Insert many ML predictions in a single transaction; returns the row count"""
+        if not predictions:
+            return 0
+        session = self.get_session()
+        try:
+            rows = []
+            for prediction in predictions:
+                row = dict(prediction)
+                if isinstance(row.get('model_metrics'), dict):
+                    row['model_metrics'] = json.dumps(row['model_metrics'])
+                row.setdefault('timestamp', datetime.utcnow())
+                if row.get('prediction_days'):
+                    row.setdefault('target_timestamp', row['timestamp'] + timedelta(days=row['prediction_days']))
+                rows.append(row)
+            # One executemany INSERT instead of an ORM flush per object
+            session.execute(insert(MLPredictions), rows)
+            session.commit()
+            return len(rows)
+        except Exception as e:
+            session.rollback()
+            print(f"Error bulk saving ML predictions: {str(e)}")
+            return 0
+        finally:
+            session.close()
+    
+    def save_market_data_bulk(self, market_rows):
+        """Insert many market data points in a single transaction; returns the row count"""
+        if not market_rows:
+            return 0
+        session = self.get_session()
+        try:
+            session.execute(insert(MarketData), [dict(row) for row in market_rows])
+            session.commit()
+            return len(market_rows)
+        except Exception as e:
+            session.rollback()
+            print(f"Error bulk saving market data: {str(e)}")
+            return 0
+        finally:
+            session.close()
+    
+    def backfill_actual_prices(self, now=None, ewm_alpha=0.1, max_delay=PRICE_MATCH_WINDOW):
+        """Fill actual_price for matured predictions and fold them into model_accuracy
+
+        Each matured prediction takes the first stored market price for its symbol at or after
+        its target_timestamp and at most `max_delay` later; predictions with no price in that
+        window stay unreconciled rather than being scored against a much later price. The
+        match is one set-based UPDATE ... FROM over a ranked join, and the accuracy table is
+        updated from the rows that UPDATE returns, so history is never rescanned and rows a
+        concurrent run already reconciled are not counted twice. Returns the number of
+        predictions reconciled.
+        """
+        now = now or datetime.utcnow()
+        session = self.get_session()
+        try:
+            ranked = select(
+                MLPredictions.id.label('prediction_id'),
+                MarketData.price.label('price'),
+                func.row_number().over(
+                    partition_by=MLPredictions.id,
+                    order_by=MarketData.timestamp
+                ).label('match_rank')
+            ).join(
+                MarketData,
+                and_(
+                    MarketData.crypto_symbol == MLPredictions.crypto_symbol,
+                    MarketData.timestamp >= MLPredictions.target_timestamp,
+                    MarketData.timestamp <= shifted_timestamp(self.engine, MLPredictions.target_timestamp, max_delay),
+                    MarketData.timestamp <= now
+                )
+            ).where(
+                MLPredictions.actual_price.is_(None),
+                MLPredictions.target_timestamp <= now
+            ).subquery()
+            matches = select(ranked.c.prediction_id, ranked.c.price).where(
+                ranked.c.match_rank == 1
+            ).subquery()
+            
+            reconciled = session.execute(
+                update(MLPredictions)
+                .where(
+                    MLPredictions.id == matches.c.prediction_id,
+                    # Re-checked on the target row, so a concurrent run's rows are skipped
+                    MLPredictions.actual_price.is_(None)
+                )
+                .values(actual_price=matches.c.price, reconciled_at=now)
+                .returning(
+                    MLPredictions.crypto_symbol,
+                    MLPredictions.model_type,
+                    MLPredictions.predicted_price,
+                    MLPredictions.actual_price
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+            if reconciled:
+                self._update_model_accuracy(session, reconciled, now, ewm_alpha)
+            session.commit()
+            return len(reconciled)
+        except Exception as e:
+            session.rollback()
+            print(f"Error backfilling actual prices: {str(e)}")
+            return 0
+        finally:
+            session.close()
+    
+    def _update_model_accuracy(self, session, reconciled, reconciled_at, ewm_alpha):
+        """Merge error aggregates of the (symbol, model, predicted, actual) rows just reconciled"""
+        batches = {}
+        for symbol, model_type, predicted, actual in reconciled:
+            error = actual - predicted
+            batch = batches.setdefault((symbol, model_type), [0, 0.0, 0.0, 0.0])
+            batch[0] += 1
+            batch[1] += abs(error)
+            batch[2] += error * error
+            batch[3] += abs(error / actual)
+        
+        # Accumulate in SQL: concurrent reconciliations add to the same row instead of racing to insert it
+        upsert = dialect_insert(self.engine)(ModelAccuracy)
+        table = ModelAccuracy.__table__
+        for (symbol, model_type), (count, abs_error, squared_error, abs_pct_error) in batches.items():
+            batch_mape = abs_pct_error / count
+            # Same as applying `count` single-sample EWM updates with the batch mean
+            weight = 1 - (1 - ewm_alpha) ** count
+            session.execute(upsert.values(
+                crypto_symbol=symbol, model_type=model_type, sample_count=count,
+                sum_abs_error=abs_error, sum_squared_error=squared_error, sum_abs_pct_error=abs_pct_error,
+                ewm_abs_pct_error=batch_mape, updated_at=reconciled_at
+            ).on_conflict_do_update(
+                index_elements=['crypto_symbol', 'model_type'],
+                set_={
+                    'sample_count': func.coalesce(table.c.sample_count, 0) + upsert.excluded.sample_count,
+                    'sum_abs_error': func.coalesce(table.c.sum_abs_error, 0.0) + upsert.excluded.sum_abs_error,
+                    'sum_squared_error': func.coalesce(table.c.sum_squared_error, 0.0) + upsert.excluded.sum_squared_error,
+                    'sum_abs_pct_error': func.coalesce(table.c.sum_abs_pct_error, 0.0) + upsert.excluded.sum_abs_pct_error,
+                    'ewm_abs_pct_error': weight * upsert.excluded.ewm_abs_pct_error
+                                         + (1 - weight) * func.coalesce(table.c.ewm_abs_pct_error,
+                                                                        upsert.excluded.ewm_abs_pct_error),
+                    'updated_at': upsert.excluded.updated_at
+                }
+            ))
+    
+    def get_model_accuracy(self, crypto_symbol=None, model_type=None):
+        """Get rolling live-accuracy statistics per symbol/model"""
+        session = self.get_session()
+        try:
+            query = session.query(ModelAccuracy)
+            if crypto_symbol:
+                query = query.filter(ModelAccuracy.crypto_symbol == crypto_symbol)
+            if model_type:
+                query = query.filter(ModelAccuracy.model_type == model_type)
+            
+            return [{
+                'crypto_symbol': result.crypto_symbol,
+                'model_type': result.model_type,
+                'sample_count': result.sample_count,
+                'mae': result.sum_abs_error / result.sample_count,
+                'rmse': (result.sum_squared_error / result.sample_count) ** 0.5,
+                'mape': result.sum_abs_pct_error / result.sample_count * 100,
+                'recent_mape': (result.ewm_abs_pct_error or 0.0) * 100,
+                'updated_at': result.updated_at
+            } for result in query.all() if result.sample_count]
+        except Exception as e:
+            print(f"Error fetching model accuracy: {str(e)}")
+            return []
+        finally:
+            session.close()
+    
     def save_bias_assessment(self, assessment_type, bias_scores, recommendations):
         """Save bias assessment to database"""
         session = self.get_session()
@@ -375,26 +856,16 @@ class DatabaseManager:
             session.close()
     
     def get_sentiment_history(self, crypto_symbol, days=7):
-        """Get sentiment history from database"""
-        session = self.get_session()
-        try:
-            query = session.query(SentimentData).filter(
-                SentimentData.crypto_symbol == crypto_symbol
-            ).order_by(SentimentData.timestamp.desc()).limit(days * 10)  # Multiple entries per day
-            
-            results = query.all()
-            return [{
-                'timestamp': result.timestamp,
-                'source': result.source,
-                'sentiment_score': result.sentiment_score,
-                'sentiment_label': result.sentiment_label,
-                'article_title': result.article_title
-            } for result in results]
-        except Exception as e:
-            print(f"Error fetching sentiment history: {str(e)}")
-            return []
-        finally:
-            session.close()
+        """Daily sentiment for the last `days` days from the rollups, newest first"""
+        rollups = self.get_sentiment_rollups(crypto_symbol, 'day', days=days)
+        return [{
+            'timestamp': rollup['bucket_start'],
+            'sentiment_score': rollup['weighted_score'],
+            'mean_score': rollup['mean_score'],
+            'std_score': rollup['std_score'],
+            'sample_count': rollup['sample_count'],
+            'source_count': rollup['source_count']
+        } for rollup in reversed(rollups)]
     
     def get_trading_history(self, user_id=None, crypto_symbol=None, days=30):
         """Get trading simulation history"""
@@ -0,0 +1,173 @@
+import os
+import json
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import xgboost as xgb
+
+from utils.model_registry import MODEL_REGISTRY_DIR
+
+CORRELATION_THRESHOLD = 0.95
+IMPORTANCE_COVERAGE = 0.95
+MIN_FEATURES = 5
+
+
+def feature_importances(X, y, random_state=42):
+    """Gain importances from a small, quick XGBoost fit (normalized to sum to 1)"""
+    model = xgb.XGBRegressor(
+        n_estimators=100, max_depth=4, learning_rate=0.1, random_state=random_state, n_jobs=-1
+    )
+    model.fit(X, y)
+    importances = np.asarray(model.feature_importances_, dtype=float)
+    total = importances.sum()
+    return importances / total if total > 0 else np.full(len(importances), 1.0 / len(importances))
+
+
+def correlation_prune(X, order, threshold=CORRELATION_THRESHOLD, keep=()):
+    """Indices surviving greedy pruning of near-duplicate columns
+
+    Columns are visited in `order` (most important first) and dropped when their absolute
+    correlation with an already kept column reaches `threshold`; `keep` indices always stay.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.abs(np.corrcoef(X, rowvar=False))
+    corr = np.nan_to_num(corr, nan=0.0)
+
+    kept = list(keep)
+    for idx in order:
+        if idx in kept:
+            continue
+        if not kept or corr[idx, kept].max() < threshold:
+            kept.append(idx)
+    return kept
+
+
+def importance_prune(importances, candidates, coverage=IMPORTANCE_COVERAGE,
+                     min_features=MIN_FEATURES, keep=()):
+    """Most important candidates that together cover `coverage` of their total importance"""
+    candidates = sorted(candidates, key=lambda idx: importances[idx], reverse=True)
+    total = sum(importances[idx] for idx in candidates) or 1.0
+    selected = [idx for idx in keep if idx in candidates]
+    covered = sum(importances[idx] for idx in selected)
+    for idx in candidates:
+        if idx in selected:
+            continue
+        if covered / total >= coverage and len(selected) >= min_features:
+            break
+        selected.append(idx)
+        covered += importances[idx]
+    return selected
+
+
+def select_features(X, y, feature_columns, method='both', correlation_threshold=CORRELATION_THRESHOLD,
+                    importance_coverage=IMPORTANCE_COVERAGE, min_features=MIN_FEATURES, keep=()):
+    """Choose a subset of `feature_columns` for training data X, y
+
+    method is 'correlation' (drop near-duplicate columns), 'importance' (keep the columns
+    covering most of the gain importance) or 'both'. Returns the selection, in the original
+    column order, with the importances and dropped columns for reporting.
+    """
+    if method not in ('correlation', 'importance', 'both'):
+        raise ValueError(f"Unknown feature selection method: {method}")
+    feature_columns = list(feature_columns)
+    keep_idx = [feature_columns.index(col) for col in keep if col in feature_columns]
+
+    importances = feature_importances(X, y)
+    order = list(np.argsort(-importances))
+    candidates = list(range(len(feature_columns)))
+    if method in ('correlation', 'both'):
+        candidates = correlation_prune(X, order, correlation_threshold, keep=keep_idx)
+    if method in ('importance', 'both'):
+        candidates = importance_prune(importances, candidates, importance_coverage, min_features, keep=keep_idx)
+
+    selected = [feature_columns[idx] for idx in sorted(candidates)]
+    return {
+        'method': method,
+        'selected_columns': selected,
+        'dropped_columns': [col for col in feature_columns if col not in selected],
+        'candidate_columns': feature_columns,
+        'importances': {col: float(imp) for col, imp in zip(feature_columns, importances)},
+        'computed_at': datetime.utcnow().isoformat()
+    }
+
+
+class FeatureSelector:
+    """Per-coin feature selections, computed once and cached on disk.
+
+    A selection is stored as <root>/<coin>/feature_selection.json next to the coin's
+    registered models and reused until the candidate columns change or it is invalidated.
+    Selections for calls without a coin are not cached.
+    """
+
+    def __init__(self, root_dir=None, method='both', correlation_threshold=CORRELATION_THRESHOLD,
+                 importance_coverage=IMPORTANCE_COVERAGE, min_features=MIN_FEATURES):
+        self.root_dir = Path(root_dir or MODEL_REGISTRY_DIR)
+        self.method = method
+        self.correlation_threshold = correlation_threshold
+        self.importance_coverage = importance_coverage
+        self.min_features = min_features
+        self._selections = {}
+        self._lock = threading.Lock()
+
+    def _path(self, coin):
+        return self.root_dir / coin.lower() / 'feature_selection.json'
+
+    def get(self, coin):
+        """Cached selection for a coin, or None"""
+        key = coin.lower()
+        with self._lock:
+            if key not in self._selections:
+                path = self._path(coin)
+                if not path.exists():
+                    return None
+                with open(path) as f:
+                    self._selections[key] = json.load(f)
+            return self._selections[key]
+
+    def select(self, coin, X, y, feature_columns, keep=(), refresh=False):
+        """Selected columns for a coin, computing and caching the selection when needed"""
+        cached = self.get(coin) if coin and not refresh else None
+        if (cached is not None and cached['candidate_columns'] == list(feature_columns)
+                and cached['method'] == self.method):
+            return cached
+
+        selection = select_features(
+            X, y, feature_columns, method=self.method,
+            correlation_threshold=self.correlation_threshold,
+            importance_coverage=self.importance_coverage,
+            min_features=self.min_features, keep=keep
+        )
+        if coin:
+            path = self._path(coin)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp file, so concurrent writers for the same coin can't replace each other's
+            with tempfile.NamedTemporaryFile('w', dir=path.parent, suffix='.tmp', delete=False) as f:
+                json.dump(selection, f, indent=2)
+            os.replace(f.name, path)
+            with self._lock:
+                self._selections[coin.lower()] = selection
+        return selection
+
+    def invalidate(self, coin):
+        """Drop a coin's cached selection"""
+        with self._lock:
+            self._selections.pop(coin.lower(), None)
+        path = self._path(coin)
+        if path.exists():
+            path.unlink()
+
+
+# Global selector instance
+feature_selector = None
+
+
+def get_feature_selector():
+    """Get feature selector instance"""
+    global feature_selector
+    if feature_selector is None:
+        feature_selector = FeatureSelector()
+    return feature_selector
@@ -0,0 +1,134 @@
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from utils.ml_models import CryptoPredictor
+
+FEATURE_STORE_DIR = os.getenv('NEUROCRYPT_FEATURE_STORE', 'feature_store')
+SCHEMA_VERSION = 1
+
+
+class FeatureStore:
+    """On-disk store of float32 feature matrices, one set of files per coin and resolution.
+
+    Each entry is written as plain .npy files (features, target, and timestamps) next to a
+    JSON schema sidecar. Loading uses read-only memory maps, so training jobs get the
+    matrices without copying and worker processes reading the same entry share the OS
+    page cache.
+    """
+
+    def __init__(self, root_dir=None, dtype=np.float32):
+        self.root_dir = Path(root_dir or FEATURE_STORE_DIR)
+        self.dtype = np.dtype(dtype)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, coin, resolution):
+        """File paths for a coin/resolution entry"""
+        stem = f"{coin.lower()}_{resolution}"
+        return {
+            'features': self.root_dir / f"{stem}.features.npy",
+            'target': self.root_dir / f"{stem}.target.npy",
+            'index': self.root_dir / f"{stem}.index.npy",
+            'schema': self.root_dir / f"{stem}.schema.json"
+        }
+
+    def _write_array(self, path, array):
+        """Write an array to a temporary memmap and atomically move it into place"""
+        tmp_path = path.with_name(path.name + '.tmp')
+        out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=array.dtype, shape=array.shape)
+        out[...] = array
+        out.flush()
+        del out
+        # Readers that already mapped the old file keep their pages; new readers see the new one
+        os.replace(tmp_path, path)
+
+    def materialize(self, coin, resolution, df, predictor=None):
+        """Compute features for a price/volume frame and persist them; returns the schema"""
+        predictor = predictor or CryptoPredictor()
+        X, y, feature_cols, dates = predictor.prepare_feature_matrix(df, dtype=self.dtype)
+        paths = self._paths(coin, resolution)
+
+        self._write_array(paths['features'], X)
+        self._write_array(paths['target'], y)
+        if dates is not None:
+            self._write_array(paths['index'], dates.astype('datetime64[ns]'))
+
+        schema = {
+            'version': SCHEMA_VERSION,
+            'coin': coin.lower(),
+            'resolution': resolution,
+            'dtype': self.dtype.name,
+            'rows': int(X.shape[0]),
+            'columns': feature_cols,
+            'target': 'target',
+            'has_index': dates is not None,
+            'start': str(dates[0]) if dates is not None and len(dates) else None,
+            'end': str(dates[-1]) if dates is not None and len(dates) else None,
+            'created_at': datetime.utcnow().isoformat()
+        }
+        # The sidecar goes last so a visible schema always describes complete arrays
+        tmp_schema = paths['schema'].with_name(paths['schema'].name + '.tmp')
+        with open(tmp_schema, 'w') as f:
+            json.dump(schema, f, indent=2)
+        os.replace(tmp_schema, paths['schema'])
+        return schema
+
+    def get_schema(self, coin, resolution):
+        """Read the schema sidecar, or None if the entry does not exist"""
+        schema_path = self._paths(coin, resolution)['schema']
+        if not schema_path.exists():
+            return None
+        with open(schema_path) as f:
+            return json.load(f)
+
+    def exists(self, coin, resolution):
+        """Check whether a coin/resolution entry has been materialized"""
+        return self.get_schema(coin, resolution) is not None
+
+    def load(self, coin, resolution, mmap_mode='r'):
+        """Memory-map a materialized entry; returns None if it is missing"""
+        schema = self.get_schema(coin, resolution)
+        if schema is None:
+            return None
+
+        paths = self._paths(coin, resolution)
+        X = np.load(paths['features'], mmap_mode=mmap_mode)
+        y = np.load(paths['target'], mmap_mode=mmap_mode)
+        index = np.load(paths['index'], mmap_mode=mmap_mode) if schema.get('has_index') else None
+
+        if X.shape != (schema['rows'], len(schema['columns'])):
+            raise ValueError(
+                f"Feature store entry {coin}/{resolution} does not match its schema: "
+                f"{X.shape} vs ({schema['rows']}, {len(schema['columns'])})"
+            )
+
+        return {
+            'X': X,
+            'y': y,
+            'index': index,
+            'columns': schema['columns'],
+            'schema': schema
+        }
+
+    def list_entries(self):
+        """List (coin, resolution) pairs present in the store"""
+        entries = []
+        for schema_path in sorted(self.root_dir.glob('*.schema.json')):
+            with open(schema_path) as f:
+                schema = json.load(f)
+            entries.append((schema['coin'], schema['resolution']))
+        return entries
+
+    def delete(self, coin, resolution):
+        """Remove every file belonging to an entry"""
+        for path in self._paths(coin, resolution).values():
+            if path.exists():
+                path.unlink()
+
+
+def get_feature_store(root_dir=None):
+    """Get a feature store rooted at `root_dir` (defaults to NEUROCRYPT_FEATURE_STORE)"""
+    return FeatureStore(root_dir)
@@ -0,0 +1,144 @@
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+FORECAST_CACHE_DIR = os.getenv('NEUROCRYPT_FORECAST_CACHE', 'forecast_cache')
+DEFAULT_FORECAST_COINS = ['bitcoin', 'ethereum', 'binancecoin', 'cardano', 'solana']
+DEFAULT_FORECAST_MODELS = ['ensemble', 'random_forest', 'xgboost', 'lstm']
+
+
+def get_forecast_coins():
+    """Coins to forecast, from FORECAST_COINS (comma separated) or the defaults"""
+    configured = os.getenv('FORECAST_COINS', '')
+    coins = [coin.strip().lower() for coin in configured.split(',') if coin.strip()]
+    return coins or list(DEFAULT_FORECAST_COINS)
+
+
+def _to_builtin(value):
+    """Convert NumPy containers/scalars to JSON-serializable Python values"""
+    if isinstance(value, dict):
+        return {str(k): _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_to_builtin(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def make_etag(body):
+    """Strong ETag for a serialized response body"""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def build_forecast_payload(coin, model_type, result, last_date, last_price, generated_at=None):
+    """Trim a CryptoPredictor result down to what clients need to draw a forecast"""
+    predictions = [float(p) for p in result['predictions']]
+    dates = [(last_date + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(1, len(predictions) + 1)]
+    payload = {
+        'coin': coin,
+        'model_type': model_type,
+        'generated_at': (generated_at or datetime.utcnow()).isoformat(),
+        'last_price': float(last_price),
+        'dates': dates,
+        'predictions': predictions,
+        'confidence': result.get('confidence'),
+        'volatility': result.get('volatility'),
+        'metrics': {
+            key: result.get(key) for key in ('rmse', 'mae', 'r2_score', 'mape', 'sharpe_ratio', 'max_drawdown')
+            if key in result
+        }
+    }
+    if 'prediction_intervals' in result:
+        payload['intervals'] = result['prediction_intervals']
+    return _to_builtin(payload)
+
+
+class ForecastCache:
+    """Precomputed forecasts served from memory, backed by one JSON file per coin.
+
+    Writers (the batch job) replace a coin's file atomically; readers keep the serialized
+    bytes and ETags in memory and only re-read a file when its mtime changes, so a request
+    is a stat() plus a dict lookup and the writer can run in a different process.
+    """
+
+    def __init__(self, root_dir=None):
+        self.root_dir = Path(root_dir or FORECAST_CACHE_DIR)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _path(self, coin):
+        return self.root_dir / f"{coin.lower()}.json"
+
+    def write_coin(self, coin, model_payloads, generated_at=None):
+        """Replace every cached forecast for a coin in one atomic write"""
+        document = {
+            'coin': coin.lower(),
+            'generated_at': (generated_at or datetime.utcnow()).isoformat(),
+            'models': model_payloads
+        }
+        path = self._path(coin)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(document, f)
+        os.replace(tmp_path, path)
+        return document
+
+    def _load(self, coin):
+        """Return the in-memory entry for a coin, reloading it if the file changed"""
+        path = self._path(coin)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(coin.lower())
+            if entry and entry['mtime'] == mtime:
+                return entry
+
+            with open(path) as f:
+                document = json.load(f)
+            # Serialize once per refresh; requests just hand out the bytes
+            body = json.dumps(document, separators=(',', ':')).encode()
+            models = {}
+            for model_type, payload in document.get('models', {}).items():
+                model_body = json.dumps(payload, separators=(',', ':')).encode()
+                models[model_type] = (model_body, make_etag(model_body))
+            entry = {
+                'mtime': mtime,
+                'generated_at': document.get('generated_at'),
+                'body': body,
+                'etag': make_etag(body),
+                'models': models
+            }
+            self._entries[coin.lower()] = entry
+            return entry
+
+    def get(self, coin, model_type=None):
+        """(body, etag) for a coin's forecasts, or for one model; None if not cached"""
+        entry = self._load(coin)
+        if entry is None:
+            return None
+        if model_type is None:
+            return entry['body'], entry['etag']
+        return entry['models'].get(model_type)
+
+    def list_coins(self):
+        """Coins with cached forecasts and when each was generated"""
+        coins = {}
+        for path in sorted(self.root_dir.glob('*.json')):
+            entry = self._load(path.stem)
+            if entry:
+                coins[path.stem] = {
+                    'generated_at': entry['generated_at'],
+                    'models': sorted(entry['models'])
+                }
+        return coins
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from utils.cross_asset import MultiAssetFeatureBuilder
+from utils.data_fetcher import get_price_history_frame, get_coin_symbol
+from utils.database import get_database
+from utils.feature_selection import get_feature_selector
+from utils.forecast_cache import (
+    ForecastCache, DEFAULT_FORECAST_MODELS, build_forecast_payload, get_forecast_coins
+)
+from utils.ml_models import CryptoPredictor, MODEL_TRAINERS, TENSORFLOW_AVAILABLE
+
+
+def _run_forecast_task(coin, model_type, df, prediction_days, register_models=False, feature_selection=None,
+                       cross_asset_features=None):
+    """Train one coin/model pair; module-level so it can run in a worker process"""
+    predictor = CryptoPredictor(
+        feature_selection=feature_selection,
+        cross_asset_features=cross_asset_features
+    )
+    # Tree models cache per-coin state (stacking base models, feature selections) by coin
+    kwargs = {'crypto_symbol': coin} if model_type != 'lstm' else {}
+    result = predictor.train_model(model_type, df, prediction_days, **kwargs)
+    if not result or 'error' in result:
+        return None
+    if register_models:
+        from utils.model_registry import get_model_registry
+        registry = get_model_registry()
+        for name in registry.register_predictor(coin, predictor):
+            if name != 'lstm':
+                registry.export_compiled(coin, name)
+    # Large training artifacts are not needed by the job
+    result.pop('training_history', None)
+    result.pop('sampled_paths', None)
+    return result
+
+
+def build_prediction_rows(coin, model_type, result, generated_at):
+    """One ml_predictions row per forecast horizon step"""
+    metrics = {
+        key: float(result[key]) for key in ('rmse', 'mae', 'r2_score', 'mape', 'volatility')
+        if result.get(key) is not None
+    }
+    intervals = result.get('prediction_intervals') or {}
+    rows = []
+    for step, predicted_price in enumerate(result['predictions'], start=1):
+        step_metrics = dict(metrics)
+        for name, band in intervals.items():
+            step_metrics[name] = float(band[step - 1])
+        rows.append({
+            'crypto_symbol': get_coin_symbol(coin),
+            'model_type': model_type,
+            'predicted_price': float(predicted_price),
+            'confidence_score': float(result.get('confidence', 0.0)),
+            'prediction_days': step,
+            'timestamp': generated_at,
+            'model_metrics': step_metrics
+        })
+    return rows
+
+
+class BatchForecastJob:
+    """Scheduled job that precomputes forecasts for every tracked coin and model type.
+
+    Each run fetches price history per coin, trains all coin/model pairs in parallel on a
+    process pool (threads with executor='thread'), bulk-inserts every prediction into
+    ml_predictions in one transaction, and rewrites the forecast cache that the serving
+    API reads, so nothing on the read path trains on demand.
+    """
+
+    def __init__(self, coins=None, model_types=None, prediction_days=7, max_workers=None,
+                 executor='process', cache=None, db=None, register_models=False, select_features=False,
+                 cross_asset=False):
+        self.coins = coins or get_forecast_coins()
+        self.model_types = [
+            m for m in (model_types or DEFAULT_FORECAST_MODELS)
+            if m in MODEL_TRAINERS and (m != 'lstm' or TENSORFLOW_AVAILABLE)
+        ]
+        self.prediction_days = prediction_days
+        self.max_workers = max_workers or min(len(self.coins) * len(self.model_types), os.cpu_count() or 1)
+        self.executor = executor
+        self.cache = cache or ForecastCache()
+        self.db = db or get_database()
+        self.register_models = register_models
+        self.select_features = select_features
+        self.cross_asset = cross_asset
+        self.last_run = None
+
+    def _make_executor(self):
+        if self.executor == 'thread':
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def run_once(self):
+        """Run every coin/model forecast once; returns a summary of the run"""
+        started = time.perf_counter()
+        generated_at = datetime.utcnow()
+
+        # Fetched sequentially: DataFetcher rate-limits CoinGecko calls
+        frames = {}
+        for coin in self.coins:
+            df = get_price_history_frame(coin, 365, include_market_cap=self.cross_asset)
+            if df is not None and not df.empty:
+                frames[coin] = df
+        
+        # Cross-asset features are built once for all coins and shared by every coin's models
+        cross_asset = {}
+        if self.cross_asset and len(frames) > 1:
+            builder = MultiAssetFeatureBuilder().build(frames)
+            cross_asset = {coin: builder.features_for(coin) for coin in builder.coins}
+            frames = {coin: df.drop(columns='market_cap', errors='ignore') for coin, df in frames.items()}
+
+        # One feature selection per coin, shared by all of its tree models
+        selections = {}
+        if self.select_features:
+            selector = get_feature_selector()
+            for coin, df in frames.items():
+                try:
+                    selections[coin] = CryptoPredictor(
+                        feature_selector=selector, cross_asset_features=cross_asset.get(coin)
+                    ).select_features_for(coin, df)
+                except Exception as e:
+                    print(f"Error selecting features for {coin}: {str(e)}")
+        
+        results = {coin: {} for coin in frames}
+        failures = []
+        with self._make_executor() as pool:
+            futures = {
+                pool.submit(
+                    _run_forecast_task, coin, model_type, df, self.prediction_days,
+                    self.register_models, selections.get(coin), cross_asset.get(coin)
+                ): (coin, model_type)
+                for coin, df in frames.items()
+                for model_type in self.model_types
+            }
+            for future in as_completed(futures):
+                coin, model_type = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Error forecasting {coin}/{model_type}: {str(e)}")
+                    result = None
+                if result:
+                    results[coin][model_type] = result
+                else:
+                    failures.append((coin, model_type))
+
+        rows = []
+        for coin, model_results in results.items():
+            df = frames[coin]
+            payloads = {}
+            for model_type, result in model_results.items():
+                rows.extend(build_prediction_rows(coin, model_type, result, generated_at))
+                payloads[model_type] = build_forecast_payload(
+                    coin, model_type, result, df['date'].iloc[-1], df['price'].iloc[-1], generated_at
+                )
+            if payloads:
+                self.cache.write_coin(coin, payloads, generated_at)
+
+        inserted = self.db.save_ml_predictions_bulk(rows)
+
+        # Record the latest observed prices so earlier forecasts can be reconciled against them
+        self.db.save_market_data_bulk([
+            {
+                'crypto_symbol': get_coin_symbol(coin),
+                'price': float(df['price'].iloc[-1]),
+                'volume': float(df['volume'].iloc[-1]),
+                'timestamp': generated_at
+            }
+            for coin, df in frames.items()
+        ])
+        reconciled = self.db.backfill_actual_prices(now=generated_at)
+        self.last_run = {
+            'generated_at': generated_at.isoformat(),
+            'coins': len(frames),
+            'forecasts': sum(len(r) for r in results.values()),
+            'failures': failures,
+            'train_seconds': {
+                f"{coin}/{model_type}": round(result['train_time'], 3)
+                for coin, model_results in results.items()
+                for model_type, result in model_results.items()
+            },
+            'rows_inserted': inserted,
+            'predictions_reconciled': reconciled,
+            'duration_seconds': time.perf_counter() - started
+        }
+        return self.last_run
+
+    def run_forever(self, interval_seconds, stop_event=None):
+        """Run on a fixed cadence until `stop_event` is set"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            started = time.monotonic()
+            try:
+                summary = self.run_once()
+                print(f"Forecast batch finished: {summary}")
+            except Exception as e:
+                print(f"Forecast batch failed: {str(e)}")
+            stop_event.wait(max(0.0, interval_seconds - (time.monotonic() - started)))
+
+    def start(self, interval_seconds):
+        """Run the job on a daemon thread; returns the Event that stops it"""
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=self.run_forever, args=(interval_seconds, stop_event),
+            name='forecast-batch', daemon=True
+        )
+        thread.start()
+        return stop_event
+
@@ -0,0 +1,267 @@
+import math
+from collections import deque
+
+# Windows of the moving averages CryptoPredictor.prepare_features uses, plus the 50-period
+# SMA the market dashboard draws
+SMA_WINDOWS = (7, 14, 21, 50)
+RSI_PERIOD = 14
+BOLLINGER_WINDOW = 20
+VOLATILITY_WINDOW = 14
+VOLUME_SMA_WINDOW = 20
+MOMENTUM_PERIODS = (3, 7)
+LAG_PERIODS = (1, 2, 3, 5, 7)
+
+
+class RollingWindow:
+    """Fixed-size window with O(1) running mean and sample variance.
+
+    The mean and sum of squared deviations are updated with Welford's method; once the
+    window is full, the incoming value replaces the oldest one in a single combined update,
+    which stays stable where a running sum of squares would lose precision on large prices.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value):
+        if len(self.values) == self.size:
+            oldest = self.values[0]
+            new_mean = self.mean + (value - oldest) / self.size
+            self.m2 += (value - oldest) * (value - new_mean + oldest - self.mean)
+            self.mean = new_mean
+        else:
+            delta = value - self.mean
+            self.mean += delta / (len(self.values) + 1)
+            self.m2 += delta * (value - self.mean)
+        self.values.append(value)
+        # Rounding can leave a tiny negative residue on a constant window
+        if self.m2 < 0:
+            self.m2 = 0.0
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def average(self):
+        """Window mean, or NaN until the window has filled (like pandas rolling)"""
+        return self.mean if self.full else math.nan
+
+    def std(self):
+        """Sample standard deviation (ddof=1), or NaN until the window has filled"""
+        if not self.full or self.size < 2:
+            return math.nan
+        return math.sqrt(self.m2 / (self.size - 1))
+
+    def state(self):
+        return {'size': self.size, 'values': list(self.values), 'mean': self.mean, 'm2': self.m2}
+
+    @classmethod
+    def from_state(cls, state):
+        window = cls(state['size'])
+        window.values.extend(state['values'])
+        window.mean = state['mean']
+        window.m2 = state['m2']
+        return window
+
+
+def _pct_change(current, previous):
+    if previous is None:
+        return math.nan
+    if previous == 0:
+        return math.nan if current == 0 else math.copysign(math.inf, current)
+    return current / previous - 1
+
+
+class IndicatorEngine:
+    """Incremental technical indicators, updated in O(1) per tick.
+
+    Produces every feature column of CryptoPredictor.prepare_features (plus ma_50), so
+    `feature_vector(predictor.feature_columns)` can be fed to a model trained on that frame
+    (benchmarks/bench_indicators.py checks the parity). RSI uses a 14-period
+    simple average of gains/losses by default, matching prepare_features; pass
+    rsi_method='wilder' for Wilder's smoothing. The full state round-trips through
+    `snapshot()` / `from_snapshot()` as plain JSON-serializable data, so a live feed can
+    resume without replaying history.
+    """
+
+    def __init__(self, rsi_method='sma'):
+        if rsi_method not in ('sma', 'wilder'):
+            raise ValueError(f"Unknown RSI method: {rsi_method}")
+        self.rsi_method = rsi_method
+        self.ticks = 0
+        self.sma = {window: RollingWindow(window) for window in SMA_WINDOWS}
+        self.bollinger = RollingWindow(BOLLINGER_WINDOW)
+        self.volatility = RollingWindow(VOLATILITY_WINDOW)
+        self.volume_sma = RollingWindow(VOLUME_SMA_WINDOW)
+        self.gains = RollingWindow(RSI_PERIOD)
+        self.losses = RollingWindow(RSI_PERIOD)
+        self.avg_gain = None
+        self.avg_loss = None
+        history = max(max(LAG_PERIODS), max(MOMENTUM_PERIODS)) + 1
+        self.prices = deque(maxlen=history)
+        self.volumes = deque(maxlen=history)
+        self.latest = {}
+
+    def update(self, price, volume=math.nan):
+        """Add one tick and return the indicator values as of that tick"""
+        price = float(price)
+        volume = float(volume)
+        previous_price = self.prices[-1] if self.prices else None
+        previous_volume = self.volumes[-1] if self.volumes else None
+        self.prices.append(price)
+        self.volumes.append(volume)
+        self.ticks += 1
+
+        for window in self.sma.values():
+            window.push(price)
+        self.bollinger.push(price)
+        self.volatility.push(price)
+        self.volume_sma.push(volume)
+
+        # The first tick has no delta; like prepare_features it counts as zero gain and loss
+        delta = 0.0 if previous_price is None else price - previous_price
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        self.gains.push(gain)
+        self.losses.push(loss)
+
+        row = {
+            'volume': volume,
+            'price_change': _pct_change(price, previous_price),
+            'volume_change': _pct_change(volume, previous_volume),
+        }
+        for window, rolling in self.sma.items():
+            row[f'ma_{window}'] = rolling.average()
+        row['rsi'] = self._rsi(gain, loss)
+
+        middle = self.bollinger.average()
+        band = self.bollinger.std() * 2
+        row['bb_middle'] = middle
+        row['bb_upper'] = middle + band
+        row['bb_lower'] = middle - band
+        row['bb_position'] = (price - row['bb_lower']) / (2 * band) if band else math.nan
+        row['volatility'] = self.volatility.std()
+
+        for period in MOMENTUM_PERIODS:
+            row[f'momentum_{period}'] = _pct_change(price, self._lagged(self.prices, period))
+        row['volume_sma'] = self.volume_sma.average()
+        row['volume_ratio'] = volume / row['volume_sma'] if row['volume_sma'] else math.nan
+
+        for lag in LAG_PERIODS:
+            lagged_price = self._lagged(self.prices, lag)
+            lagged_volume = self._lagged(self.volumes, lag)
+            row[f'price_lag_{lag}'] = math.nan if lagged_price is None else lagged_price
+            row[f'volume_lag_{lag}'] = math.nan if lagged_volume is None else lagged_volume
+
+        self.latest = row
+        return row
+
+    def update_many(self, prices, volumes=None):
+        """Feed a batch of ticks (e.g. to warm up from history); returns the last row"""
+        if volumes is None:
+            volumes = [math.nan] * len(prices)
+        row = self.latest
+        for price, volume in zip(prices, volumes):
+            row = self.update(price, volume)
+        return row
+
+    def feature_vector(self, feature_columns):
+        """Latest indicator values in a model's feature column order"""
+        return [self.latest.get(col, math.nan) for col in feature_columns]
+
+    def _rsi(self, gain, loss):
+        if self.rsi_method == 'sma':
+            if not self.gains.full:
+                return math.nan
+            avg_gain, avg_loss = self.gains.mean, self.losses.mean
+        else:
+            if self.avg_gain is None:
+                if not self.gains.full:
+                    return math.nan
+                # Wilder's average is seeded with the simple average of the first period
+                self.avg_gain, self.avg_loss = self.gains.mean, self.losses.mean
+            else:
+                self.avg_gain = (self.avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                self.avg_loss = (self.avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+            avg_gain, avg_loss = self.avg_gain, self.avg_loss
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else math.nan
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+    @staticmethod
+    def _lagged(history, lag):
+        return history[-1 - lag] if len(history) > lag else None
+
+    def snapshot(self):
+        """JSON-serializable engine state"""
+        return {
+            'rsi_method': self.rsi_method,
+            'ticks': self.ticks,
+            'sma': {str(window): rolling.state() for window, rolling in self.sma.items()},
+            'bollinger': self.bollinger.state(),
+            'volatility': self.volatility.state(),
+            'volume_sma': self.volume_sma.state(),
+            'gains': self.gains.state(),
+            'losses': self.losses.state(),
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'prices': list(self.prices),
+            'volumes': list(self.volumes),
+            'latest': dict(self.latest)
+        }
+
+    @classmethod
+    def from_snapshot(cls, state):
+        """Resume an engine from `snapshot()` output"""
+        engine = cls(rsi_method=state['rsi_method'])
+        engine.ticks = state['ticks']
+        engine.sma = {int(window): RollingWindow.from_state(s) for window, s in state['sma'].items()}
+        for name in ('bollinger', 'volatility', 'volume_sma', 'gains', 'losses'):
+            setattr(engine, name, RollingWindow.from_state(state[name]))
+        engine.avg_gain = state['avg_gain']
+        engine.avg_loss = state['avg_loss']
+        engine.prices.extend(state['prices'])
+        engine.volumes.extend(state['volumes'])
+        engine.latest = dict(state['latest'])
+        return engine
+
+
+class IndicatorHistory:
+    """Indicator series for a timestamped feed that only processes ticks it has not seen.
+
+    Dashboards re-fetch overlapping windows of history on every refresh; `extend` skips
+    timestamps at or before the last one processed, so each refresh costs O(new ticks).
+    """
+
+    def __init__(self, engine=None, max_length=None):
+        self.engine = engine or IndicatorEngine()
+        self.timestamps = deque(maxlen=max_length)
+        self.rows = deque(maxlen=max_length)
+
+    @property
+    def last_timestamp(self):
+        return self.timestamps[-1] if self.timestamps else None
+
+    def extend(self, timestamps, prices, volumes=None):
+        """Feed new ticks; returns how many were processed"""
+        if volumes is None:
+            volumes = [math.nan] * len(prices)
+        last = self.last_timestamp
+        added = 0
+        for timestamp, price, volume in zip(timestamps, prices, volumes):
+            if last is not None and timestamp <= last:
+                continue
+            self.rows.append(self.engine.update(price, volume))
+            self.timestamps.append(timestamp)
+            added += 1
+        return added
+
+    def series(self, name, since=None):
+        """(timestamps, values) of one indicator, optionally from `since` onwards"""
+        pairs = [
+            (timestamp, row[name]) for timestamp, row in zip(self.timestamps, self.rows)
+            if since is None or timestamp >= since
+        ]
+        return [t for t, _ in pairs], [v for _, v in pairs]
@@ -0,0 +1,94 @@
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+
+def _trie_pattern(terms):
+    """Regex alternation factored as a prefix trie, e.g. 'b(?:earish|ullish)'
+
+    The regex engine then tests each character against one branch set instead of retrying
+    every term from the same position, which is what makes a single scan cheap.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Finds every term of a fixed vocabulary in a text with one compiled regex scan.
+
+    `groups` maps a label (a coin, a lexicon term, ...) to its terms. All terms are
+    compiled once into a single trie-shaped pattern that only matches at word starts, so
+    'eth' does not fire inside 'something' and 'ada' not inside 'canada'. With
+    `whole_words=True` a match must also end at a word boundary; otherwise trailing word
+    characters are allowed so inflections still count ('crash' matches 'crashed').
+    Matching is case-insensitive.
+
+    A scan consumes the longest term at each position, so terms nested inside a longer
+    match ('moon' in 'to the moon') are added back from a table built here.
+    """
+
+    def __init__(self, groups, whole_words=True):
+        self.labels_by_term = defaultdict(set)
+        for label, terms in groups.items():
+            for term in terms:
+                self.labels_by_term[term.lower()].add(label)
+        self.whole_words = whole_words
+
+        terms = list(self.labels_by_term)
+        # Underscores separate words here, as in hashtags like #ethereum_news
+        suffix = r'(?![^\W_])' if whole_words else r'[^\W_]*'
+        self.pattern = re.compile(rf'(?<![^\W_])({_trie_pattern(terms)}){suffix}')
+
+        self.terms_by_label = defaultdict(set)
+        for term, labels in self.labels_by_term.items():
+            for label in labels:
+                self.terms_by_label[label].add(term)
+        # Only terms that contain other terms need expanding after a scan
+        self.nested_terms = {}
+        for term in terms:
+            nested = {
+                other for other in terms
+                if len(other) < len(term) and re.search(rf'(?<![^\W_]){re.escape(other)}{suffix}', term)
+            }
+            if nested:
+                self.nested_terms[term] = nested
+
+    def find_terms(self, text, lowered=False):
+        """Distinct vocabulary terms present in `text` (lowered=True skips lowercasing it)"""
+        if not text:
+            return set()
+        found = set(self.pattern.findall(text if lowered else text.lower()))
+        for term in found & self.nested_terms.keys():
+            found |= self.nested_terms[term]
+        return found
+
+    def count_by_label(self, text):
+        """Number of distinct terms per label present in `text`"""
+        counts = defaultdict(int)
+        for term in self.find_terms(text):
+            for label in self.labels_by_term[term]:
+                counts[label] += 1
+        return dict(counts)
+
+    def count_for_label(self, text, label):
+        """Number of distinct terms of one label present in `text`"""
+        return len(self.find_terms(text) & self.terms_by_label[label])
+
+
+@lru_cache(maxsize=64)
+def keyword_matcher_for(terms, whole_words=True):
+    """Cached single-group matcher for an ad hoc tuple of terms"""
+    return KeywordMatcher({None: terms}, whole_words=whole_words)
@@ -1,13 +1,20 @@
+import copy
+import hashlib
+import os
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import train_test_split, cross_val_score, TimeSeriesSplit
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from sklearn.preprocessing import StandardScaler
 import xgboost as xgb
 import warnings
 warnings.filterwarnings('ignore')
 from utils.database import get_database
+from utils.profiling import TrainingProfiler
+from utils.cross_asset import merge_cross_asset_features
 
 # TensorFlow imports with error handling
 try:
@@ -24,15 +31,243 @@ except Exception as e:
     TENSORFLOW_AVAILABLE = False
     print(f"TensorFlow error: {str(e)}. LSTM models will be disabled.")
 
+
+def make_sequence_windows(features, sequence_length):
+    """Return a zero-copy (n_windows, sequence_length, n_features) view over consecutive rows"""
+    features = np.asarray(features)
+    if features.ndim == 1:
+        features = features.reshape(-1, 1)
+    # sliding_window_view puts the window axis last; swap it back so each
+    # window reads as (time, feature) without materializing anything.
+    windows = sliding_window_view(features, sequence_length, axis=0)
+    return windows.transpose(0, 2, 1)
+
+
+def iter_window_batches(windows, targets, batch_size=32, shuffle=False, rng=None):
+    """Yield (X, y) float32 batches copied out of a strided window view one batch at a time"""
+    n_windows = len(windows)
+    order = np.arange(n_windows)
+    if shuffle:
+        rng = rng if rng is not None else np.random.default_rng()
+        rng.shuffle(order)
+    for start in range(0, n_windows, batch_size):
+        idx = order[start:start + batch_size]
+        if not shuffle:
+            idx = slice(idx[0], idx[-1] + 1)
+        yield (
+            np.ascontiguousarray(windows[idx], dtype=np.float32),
+            np.ascontiguousarray(targets[idx], dtype=np.float32)
+        )
+
+
+def _window_dataset(windows, targets, batch_size=32, shuffle=False, seed=42):
+    """Stream strided windows into Keras through tf.data instead of a stacked array"""
+    _, sequence_length, n_features = windows.shape
+    rng = np.random.default_rng(seed)
+
+    def generator():
+        # tf.data calls this once per epoch, so each epoch gets a fresh shuffle
+        yield from iter_window_batches(windows, targets, batch_size, shuffle=shuffle, rng=rng)
+
+    dataset = tf.data.Dataset.from_generator(
+        generator,
+        output_signature=(
+            tf.TensorSpec(shape=(None, sequence_length, n_features), dtype=tf.float32),
+            tf.TensorSpec(shape=(None, targets.shape[1]), dtype=tf.float32)
+        )
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def batched_lstm_rollout(model, seed_windows, steps, target_col=0, noise=None):
+    """Autoregressively roll a sequence model forward for a whole batch of windows at once
+
+    seed_windows is (batch, sequence_length, n_features) and can hold one window per coin
+    or the same window repeated per Monte-Carlo scenario. Each step runs a single batched
+    forward pass; the predicted value replaces `target_col` in the next row and the other
+    features are carried forward from the latest row. `noise`, if given, is a (batch, steps)
+    array added to the scaled prediction before it is fed back. Returns a (batch, steps)
+    array of scaled predictions.
+    """
+    seed_windows = np.asarray(seed_windows, dtype=np.float32)
+    batch_size, sequence_length, _ = seed_windows.shape
+    
+    # Mirrored ring buffer: every slot is stored twice, so the current window is always
+    # the contiguous slice buffer[:, head:head + sequence_length] and advancing the window
+    # is two row writes instead of a shift of the whole sequence.
+    buffer = np.concatenate([seed_windows, seed_windows], axis=1)
+    outputs = np.empty((batch_size, steps), dtype=np.float32)
+    head = 0
+    
+    for step in range(steps):
+        window = buffer[:, head:head + sequence_length]
+        # Calling the model directly skips the per-call dataset setup done by predict()
+        pred = np.asarray(model(window, training=False)).reshape(batch_size)
+        if noise is not None:
+            pred = pred + noise[:, step]
+        outputs[:, step] = pred
+        
+        new_row = buffer[:, head + sequence_length - 1].copy()
+        new_row[:, target_col] = pred
+        buffer[:, head] = new_row
+        buffer[:, head + sequence_length] = new_row
+        head = (head + 1) % sequence_length
+    
+    return outputs
+
+
+# Forecast model types (as stored in ml_predictions.model_type) and their trainers
+MODEL_TRAINERS = {
+    'ensemble': 'train_ensemble_model',
+    'random_forest': 'train_random_forest',
+    'xgboost': 'train_xgboost',
+    'lstm': 'train_lstm_model'
+}
+
+INTERVAL_PATHS = 5000
+INTERVAL_QUANTILES = (5, 50, 95)
+
+
+def monte_carlo_intervals(point_predictions, relative_residuals, n_paths=INTERVAL_PATHS,
+                          quantiles=INTERVAL_QUANTILES, random_state=42):
+    """Prediction intervals from bootstrapped one-step residuals compounded over the horizon
+
+    All paths are drawn as a single (n_paths, horizon) array: each step's relative error is
+    resampled from the model's out-of-sample residuals and compounded, because every future
+    step is fed the previous prediction. Returns {'p5': array, 'p50': array, 'p95': array}
+    (keys follow `quantiles`), one value per horizon step.
+    """
+    point_predictions = np.asarray(point_predictions, dtype=float)
+    relative_residuals = np.asarray(relative_residuals, dtype=float)
+    relative_residuals = relative_residuals[np.isfinite(relative_residuals)]
+    if len(relative_residuals) == 0:
+        relative_residuals = np.zeros(1)
+    
+    rng = np.random.default_rng(random_state)
+    shocks = rng.choice(relative_residuals, size=(n_paths, len(point_predictions)))
+    paths = point_predictions * np.cumprod(1 + shocks, axis=1)
+    return paths_to_intervals(paths, quantiles)
+
+
+def paths_to_intervals(paths, quantiles=INTERVAL_QUANTILES):
+    """Summarize an (n_paths, horizon) array of simulated prices as per-step percentiles"""
+    bands = np.percentile(paths, quantiles, axis=0)
+    return {f'p{q:g}': band for q, band in zip(quantiles, bands)}
+
+
+# Stacked ensemble: base models whose out-of-fold predictions feed the meta-learner.
+# The bool marks models trained on standardized features.
+ENSEMBLE_BASE_MODELS = (('rf', True), ('gbr', True), ('xgb', False))
+STACKING_FOLDS = 5
+# Cached base models keep serving a rolling window until this many training rows are newer
+# than the data they were fit on; then everything is retrained
+STACKING_MAX_NEW_ROWS = int(os.getenv('STACKING_MAX_NEW_ROWS', '30'))
+# Fewest out-of-fold rows a meta-learner refit may use
+MIN_META_ROWS = 20
+
+
+def make_ensemble_base_model(name):
+    """Fresh, unfitted ensemble base model"""
+    if name == 'rf':
+        return RandomForestRegressor(n_estimators=100, random_state=42)
+    if name == 'gbr':
+        return GradientBoostingRegressor(n_estimators=100, random_state=42)
+    if name == 'xgb':
+        return xgb.XGBRegressor(n_estimators=100, random_state=42)
+    raise ValueError(f"Unknown ensemble base model: {name}")
+
+
+def make_meta_learner():
+    """Non-negative linear blend of the base model predictions"""
+    return LinearRegression(positive=True, fit_intercept=False)
+
+
+def data_fingerprint(*arrays):
+    """Stable digest of the training data, used to key cached out-of-fold predictions"""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    digest.update(repr((ENSEMBLE_BASE_MODELS, STACKING_FOLDS)).encode())
+    return digest.hexdigest()
+
+
+def out_of_fold_predictions(X, y, n_splits=STACKING_FOLDS):
+    """Base model predictions for rows each model never saw during fitting
+
+    Uses expanding-window TimeSeriesSplit folds, so every prediction comes from models fit
+    only on earlier rows; the first fold's training block has no out-of-fold prediction.
+    Scaling is fit per fold as well. Returns (oof, y_oof) with one column per base model.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    splits = list(TimeSeriesSplit(n_splits=n_splits).split(X))
+    start = splits[0][1][0]
+    oof = np.empty((len(X) - start, len(ENSEMBLE_BASE_MODELS)))
+    
+    for train_idx, val_idx in splits:
+        X_fold_train, X_fold_val = X[train_idx], X[val_idx]
+        scaler = StandardScaler().fit(X_fold_train)
+        X_fold_train_scaled = scaler.transform(X_fold_train)
+        X_fold_val_scaled = scaler.transform(X_fold_val)
+        for col, (name, scaled) in enumerate(ENSEMBLE_BASE_MODELS):
+            model = make_ensemble_base_model(name)
+            if scaled:
+                model.fit(X_fold_train_scaled, y[train_idx])
+                oof[val_idx - start, col] = model.predict(X_fold_val_scaled)
+            else:
+                model.fit(X_fold_train, y[train_idx])
+                oof[val_idx - start, col] = model.predict(X_fold_val)
+    
+    return oof, y[start:]
+
+
 class CryptoPredictor:
-    def __init__(self):
+    def __init__(self, metrics_sinks=None, profile_memory='rss', feature_selector=None,
+                 cross_asset_features=None, feature_selection=None):
         self.scaler = StandardScaler()
         self.models = {}
         self.feature_columns = []
-        
-    def prepare_features(self, df):
+        # Per-model input spec (feature columns and the scaler fitted for that model),
+        # since self.scaler is refit by every trainer
+        self.model_inputs = {}
+        # Every train_* run reports a stage timing breakdown to these callables
+        self.metrics_sinks = list(metrics_sinks or [])
+        self.profile_memory = profile_memory
+        self.last_timings = None
+        # Optional FeatureSelector that narrows the tree models' inputs per coin
+        self.feature_selector = feature_selector
+        # Optional precomputed selection (FeatureSelector.select result) used instead of the selector
+        self.feature_selection = feature_selection
+        # Optional MultiAssetFeatureBuilder.features_for(coin) frame merged into every feature set
+        self.cross_asset_features = cross_asset_features
+    
+    def add_metrics_sink(self, sink):
+        """Register a callable that receives each training run's timing report"""
+        self.metrics_sinks.append(sink)
+    
+    def _start_profile(self, model_type):
+        return TrainingProfiler(model_type, memory=self.profile_memory).start()
+    
+    def _finish_profile(self, profiler, result):
+        """Attach the timing report to a trainer result and publish it to the sinks"""
+        report = profiler.stop()
+        result['timings'] = report
+        result['train_time'] = report['total_wall_seconds']
+        self.last_timings = report
+        for sink in self.metrics_sinks:
+            try:
+                sink(report)
+            except Exception as e:
+                print(f"Error in metrics sink: {str(e)}")
+        return result
+    
+    def prepare_features(self, df, cross_asset_features=None):
         """Prepare technical indicators and features for ML models"""
         df = df.copy()
+        if cross_asset_features is None:
+            cross_asset_features = self.cross_asset_features
         
         # Technical indicators
         df['price_change'] = df['price'].pct_change()
@@ -73,13 +308,128 @@ class CryptoPredictor:
             df[f'price_lag_{lag}'] = df['price'].shift(lag)
             df[f'volume_lag_{lag}'] = df['volume'].shift(lag)
         
+        # Shared market features (BTC returns, index, cross-asset correlations)
+        if cross_asset_features is not None:
+            df = merge_cross_asset_features(df, cross_asset_features)
+        
         # Future target (what we want to predict)
         df['target'] = df['price'].shift(-1)
         
         return df
     
-    def train_ensemble_model(self, df, prediction_days=7):
-        """Train ensemble model combining multiple algorithms"""
+    def get_feature_columns(self, df_features):
+        """Model input columns of a prepare_features frame"""
+        return [col for col in df_features.columns if col not in ['date', 'price', 'target']]
+    
+    def prepare_feature_matrix(self, df, dtype=np.float32):
+        """Compact (X, y, feature_cols, dates) arrays for training, without the date column
+
+        Each column is converted straight into a preallocated C-ordered array of `dtype`, so no
+        float64 copy of the full matrix is ever built.
+        """
+        df_features = self.prepare_features(df).dropna()
+        feature_cols = self.get_feature_columns(df_features)
+        
+        X = np.empty((len(df_features), len(feature_cols)), dtype=dtype)
+        for i, col in enumerate(feature_cols):
+            X[:, i] = df_features[col].to_numpy(dtype=dtype)
+        y = df_features['target'].to_numpy(dtype=dtype)
+        dates = df_features['date'].to_numpy(dtype='datetime64[ns]') if 'date' in df_features else None
+        
+        return X, y, feature_cols, dates
+    
+    def _training_split(self, df):
+        """(feature_cols, X, X_train, X_test, y_train, y_test) for the tree models, or None if too short"""
+        df_features = self.prepare_features(df).dropna()
+        if len(df_features) < 50:
+            return None
+        feature_cols = self.get_feature_columns(df_features)
+        X = df_features[feature_cols]
+        y = df_features['target']
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, shuffle=False
+        )
+        return feature_cols, X, X_train, X_test, y_train, y_test
+    
+    def select_features_for(self, crypto_symbol, df):
+        """The feature selector's selection for a coin's training split, or None
+
+        Lets a caller training several models for one coin compute the selection once and
+        hand it to each predictor as `feature_selection`.
+        """
+        if self.feature_selector is None:
+            return None
+        split = self._training_split(df)
+        if split is None:
+            return None
+        feature_cols, _, X_train, _, y_train, _ = split
+        # Column 0 is where the forecast rollouts write each new prediction, so it always stays
+        return self.feature_selector.select(
+            crypto_symbol, X_train.values, y_train.values, feature_cols, keep=feature_cols[:1]
+        )
+    
+    def _apply_feature_selection(self, crypto_symbol, feature_cols, X, X_train, X_test, y_train):
+        """Narrow the feature frames to the selected columns; unchanged without a selection or selector"""
+        selection = self.feature_selection
+        if selection is not None and selection['candidate_columns'] != list(feature_cols):
+            selection = None
+        if selection is None:
+            if self.feature_selector is None:
+                return feature_cols, X, X_train, X_test, None
+            # Column 0 is where the forecast rollouts write each new prediction, so it always stays
+            selection = self.feature_selector.select(
+                crypto_symbol, X_train.values, y_train.values, feature_cols, keep=feature_cols[:1]
+            )
+        cols = selection['selected_columns']
+        summary = {
+            'method': selection['method'],
+            'selected': len(cols),
+            'total': len(feature_cols),
+            'dropped_columns': selection['dropped_columns']
+        }
+        return cols, X[cols], X_train[cols], X_test[cols], summary
+    
+    @staticmethod
+    def _reusable_stacking_rows(state, train_dates, y_train, refit_meta_only):
+        """Mask of the cached out-of-fold rows a rolled-forward training split can keep, or None
+
+        The cached base models can be reused when the split only drops rows from the start
+        and appends rows after the cached ones (a rolling or growing window), the targets of
+        the rows both cover agree, and no more than STACKING_MAX_NEW_ROWS rows are new
+        (unbounded with `refit_meta_only`).
+        """
+        cached_dates = state.get('train_dates')
+        if cached_dates is None:
+            return None
+        new_rows = int(np.sum(train_dates > state['base_end']))
+        if not refit_meta_only and new_rows > STACKING_MAX_NEW_ROWS:
+            return None
+        overlap = np.isin(train_dates, cached_dates)
+        # Rows missing from the cache must all come after it
+        if not overlap.any() or np.any(train_dates[~overlap] <= cached_dates[-1]):
+            return None
+        cached_targets = state['train_target'][np.isin(cached_dates, train_dates)]
+        if not np.allclose(cached_targets, y_train.values[overlap], rtol=1e-6):
+            return None
+        keep = np.isin(state['oof_dates'], train_dates)
+        if keep.sum() + np.sum(~overlap) < MIN_META_ROWS:
+            return None
+        return keep
+    
+    def train_ensemble_model(self, df, prediction_days=7, crypto_symbol=None, refit_meta_only=False):
+        """Train a stacked ensemble of Random Forest, Gradient Boosting and XGBoost
+
+        A non-negative linear meta-learner is fit on out-of-fold base model predictions of
+        the training split. With `crypto_symbol`, the fitted base models, scaler, out-of-fold
+        predictions and meta-learner are persisted in the model registry, keyed by the dates
+        of the training rows, and reused as they are while the training data is unchanged.
+        When the window has rolled forward (see _reusable_stacking_rows) the base models are
+        kept: out-of-fold rows that left the window are dropped, the base models' predictions
+        on the new rows (out-of-fold by construction) are appended and only the meta-learner
+        is refit. After STACKING_MAX_NEW_ROWS new rows, or any other change, everything is
+        retrained; `refit_meta_only` lifts the new-row limit.
+        """
+        profiler = self._start_profile('ensemble')
         try:
             # Prepare features
             df_features = self.prepare_features(df)
@@ -99,72 +449,131 @@ class CryptoPredictor:
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.2, random_state=42, shuffle=False
             )
+            profiler.lap('feature_prep')
             
-            # Scale features
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
-            
-            # Train individual models
-            models = {
-                'rf': RandomForestRegressor(n_estimators=100, random_state=42),
-                'gbr': GradientBoostingRegressor(n_estimators=100, random_state=42),
-                'xgb': xgb.XGBRegressor(n_estimators=100, random_state=42)
-            }
-            
-            predictions = {}
-            model_scores = {}
-            
-            for name, model in models.items():
-                if name == 'xgb':
-                    model.fit(X_train, y_train)
-                    pred = model.predict(X_test)
+            feature_cols, X, X_train, X_test, selection = self._apply_feature_selection(
+                crypto_symbol, feature_cols, X, X_train, X_test, y_train
+            )
+            self.feature_columns = feature_cols
+            if selection:
+                profiler.lap('feature_selection')
+            
+            # Row keys for the cache: dates when the frame has them, else its row labels
+            train_dates = (df_features.loc[X_train.index, 'date'] if 'date' in df_features
+                           else X_train.index.to_series()).to_numpy()
+            registry = None
+            state = None
+            keep = None
+            fingerprint = data_fingerprint(X_train.values, y_train.values)
+            if crypto_symbol:
+                from utils.model_registry import get_model_registry
+                registry = get_model_registry()
+                state = registry.load_stacking(crypto_symbol)
+                if state is not None and state['feature_columns'] != feature_cols:
+                    state = None
+                if state is not None and state['fingerprint'] != fingerprint:
+                    keep = self._reusable_stacking_rows(state, train_dates, y_train, refit_meta_only)
+                    if keep is None:
+                        state = None
+            
+            meta_model = None
+            if state is not None:
+                # Base models and their out-of-fold predictions are cached
+                self.scaler = copy.deepcopy(state['scaler'])
+                base_models = state['base_models']
+                base_end = state['base_end']
+                oof, y_oof, oof_dates = state['oof_predictions'], state['oof_target'], state['oof_dates']
+                if keep is None:
+                    meta_model = state['meta_model']
                 else:
-                    model.fit(X_train_scaled, y_train)
-                    pred = model.predict(X_test_scaled)
-                
-                predictions[name] = pred
-                model_scores[name] = r2_score(y_test, pred)
-                self.models[name] = model
-            
-            # Ensemble prediction (weighted average)
-            weights = np.array([model_scores[name] for name in models.keys()])
-            weights = weights / weights.sum()  # Normalize weights
-            
-            ensemble_pred = np.zeros_like(list(predictions.values())[0])
-            for i, (name, pred) in enumerate(predictions.items()):
-                ensemble_pred += weights[i] * pred
+                    # Rows after the cached ones were never seen by the base models
+                    new = train_dates > state['train_dates'][-1]
+                    X_new = X_train.values[new]
+                    X_new_scaled = self.scaler.transform(X_new)
+                    oof = np.vstack([oof[keep], np.column_stack([
+                        base_models[name].predict(X_new_scaled if scaled else X_new)
+                        for name, scaled in ENSEMBLE_BASE_MODELS
+                    ])])
+                    y_oof = np.concatenate([y_oof[keep], y_train.values[new]])
+                    oof_dates = np.concatenate([oof_dates[keep], train_dates[new]])
+                profiler.lap('load_cached')
+            else:
+                oof, y_oof = out_of_fold_predictions(X_train.values, y_train.values)
+                oof_dates = train_dates[len(train_dates) - len(y_oof):]
+                base_end = train_dates[-1]
+                profiler.lap('out_of_fold')
+                X_train_scaled = self.scaler.fit_transform(X_train)
+                profiler.lap('scaling')
+                base_models = {}
+                for name, scaled in ENSEMBLE_BASE_MODELS:
+                    model = make_ensemble_base_model(name)
+                    model.fit(X_train_scaled if scaled else X_train, y_train)
+                    base_models[name] = model
+            
+            if meta_model is None:
+                meta_model = make_meta_learner().fit(oof, y_oof)
+                if not np.any(meta_model.coef_ > 0):
+                    # Degenerate blend; fall back to an equal-weight average
+                    meta_model.coef_ = np.full(len(ENSEMBLE_BASE_MODELS), 1.0 / len(ENSEMBLE_BASE_MODELS))
+            weights = meta_model.coef_
+            profiler.lap('fit')
+            
+            if registry is not None and (state is None or state['fingerprint'] != fingerprint):
+                registry.save_stacking(crypto_symbol, {
+                    'fingerprint': fingerprint,
+                    'train_dates': train_dates,
+                    'train_target': y_train.to_numpy(),
+                    'base_end': base_end,
+                    'oof_dates': oof_dates,
+                    'feature_columns': feature_cols,
+                    'scaler': copy.deepcopy(self.scaler),
+                    'base_models': base_models,
+                    'oof_predictions': oof,
+                    'oof_target': y_oof,
+                    'meta_model': meta_model
+                })
+                profiler.lap('persist')
+            
+            def base_predictions(features):
+                features_scaled = self.scaler.transform(features)
+                return np.column_stack([
+                    base_models[name].predict(features_scaled if scaled else features)
+                    for name, scaled in ENSEMBLE_BASE_MODELS
+                ])
+            
+            for name, scaled in ENSEMBLE_BASE_MODELS:
+                self.models[name] = base_models[name]
+                self.model_inputs[name] = {
+                    'feature_columns': feature_cols,
+                    'scaler': copy.deepcopy(self.scaler) if scaled else None
+                }
+            self.models['meta'] = meta_model
+            
+            ensemble_pred = meta_model.predict(base_predictions(X_test))
             
             # Calculate metrics
             rmse = np.sqrt(mean_squared_error(y_test, ensemble_pred))
             mae = mean_absolute_error(y_test, ensemble_pred)
             r2 = r2_score(y_test, ensemble_pred)
             mape = np.mean(np.abs((y_test - ensemble_pred) / y_test)) * 100
+            profiler.lap('evaluation')
             
             # Generate future predictions
             future_predictions = []
-            last_features = X.iloc[-1:].values
+            last_features = X.iloc[-1:]
             
             for _ in range(prediction_days):
-                # Scale features for prediction
-                last_features_scaled = self.scaler.transform(last_features)
-                
-                # Get predictions from each model
-                pred_rf = self.models['rf'].predict(last_features_scaled)[0]
-                pred_gbr = self.models['gbr'].predict(last_features_scaled)[0]
-                pred_xgb = self.models['xgb'].predict(last_features)[0]
-                
-                # Ensemble prediction
-                ensemble_pred_single = (
-                    weights[0] * pred_rf + 
-                    weights[1] * pred_gbr + 
-                    weights[2] * pred_xgb
-                )
-                
+                ensemble_pred_single = meta_model.predict(base_predictions(last_features))[0]
                 future_predictions.append(ensemble_pred_single)
                 
                 # Update features for next prediction (simplified)
                 last_features = last_features.copy()
-                last_features[0][0] = ensemble_pred_single  # Update price
+                last_features.iloc[0, 0] = ensemble_pred_single  # Update price
+            
+            prediction_intervals = monte_carlo_intervals(
+                future_predictions, (y_test - ensemble_pred) / ensemble_pred
+            )
+            profiler.lap('forecast')
             
             # Feature importance (from Random Forest)
             feature_importance = dict(zip(
@@ -185,7 +594,7 @@ class CryptoPredictor:
                 drawdowns.append(drawdown)
             max_drawdown = min(drawdowns)
             
-            return {
+            result = {
                 'predictions': future_predictions,
                 'confidence': min(r2, 0.95),  # Cap confidence at 95%
                 'volatility': np.std(y_test.pct_change().dropna()) * 100,
@@ -196,15 +605,27 @@ class CryptoPredictor:
                 'sharpe_ratio': sharpe_ratio,
                 'max_drawdown': abs(max_drawdown),
                 'feature_importance': feature_importance,
-                'model_weights': dict(zip(models.keys(), weights))
+                'model_weights': {name: float(w) for (name, _), w in zip(ENSEMBLE_BASE_MODELS, weights)},
+                'reused_base_models': state is not None,
+                'meta_training_rows': len(y_oof),
+                'prediction_intervals': prediction_intervals
             }
+            if selection:
+                result['feature_selection'] = selection
+            return self._finish_profile(profiler, result)
             
         except Exception as e:
             print(f"Error in ensemble model training: {str(e)}")
             return None
+        finally:
+            profiler.stop()
     
-    def train_lstm_model(self, df, prediction_days=7):
-        """Train LSTM neural network model"""
+    def train_lstm_model(self, df, prediction_days=7, n_paths=0, random_state=42):
+        """Train LSTM neural network model
+
+        With n_paths > 0 the result also carries 'sampled_paths', an (n_paths, prediction_days)
+        array of price paths simulated by bootstrapping test residuals through a batched rollout.
+        """
         if not TENSORFLOW_AVAILABLE:
             return {
                 'error': 'TensorFlow not available',
@@ -225,6 +646,7 @@ class CryptoPredictor:
                 'training_history': {'loss': [], 'val_loss': []}
             }
         
+        profiler = self._start_profile('lstm')
         try:
             # Prepare data for LSTM
             prices = df['price'].values
@@ -244,19 +666,20 @@ class CryptoPredictor:
             
             # Combine features
             features = np.hstack([prices_scaled, volumes_scaled])
+            profiler.lap('scaling')
             
-            # Create sequences
-            X, y = [], []
-            for i in range(sequence_length, len(features)):
-                X.append(features[i-sequence_length:i])
-                y.append(prices_scaled[i])
-            
-            X, y = np.array(X), np.array(y)
+            # Create sequences as a strided view: window i covers rows
+            # [i, i + sequence_length) and predicts the price at row i + sequence_length
+            X = make_sequence_windows(features, sequence_length)[:-1]
+            y = prices_scaled[sequence_length:]
             
             # Split data
             split_idx = int(len(X) * 0.8)
             X_train, X_test = X[:split_idx], X[split_idx:]
             y_train, y_test = y[:split_idx], y[split_idx:]
+            train_dataset = _window_dataset(X_train, y_train, batch_size=32, shuffle=True)
+            test_dataset = _window_dataset(X_test, y_test, batch_size=32)
+            profiler.lap('feature_prep')
             
             # Build LSTM model
             model = Sequential([
@@ -275,16 +698,16 @@ class CryptoPredictor:
             # Train model
             early_stopping = EarlyStopping(patience=10, restore_best_weights=True)
             history = model.fit(
-                X_train, y_train,
-                batch_size=32,
+                train_dataset,
                 epochs=50,
-                validation_data=(X_test, y_test),
+                validation_data=test_dataset,
                 callbacks=[early_stopping],
                 verbose=0
             )
+            profiler.lap('fit')
             
             # Make predictions
-            test_predictions = model.predict(X_test)
+            test_predictions = model.predict(test_dataset, verbose=0)
             
             # Inverse transform
             test_predictions_actual = price_scaler.inverse_transform(test_predictions)
@@ -294,21 +717,28 @@ class CryptoPredictor:
             rmse = np.sqrt(mean_squared_error(y_test_actual, test_predictions_actual))
             mae = mean_absolute_error(y_test_actual, test_predictions_actual)
             r2 = r2_score(y_test_actual, test_predictions_actual)
+            profiler.lap('evaluation')
             
             # Generate future predictions
-            future_predictions = []
             last_sequence = features[-sequence_length:]
-            
-            for _ in range(prediction_days):
-                pred_scaled = model.predict(last_sequence.reshape(1, sequence_length, 2))[0]
-                pred_actual = price_scaler.inverse_transform(pred_scaled.reshape(-1, 1))[0][0]
-                future_predictions.append(pred_actual)
-                
-                # Update sequence
-                new_row = np.array([[pred_scaled[0], volumes_scaled[-1][0]]])
-                last_sequence = np.vstack([last_sequence[1:], new_row])
-            
-            return {
+            rollout = batched_lstm_rollout(model, last_sequence[np.newaxis], prediction_days)
+            future_predictions = price_scaler.inverse_transform(rollout.reshape(-1, 1)).ravel().tolist()
+            self.models['lstm'] = model
+            
+            sampled_paths = None
+            if n_paths > 0:
+                # Resample test residuals (in scaled space) as per-step shocks and run
+                # every scenario through the model together
+                rng = np.random.default_rng(random_state)
+                residuals = (y_test - test_predictions).ravel()
+                noise = rng.choice(residuals, size=(n_paths, prediction_days))
+                seed_windows = np.repeat(last_sequence[np.newaxis], n_paths, axis=0)
+                paths_scaled = batched_lstm_rollout(model, seed_windows, prediction_days, noise=noise)
+                sampled_paths = price_scaler.inverse_transform(
+                    paths_scaled.reshape(-1, 1)
+                ).reshape(n_paths, prediction_days)
+            
+            results = {
                 'predictions': future_predictions,
                 'confidence': min(r2, 0.90),
                 'volatility': np.std(np.diff(y_test_actual) / y_test_actual[:-1]) * 100,
@@ -321,16 +751,29 @@ class CryptoPredictor:
                 'epochs': len(history.history['loss']),
                 'train_loss': history.history['loss'][-1],
                 'val_loss': history.history['val_loss'][-1],
-                'train_time': 0.0,  # Simplified
                 'training_history': history.history
             }
+            if sampled_paths is not None:
+                results['sampled_paths'] = sampled_paths
+                results['prediction_intervals'] = paths_to_intervals(sampled_paths)
+            else:
+                results['prediction_intervals'] = monte_carlo_intervals(
+                    future_predictions,
+                    ((y_test_actual - test_predictions_actual) / test_predictions_actual).ravel()
+                )
+            profiler.lap('forecast')
+            
+            return self._finish_profile(profiler, results)
             
         except Exception as e:
             print(f"Error in LSTM model training: {str(e)}")
             return None
+        finally:
+            profiler.stop()
     
-    def train_random_forest(self, df, prediction_days=7):
+    def train_random_forest(self, df, prediction_days=7, crypto_symbol=None):
         """Train Random Forest model"""
+        profiler = self._start_profile('random_forest')
         try:
             df_features = self.prepare_features(df)
             df_features = df_features.dropna()
@@ -345,10 +788,18 @@ class CryptoPredictor:
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.2, random_state=42, shuffle=False
             )
+            profiler.lap('feature_prep')
+            
+            feature_cols, X, X_train, X_test, selection = self._apply_feature_selection(
+                crypto_symbol, feature_cols, X, X_train, X_test, y_train
+            )
+            if selection:
+                profiler.lap('feature_selection')
             
             # Scale features
             X_train_scaled = self.scaler.fit_transform(X_train)
             X_test_scaled = self.scaler.transform(X_test)
+            profiler.lap('scaling')
             
             # Train Random Forest
             model = RandomForestRegressor(
@@ -358,6 +809,12 @@ class CryptoPredictor:
                 n_jobs=-1
             )
             model.fit(X_train_scaled, y_train)
+            self.models['random_forest'] = model
+            self.model_inputs['random_forest'] = {
+                'feature_columns': feature_cols,
+                'scaler': copy.deepcopy(self.scaler)
+            }
+            profiler.lap('fit')
             
             # Predictions
             predictions = model.predict(X_test_scaled)
@@ -366,6 +823,7 @@ class CryptoPredictor:
             rmse = np.sqrt(mean_squared_error(y_test, predictions))
             mae = mean_absolute_error(y_test, predictions)
             r2 = r2_score(y_test, predictions)
+            profiler.lap('evaluation')
             
             # Future predictions
             future_predictions = []
@@ -380,22 +838,32 @@ class CryptoPredictor:
                 last_features = last_features.copy()
                 last_features[0][0] = pred
             
-            return {
+            result = {
                 'predictions': future_predictions,
                 'confidence': min(r2, 0.85),
                 'volatility': np.std(y_test.pct_change().dropna()) * 100,
                 'rmse': rmse,
                 'mae': mae,
                 'r2_score': r2,
-                'feature_importance': dict(zip(feature_cols, model.feature_importances_))
+                'feature_importance': dict(zip(feature_cols, model.feature_importances_)),
+                'prediction_intervals': monte_carlo_intervals(
+                    future_predictions, (y_test - predictions) / predictions
+                )
             }
+            if selection:
+                result['feature_selection'] = selection
+            profiler.lap('forecast')
+            return self._finish_profile(profiler, result)
             
         except Exception as e:
             print(f"Error in Random Forest training: {str(e)}")
             return None
+        finally:
+            profiler.stop()
     
-    def train_xgboost(self, df, prediction_days=7):
+    def train_xgboost(self, df, prediction_days=7, crypto_symbol=None):
         """Train XGBoost model"""
+        profiler = self._start_profile('xgboost')
         try:
             df_features = self.prepare_features(df)
             df_features = df_features.dropna()
@@ -410,6 +878,13 @@ class CryptoPredictor:
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.2, random_state=42, shuffle=False
             )
+            profiler.lap('feature_prep')
+            
+            feature_cols, X, X_train, X_test, selection = self._apply_feature_selection(
+                crypto_symbol, feature_cols, X, X_train, X_test, y_train
+            )
+            if selection:
+                profiler.lap('feature_selection')
             
             # Train XGBoost
             model = xgb.XGBRegressor(
@@ -420,6 +895,9 @@ class CryptoPredictor:
                 n_jobs=-1
             )
             model.fit(X_train, y_train)
+            self.models['xgboost'] = model
+            self.model_inputs['xgboost'] = {'feature_columns': feature_cols, 'scaler': None}
+            profiler.lap('fit')
             
             # Predictions
             predictions = model.predict(X_test)
@@ -428,6 +906,7 @@ class CryptoPredictor:
             rmse = np.sqrt(mean_squared_error(y_test, predictions))
             mae = mean_absolute_error(y_test, predictions)
             r2 = r2_score(y_test, predictions)
+            profiler.lap('evaluation')
             
             # Future predictions
             future_predictions = []
@@ -441,26 +920,35 @@ class CryptoPredictor:
                 last_features = last_features.copy()
                 last_features[0][0] = pred
             
-            return {
+            result = {
                 'predictions': future_predictions,
                 'confidence': min(r2, 0.90),
                 'volatility': np.std(y_test.pct_change().dropna()) * 100,
                 'rmse': rmse,
                 'mae': mae,
                 'r2_score': r2,
-                'feature_importance': dict(zip(feature_cols, model.feature_importances_))
+                'feature_importance': dict(zip(feature_cols, model.feature_importances_)),
+                'prediction_intervals': monte_carlo_intervals(
+                    future_predictions, (y_test - predictions) / predictions
+                )
             }
+            if selection:
+                result['feature_selection'] = selection
+            profiler.lap('forecast')
+            return self._finish_profile(profiler, result)
             
         except Exception as e:
             print(f"Error in XGBoost training: {str(e)}")
             return None
+        finally:
+            profiler.stop()
     
-    def compare_all_models(self, df, prediction_days=7):
-        """Compare all models and return results"""
+    def compare_all_models(self, df, prediction_days=7, crypto_symbol=None):
+        """Compare all models and return results; `crypto_symbol` enables the per-coin caches"""
         results = {}
         
         # Train each model
-        ensemble_result = self.train_ensemble_model(df, prediction_days)
+        ensemble_result = self.train_ensemble_model(df, prediction_days, crypto_symbol=crypto_symbol)
         if ensemble_result:
             results['Ensemble'] = ensemble_result
         
@@ -470,12 +958,20 @@ class CryptoPredictor:
             if lstm_result and 'error' not in lstm_result:
                 results['LSTM'] = lstm_result
         
-        rf_result = self.train_random_forest(df, prediction_days)
+        rf_result = self.train_random_forest(df, prediction_days, crypto_symbol=crypto_symbol)
         if rf_result:
             results['Random Forest'] = rf_result
         
-        xgb_result = self.train_xgboost(df, prediction_days)
+        xgb_result = self.train_xgboost(df, prediction_days, crypto_symbol=crypto_symbol)
         if xgb_result:
             results['XGBoost'] = xgb_result
         
         return results if results else None
+    
+    def train_model(self, model_type, df, prediction_days=7, **kwargs):
+        """Train one of MODEL_TRAINERS by its model type name; kwargs go to the trainer"""
+        if model_type not in MODEL_TRAINERS:
+            raise ValueError(f"Unknown model type: {model_type}")
+        if model_type == 'lstm' and not TENSORFLOW_AVAILABLE:
+            return None
+        return getattr(self, MODEL_TRAINERS[model_type])(df, prediction_days, **kwargs)
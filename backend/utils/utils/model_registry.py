@@ -0,0 +1,192 @@
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from utils.compiled_models import CompiledTreeEnsemble, compile_tree_model
+
+MODEL_REGISTRY_DIR = os.getenv('NEUROCRYPT_MODEL_REGISTRY', 'model_registry')
+
+# Model names CryptoPredictor stores in `predictor.models`
+COMPILABLE_MODELS = ('rf', 'gbr', 'xgb', 'random_forest', 'xgboost')
+
+# The compiled path wins on per-call overhead for serving-sized inputs; for large batches
+# the native multi-threaded predict is faster (see benchmarks/bench_compiled_inference.py)
+COMPILED_MAX_ROWS = 16
+
+
+class ModelRegistry:
+    """Per-coin store of fitted models, their input spec, and compiled inference artifacts.
+
+    Layout: <root>/<coin>/<model_type>/ holds model.joblib (the native estimator),
+    meta.json (feature columns and metadata), scaler.joblib when the model expects scaled
+    inputs, and compiled.npz once the model has been exported. <root>/<coin>/ensemble/
+    holds stacking.joblib, the stacked ensemble's state. Loaded entries are kept in memory
+    so repeated predictions don't touch the disk.
+    """
+
+    def __init__(self, root_dir=None):
+        self.root_dir = Path(root_dir or MODEL_REGISTRY_DIR)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self._entries = {}
+        self._stacking = {}
+
+    def _model_dir(self, coin, model_type):
+        return self.root_dir / coin.lower() / model_type
+
+    def register(self, coin, model_type, model, feature_columns, scaler=None, metadata=None):
+        """Persist a fitted model and drop any stale compiled artifact"""
+        model_dir = self._model_dir(coin, model_type)
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        joblib.dump(model, model_dir / 'model.joblib')
+        scaler_path = model_dir / 'scaler.joblib'
+        if scaler is not None:
+            joblib.dump(scaler, scaler_path)
+        elif scaler_path.exists():
+            scaler_path.unlink()
+        compiled_path = model_dir / 'compiled.npz'
+        if compiled_path.exists():
+            compiled_path.unlink()
+
+        meta = {
+            'coin': coin.lower(),
+            'model_type': model_type,
+            'estimator': type(model).__name__,
+            'feature_columns': list(feature_columns),
+            'registered_at': datetime.utcnow().isoformat(),
+            'metadata': metadata or {}
+        }
+        with open(model_dir / 'meta.json', 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        self._entries[(coin.lower(), model_type)] = {
+            'model': model,
+            'scaler': scaler,
+            'compiled': None,
+            'meta': meta
+        }
+        return meta
+
+    def register_predictor(self, coin, predictor, model_types=None):
+        """Register every model a CryptoPredictor has fitted (or just `model_types`)"""
+        registered = []
+        for name, model in predictor.models.items():
+            if model_types and name not in model_types:
+                continue
+            inputs = predictor.model_inputs.get(name)
+            if inputs is None:
+                continue
+            self.register(coin, name, model, inputs['feature_columns'], scaler=inputs['scaler'])
+            registered.append(name)
+        return registered
+
+    def get(self, coin, model_type):
+        """Load a registered entry (cached in memory), or None if it does not exist"""
+        key = (coin.lower(), model_type)
+        if key in self._entries:
+            return self._entries[key]
+
+        model_dir = self._model_dir(coin, model_type)
+        if not (model_dir / 'meta.json').exists():
+            return None
+        with open(model_dir / 'meta.json') as f:
+            meta = json.load(f)
+        scaler_path = model_dir / 'scaler.joblib'
+        compiled_path = model_dir / 'compiled.npz'
+        entry = {
+            'model': joblib.load(model_dir / 'model.joblib'),
+            'scaler': joblib.load(scaler_path) if scaler_path.exists() else None,
+            'compiled': CompiledTreeEnsemble.load(compiled_path) if compiled_path.exists() else None,
+            'meta': meta
+        }
+        self._entries[key] = entry
+        return entry
+
+    def export_compiled(self, coin, model_type):
+        """Compile a registered tree model (scaler included) and save it next to the model"""
+        entry = self.get(coin, model_type)
+        if entry is None:
+            raise KeyError(f"No model registered for {coin}/{model_type}")
+        compiled = compile_tree_model(entry['model'], scaler=entry['scaler'])
+        compiled.save(self._model_dir(coin, model_type) / 'compiled.npz')
+        entry['compiled'] = compiled
+        return compiled
+
+    def export_all(self, coin=None):
+        """Compile every registered tree model, optionally for a single coin"""
+        exported = []
+        for entry_coin, model_type in self.list_models(coin):
+            if model_type in COMPILABLE_MODELS:
+                self.export_compiled(entry_coin, model_type)
+                exported.append((entry_coin, model_type))
+        return exported
+
+    def predict(self, coin, model_type, X, use_compiled=None):
+        """Predict with the compiled artifact or the native model
+
+        X holds raw (unscaled) feature values in the registered column order. By default the
+        compiled artifact is used for inputs of up to COMPILED_MAX_ROWS rows when one exists;
+        pass use_compiled=True/False to force either path.
+        """
+        entry = self.get(coin, model_type)
+        if entry is None:
+            raise KeyError(f"No model registered for {coin}/{model_type}")
+
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if use_compiled is None:
+            use_compiled = len(X) <= COMPILED_MAX_ROWS
+        if use_compiled and entry['compiled'] is not None:
+            return entry['compiled'].predict(X)
+
+        if entry['scaler'] is not None:
+            X = entry['scaler'].transform(X)
+        return entry['model'].predict(X)
+
+    def save_stacking(self, coin, state):
+        """Persist a coin's stacked-ensemble state (base models, out-of-fold predictions, meta-learner)"""
+        stacking_dir = self._model_dir(coin, 'ensemble')
+        stacking_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = stacking_dir / 'stacking.joblib.tmp'
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, stacking_dir / 'stacking.joblib')
+        self._stacking[coin.lower()] = state
+    
+    def load_stacking(self, coin):
+        """Cached stacked-ensemble state for a coin, or None"""
+        key = coin.lower()
+        if key not in self._stacking:
+            path = self._model_dir(coin, 'ensemble') / 'stacking.joblib'
+            if not path.exists():
+                return None
+            self._stacking[key] = joblib.load(path)
+        return self._stacking[key]
+    
+    def list_models(self, coin=None):
+        """List registered (coin, model_type) pairs"""
+        coin_dirs = [self.root_dir / coin.lower()] if coin else sorted(self.root_dir.iterdir())
+        models = []
+        for coin_dir in coin_dirs:
+            if not coin_dir.is_dir():
+                continue
+            for model_dir in sorted(coin_dir.iterdir()):
+                if (model_dir / 'meta.json').exists():
+                    models.append((coin_dir.name, model_dir.name))
+        return models
+
+
+# Global registry instance
+model_registry = None
+
+
+def get_model_registry():
+    """Get model registry instance"""
+    global model_registry
+    if model_registry is None:
+        model_registry = ModelRegistry()
+    return model_registry
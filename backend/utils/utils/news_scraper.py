@@ -7,6 +7,21 @@ import random
 from urllib.parse import urljoin, urlparse
 import json
 
+from utils.keyword_matcher import keyword_matcher_for
+
+RELEVANCE_KEYWORDS = {
+    'bitcoin': ['bitcoin', 'btc', 'satoshi', 'mining', 'halving'],
+    'ethereum': ['ethereum', 'eth', 'vitalik', 'smart contract', 'defi'],
+    'binancecoin': ['binance', 'bnb', 'bsc', 'binance smart chain'],
+    'cardano': ['cardano', 'ada', 'charles hoskinson', 'ouroboros'],
+    'solana': ['solana', 'sol', 'phantom', 'solana labs'],
+    'polkadot': ['polkadot', 'dot', 'kusama', 'parachain'],
+    'dogecoin': ['dogecoin', 'doge', 'shiba', 'meme coin'],
+    'polygon': ['polygon', 'matic', 'layer 2', 'scaling'],
+    'avalanche': ['avalanche', 'avax', 'subnet', 'consensus'],
+    'chainlink': ['chainlink', 'link', 'oracle', 'decentralized oracle']
+}
+
 class CryptoNewsScraper:
     def __init__(self):
         self.headers = {
@@ -303,31 +318,13 @@ class CryptoNewsScraper:
         """Filter articles by relevance to specific cryptocurrency"""
         relevant_articles = []
         
-        crypto_keywords = {
-            'bitcoin': ['bitcoin', 'btc', 'satoshi', 'mining', 'halving'],
-            'ethereum': ['ethereum', 'eth', 'vitalik', 'smart contract', 'defi'],
-            'binancecoin': ['binance', 'bnb', 'bsc', 'binance smart chain'],
-            'cardano': ['cardano', 'ada', 'charles hoskinson', 'ouroboros'],
-            'solana': ['solana', 'sol', 'phantom', 'solana labs'],
-            'polkadot': ['polkadot', 'dot', 'kusama', 'parachain'],
-            'dogecoin': ['dogecoin', 'doge', 'shiba', 'meme coin'],
-            'polygon': ['polygon', 'matic', 'layer 2', 'scaling'],
-            'avalanche': ['avalanche', 'avax', 'subnet', 'consensus'],
-            'chainlink': ['chainlink', 'link', 'oracle', 'decentralized oracle']
-        }
-        
-        keywords = crypto_keywords.get(crypto_name.lower(), [crypto_name.lower()])
+        # Whole-word matches only, so 'eth' doesn't fire inside "something" or 'sol' inside "solution"
+        keywords = RELEVANCE_KEYWORDS.get(crypto_name.lower(), [crypto_name.lower()])
+        matcher = keyword_matcher_for(tuple(keywords))
         
         for article in articles:
-            title_lower = article['title'].lower()
-            content_lower = article['content'].lower()
-            
-            relevance_score = 0
-            for keyword in keywords:
-                if keyword in title_lower:
-                    relevance_score += 3
-                if keyword in content_lower:
-                    relevance_score += 1
+            relevance_score = 3 * len(matcher.find_terms(article['title'])) + \
+                len(matcher.find_terms(article['content']))
             
             if relevance_score > 0:
                 article['relevance_score'] = relevance_score
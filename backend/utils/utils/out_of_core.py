@@ -0,0 +1,170 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.linear_model import SGDRegressor
+from sklearn.preprocessing import StandardScaler
+
+from utils.ml_models import CryptoPredictor
+
+# Rows of history prepare_features needs before a row's indicators are defined: the longest
+# window is ma_21, which looks 20 rows back (RSI 14, Bollinger/volume SMA 20 and lag 7 need less)
+FEATURE_LOOKBACK = 20
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+class ChunkedFeatureSource:
+    """Re-iterable stream of (X, y) feature blocks built from price history on disk.
+
+    `source` is a CSV path, a list of CSV paths read in order (e.g. one file per month), or
+    a zero-argument callable returning an iterator of raw date/price/volume DataFrames.
+    Each raw chunk goes through CryptoPredictor.prepare_features together with the last
+    FEATURE_LOOKBACK rows of the previous chunk, so rolling windows are exact across chunk
+    boundaries; the final row of a chunk is held back until the next chunk supplies its
+    target. The emitted rows equal prepare_features(full_history).dropna() while only one
+    chunk plus the overlap is ever in memory.
+    """
+
+    def __init__(self, source, chunk_rows=DEFAULT_CHUNK_ROWS, predictor=None, feature_columns=None,
+                 dtype=np.float32):
+        self.source = source
+        self.chunk_rows = chunk_rows
+        self.predictor = predictor or CryptoPredictor(profile_memory=None)
+        self.feature_columns = feature_columns
+        self.dtype = dtype
+
+    def _raw_chunks(self):
+        if callable(self.source):
+            yield from self.source()
+            return
+        paths = [self.source] if isinstance(self.source, (str, os.PathLike)) else self.source
+        for path in paths:
+            yield from pd.read_csv(path, chunksize=self.chunk_rows, parse_dates=['date'])
+
+    def iter_frames(self):
+        """Feature frames (prepare_features output, NaN rows dropped) per chunk"""
+        carry = None
+        for chunk in self._raw_chunks():
+            if chunk.empty:
+                continue
+            chunk = chunk[['date', 'price', 'volume']]
+            if carry is None:
+                buffer, skip = chunk.reset_index(drop=True), 0
+            else:
+                buffer = pd.concat([carry, chunk], ignore_index=True)
+                # Every carried row but the last was emitted with the previous chunk
+                skip = len(carry) - 1
+            features = self.predictor.prepare_features(buffer)
+            # The last row's target is the first price of the next chunk
+            block = features.iloc[skip:-1].dropna()
+            carry = buffer.iloc[-(FEATURE_LOOKBACK + 1):]
+            if not block.empty:
+                yield block
+
+    def __iter__(self):
+        """(X, y) arrays per chunk, in `feature_columns` order"""
+        for block in self.iter_frames():
+            if self.feature_columns is None:
+                self.feature_columns = self.predictor.get_feature_columns(block)
+            X = np.empty((len(block), len(self.feature_columns)), dtype=self.dtype)
+            for i, col in enumerate(self.feature_columns):
+                X[:, i] = block[col].to_numpy(dtype=self.dtype)
+            yield X, block['target'].to_numpy(dtype=self.dtype)
+
+
+class _FeatureBlockIter(xgb.DataIter):
+    """Feeds ChunkedFeatureSource blocks to XGBoost's external-memory DMatrix"""
+
+    def __init__(self, source, cache_prefix):
+        self.source = source
+        self._blocks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._blocks is None:
+            self._blocks = iter(self.source)
+        block = next(self._blocks, None)
+        if block is None:
+            return False
+        X, y = block
+        input_data(data=X, label=y)
+        return True
+
+    def reset(self):
+        self._blocks = None
+
+
+def train_xgboost_external(source, params=None, num_boost_round=200, cache_dir=None):
+    """Train XGBoost over a ChunkedFeatureSource with an on-disk external-memory cache
+
+    The raw feature matrix is never materialized: blocks are quantized into pages cached on
+    disk. Memory still grows with history length, since XGBoost keeps O(rows) gradient,
+    hessian and prediction buffers (a few float32s per row) on top of the current chunk
+    and page. Returns (booster, feature_columns).
+    """
+    params = {
+        'objective': 'reg:squarederror',
+        'max_depth': 6,
+        'learning_rate': 0.1,
+        'tree_method': 'hist',
+        'seed': 42,
+        **(params or {})
+    }
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp_dir:
+        data_iter = _FeatureBlockIter(source, cache_prefix=os.path.join(tmp_dir, 'xgb-cache'))
+        dtrain = xgb.ExtMemQuantileDMatrix(data_iter)
+        booster = xgb.train(params, dtrain, num_boost_round=num_boost_round)
+    return booster, source.feature_columns
+
+
+class IncrementalRegressor:
+    """SGD linear regressor trained block by block with partial_fit.
+
+    Feature and target scaling are fit in a first streaming pass (StandardScaler.partial_fit),
+    then each epoch streams the blocks through SGDRegressor.partial_fit.
+    """
+
+    def __init__(self, epochs=3, random_state=42, **sgd_params):
+        self.epochs = epochs
+        self.scaler = StandardScaler()
+        self.target_scaler = StandardScaler()
+        self.model = SGDRegressor(random_state=random_state, **sgd_params)
+        self.feature_columns = None
+
+    def fit(self, source):
+        for X, y in source:
+            self.scaler.partial_fit(X)
+            self.target_scaler.partial_fit(y.reshape(-1, 1))
+        for _ in range(self.epochs):
+            for X, y in source:
+                y_scaled = self.target_scaler.transform(y.reshape(-1, 1)).ravel()
+                self.model.partial_fit(self.scaler.transform(X), y_scaled)
+        self.feature_columns = source.feature_columns
+        return self
+
+    def predict(self, X):
+        y_scaled = self.model.predict(self.scaler.transform(X))
+        return self.target_scaler.inverse_transform(y_scaled.reshape(-1, 1)).ravel()
+
+
+def evaluate_streaming(predict, source):
+    """RMSE/MAE/MAPE of `predict` over a ChunkedFeatureSource, accumulated block by block"""
+    count = 0
+    sum_sq = sum_abs = sum_pct = 0.0
+    for X, y in source:
+        y = y.astype(np.float64)
+        error = np.asarray(predict(X), dtype=np.float64) - y
+        count += len(y)
+        sum_sq += float(np.dot(error, error))
+        sum_abs += float(np.abs(error).sum())
+        sum_pct += float(np.abs(error / y).sum())
+    if count == 0:
+        return None
+    return {
+        'rows': count,
+        'rmse': (sum_sq / count) ** 0.5,
+        'mae': sum_abs / count,
+        'mape': sum_pct / count * 100
+    }
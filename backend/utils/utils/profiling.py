@@ -0,0 +1,130 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+_PROC_STATUS = '/proc/self/status'
+_PROC_CLEAR_REFS = '/proc/self/clear_refs'
+
+
+def _read_status_kb(field):
+    try:
+        with open(_PROC_STATUS) as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Reset the kernel's resident-set high-water mark (Linux); False if unsupported"""
+    try:
+        with open(_PROC_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class TrainingProfiler:
+    """Wall/CPU time per training stage plus peak memory for one training run.
+
+    Stages are recorded lap-style: `lap(name)` closes the stage that started at the previous
+    lap (or at `start()`), so a linear trainer only needs one call at the end of each step.
+    Repeated stage names accumulate. CPU time is process-wide, so it includes the worker
+    threads of n_jobs=-1 estimators.
+
+    memory='rss' (default) resets and reads the process's peak resident set size through
+    /proc, which costs nothing during the run and includes native allocations by XGBoost or
+    TensorFlow; it is process-wide, so runs profiled concurrently in threads share one peak.
+    memory='tracemalloc' measures Python/NumPy allocations only and slows allocation-heavy
+    code noticeably. memory=None skips memory tracking.
+    """
+
+    def __init__(self, model_type, memory='rss'):
+        if memory not in ('rss', 'tracemalloc', None):
+            raise ValueError(f"Unknown memory mode: {memory}")
+        self.model_type = model_type
+        self.memory = memory
+        self.stages = {}
+        self._owns_tracing = False
+        self._baseline = 0
+        self._started = None
+        self._last = None
+        self._report = None
+
+    def start(self):
+        if self.memory == 'rss':
+            if _reset_peak_rss():
+                self._baseline = _read_status_kb('VmRSS') or 0
+            else:
+                self.memory = None
+        elif self.memory == 'tracemalloc':
+            if tracemalloc.is_tracing():
+                # Someone else is tracing; measure against their current level
+                self._baseline = tracemalloc.get_traced_memory()[0]
+            else:
+                tracemalloc.start()
+                self._owns_tracing = True
+        self._started = self._last = (time.perf_counter(), time.process_time())
+        return self
+
+    def lap(self, stage):
+        """Close the current stage under `stage`"""
+        now = (time.perf_counter(), time.process_time())
+        stats = self.stages.setdefault(stage, {'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+        stats['wall_seconds'] += now[0] - self._last[0]
+        stats['cpu_seconds'] += now[1] - self._last[1]
+        self._last = now
+
+    def stop(self):
+        """Finish the run and return its report; safe to call more than once"""
+        if self._report is not None:
+            return self._report
+        now = (time.perf_counter(), time.process_time())
+        peak_mb = None
+        if self.memory == 'rss':
+            peak_kb = _read_status_kb('VmHWM')
+            if peak_kb is not None:
+                peak_mb = max(peak_kb - self._baseline, 0) / 1024
+        elif self.memory == 'tracemalloc':
+            peak_mb = max(tracemalloc.get_traced_memory()[1] - self._baseline, 0) / 2**20
+            if self._owns_tracing:
+                tracemalloc.stop()
+        self._report = {
+            'model_type': self.model_type,
+            'recorded_at': datetime.utcnow().isoformat(),
+            'pid': os.getpid(),
+            'stages': self.stages,
+            'total_wall_seconds': now[0] - self._started[0],
+            'total_cpu_seconds': now[1] - self._started[1],
+            # Peak memory above the level at start()
+            'peak_memory_mb': peak_mb,
+            'memory_mode': self.memory
+        }
+        return self._report
+
+
+class JsonlMetricsSink:
+    """Metrics sink that appends each training report as one JSON line"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, report):
+        with self._lock, open(self.path, 'a') as f:
+            f.write(json.dumps(report) + '\n')
+
+
+def format_timings(report):
+    """One-line human-readable summary of a training report"""
+    stages = ', '.join(
+        f"{name} {stats['wall_seconds']:.2f}s" for name, stats in report['stages'].items()
+    )
+    memory = f", peak +{report['peak_memory_mb']:.1f} MB" if report.get('peak_memory_mb') is not None else ''
+    return f"{report['model_type']}: {report['total_wall_seconds']:.2f}s ({stages}){memory}"
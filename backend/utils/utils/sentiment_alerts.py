@@ -0,0 +1,298 @@
+import math
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime
+
+# Half-lives of the per-coin exponentially weighted averages, in seconds
+SCORE_HALF_LIFE = 3600
+FEAR_GREED_HALF_LIFE = 6 * 3600
+# EWMA sentiment mapped to 0-100 through tanh(score / scale); 0.25 maps to about 88
+FEAR_GREED_SCALE = 0.25
+DEFAULT_COOLDOWN = 900
+NEWS_SOURCES = frozenset({'news'})
+
+ALERT_METRICS = ('score', 'news', 'social', 'divergence', 'fear_greed')
+ALERT_DIRECTIONS = ('above', 'below')
+
+
+class AlertRule:
+    """Fires when `metric` of a coin crosses `threshold` in `direction`
+
+    `symbol=None` applies the rule to every coin. A rule fires on the event that takes the
+    value across the threshold (or on a coin's first event if it is already across), not
+    on every event while it stays there, and at most once per `cooldown` seconds per coin.
+    """
+
+    def __init__(self, rule_id, metric, direction, threshold, symbol=None, severity='medium',
+                 message=None, cooldown=DEFAULT_COOLDOWN):
+        if metric not in ALERT_METRICS:
+            raise ValueError(f"Unknown alert metric: {metric}")
+        if direction not in ALERT_DIRECTIONS:
+            raise ValueError(f"Unknown alert direction: {direction}")
+        self.rule_id = rule_id
+        self.metric = metric
+        self.direction = direction
+        self.threshold = float(threshold)
+        self.symbol = symbol
+        self.severity = severity
+        self.message = message
+        self.cooldown = cooldown
+
+    def describe(self, symbol, value):
+        if self.message:
+            return self.message.format(symbol=symbol, value=value, threshold=self.threshold)
+        return f"{symbol} {self.metric} {value:.2f} moved {self.direction} {self.threshold:g}"
+
+
+def fear_greed_index(score):
+    """0-100 fear/greed value for a sentiment score in [-1, 1]"""
+    return 50.0 + 50.0 * math.tanh(score / FEAR_GREED_SCALE)
+
+
+def default_alert_rules():
+    """The checks get_sentiment_alerts makes, as streaming rules for every coin"""
+    return [
+        AlertRule('extreme_positive', 'score', 'above', 0.7, severity='high',
+                  message="{symbol} sentiment is extremely positive ({value:.2f})"),
+        AlertRule('extreme_negative', 'score', 'below', -0.7, severity='high',
+                  message="{symbol} sentiment is extremely negative ({value:.2f})"),
+        AlertRule('extreme_greed', 'fear_greed', 'above', 80,
+                  message="Extreme greed detected for {symbol} ({value:.0f}/100)"),
+        AlertRule('extreme_fear', 'fear_greed', 'below', 20,
+                  message="Extreme fear detected for {symbol} ({value:.0f}/100)"),
+        AlertRule('sentiment_divergence', 'divergence', 'above', 0.5, severity='low',
+                  message="Large divergence between {symbol} news and social sentiment ({value:.2f})"),
+    ]
+
+
+class _Ewma:
+    """Exponentially weighted mean over irregularly spaced observations"""
+
+    __slots__ = ('half_life', 'value', 'updated')
+
+    def __init__(self, half_life):
+        self.half_life = half_life
+        self.value = None
+        self.updated = None
+
+    def update(self, value, at):
+        if self.value is None:
+            self.value = value
+        else:
+            elapsed = max((at - self.updated).total_seconds(), 0.0)
+            alpha = 1.0 - 0.5 ** (elapsed / self.half_life) if self.half_life else 1.0
+            # Events sharing a timestamp still move the average a little
+            alpha = max(alpha, 1.0 / 64)
+            self.value += alpha * (value - self.value)
+        if self.updated is None or at > self.updated:
+            self.updated = at
+        return self.value
+
+
+class CoinSentimentState:
+    """Running sentiment for one coin: overall, news and social EWMAs and fear/greed"""
+
+    def __init__(self, symbol, score_half_life=SCORE_HALF_LIFE, fear_greed_half_life=FEAR_GREED_HALF_LIFE):
+        self.symbol = symbol
+        self.events = 0
+        self.last_event = None
+        self._score = _Ewma(score_half_life)
+        self._news = _Ewma(score_half_life)
+        self._social = _Ewma(score_half_life)
+        self._mood = _Ewma(fear_greed_half_life)
+
+    def update(self, score, source, at):
+        self.events += 1
+        self.last_event = at if self.last_event is None else max(self.last_event, at)
+        self._score.update(score, at)
+        self._mood.update(score, at)
+        (self._news if source in NEWS_SOURCES else self._social).update(score, at)
+
+    def metrics(self):
+        """Current value of every alert metric (None until it has data)"""
+        news, social = self._news.value, self._social.value
+        mood = self._mood.value
+        return {
+            'score': self._score.value,
+            'news': news,
+            'social': social,
+            'divergence': abs(news - social) if news is not None and social is not None else None,
+            'fear_greed': fear_greed_index(mood) if mood is not None else None
+        }
+
+    def snapshot(self):
+        return {'symbol': self.symbol, 'events': self.events, 'last_event': self.last_event, **self.metrics()}
+
+
+class _ThresholdIndex:
+    """Rules for one (symbol, metric), kept sorted by threshold per direction"""
+
+    def __init__(self):
+        # direction -> (sorted thresholds, rules in the same order)
+        self.entries = {direction: ([], []) for direction in ALERT_DIRECTIONS}
+
+    def add(self, rule):
+        thresholds, rules = self.entries[rule.direction]
+        position = bisect_right(thresholds, rule.threshold)
+        thresholds.insert(position, rule.threshold)
+        rules.insert(position, rule)
+
+    def remove(self, rule):
+        thresholds, rules = self.entries[rule.direction]
+        position = next(i for i, candidate in enumerate(rules) if candidate is rule)
+        del thresholds[position], rules[position]
+
+    def crossed(self, old, new):
+        """Rules whose threshold lies between `old` and `new`, found by bisection"""
+        above, above_rules = self.entries['above']
+        below, below_rules = self.entries['below']
+        if old is None:
+            # First value: every rule it is already across
+            return above_rules[:bisect_left(above, new)] + below_rules[bisect_right(below, new):]
+        if new > old:
+            # 'above t' is crossed when old <= t < new
+            return above_rules[bisect_left(above, old):bisect_left(above, new)]
+        if new < old:
+            # 'below t' is crossed when new < t <= old
+            return below_rules[bisect_right(below, new):bisect_right(below, old)]
+        return []
+
+
+class SentimentAlertEngine:
+    """Evaluates alert rules against a stream of scored sentiment rows, per coin.
+
+    Feed it the row dicts SentimentPipeline hands to subscribers (crypto_symbol, source,
+    sentiment_score, timestamp), either with `attach(pipeline)` or by calling `on_rows`.
+    Each row updates the coin's exponentially weighted sentiment and fear/greed state;
+    rules are indexed by (symbol, metric) and sorted by threshold, so an event only costs
+    a bisection per metric plus the rules it actually crosses, however many rules exist.
+    Fired alerts are passed, per batch of rows, to every `subscribe`d callback.
+    """
+
+    def __init__(self, rules=None, score_half_life=SCORE_HALF_LIFE, fear_greed_half_life=FEAR_GREED_HALF_LIFE):
+        self.score_half_life = score_half_life
+        self.fear_greed_half_life = fear_greed_half_life
+        self.alerts_fired = 0
+        self._rules = {}
+        self._index = defaultdict(_ThresholdIndex)
+        self._states = {}
+        self._last_fired = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+        for rule in default_alert_rules() if rules is None else rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule):
+        """Add or replace (by rule_id) an alert rule"""
+        with self._lock:
+            if rule.rule_id in self._rules:
+                self._unindex(self._rules[rule.rule_id])
+            self._rules[rule.rule_id] = rule
+            self._index[(rule.symbol, rule.metric)].add(rule)
+        return rule
+
+    def remove_rule(self, rule_id):
+        with self._lock:
+            rule = self._rules.pop(rule_id, None)
+            if rule is not None:
+                self._unindex(rule)
+                self._last_fired = {key: at for key, at in self._last_fired.items() if key[0] != rule_id}
+        return rule
+
+    def rules(self):
+        with self._lock:
+            return list(self._rules.values())
+
+    def _unindex(self, rule):
+        self._index[(rule.symbol, rule.metric)].remove(rule)
+
+    def subscribe(self, callback):
+        """Call `callback(alerts)` with the alerts fired by each batch of rows"""
+        self._subscribers.append(callback)
+        return callback
+
+    def attach(self, pipeline):
+        """Evaluate every batch a SentimentPipeline stores"""
+        pipeline.subscribe(self.on_rows)
+        return self
+
+    def on_rows(self, rows):
+        """Update coin state from scored rows, evaluate rules and notify subscribers"""
+        alerts = []
+        with self._lock:
+            for row in rows:
+                alerts.extend(self._process(row))
+            self.alerts_fired += len(alerts)
+        if alerts:
+            for callback in self._subscribers:
+                try:
+                    callback(alerts)
+                except Exception as e:
+                    print(f"Error in sentiment alert subscriber: {str(e)}")
+        return alerts
+
+    def _process(self, row):
+        symbol = row['crypto_symbol']
+        at = row.get('timestamp') or datetime.utcnow()
+        state = self._states.get(symbol)
+        if state is None:
+            state = self._states[symbol] = CoinSentimentState(symbol, self.score_half_life, self.fear_greed_half_life)
+        before = state.metrics()
+        state.update(float(row['sentiment_score']), row.get('source'), at)
+        after = state.metrics()
+
+        alerts = []
+        for metric, value in after.items():
+            if value is None or value == before[metric]:
+                continue
+            for scope in (symbol, None):
+                index = self._index.get((scope, metric))
+                if index is None:
+                    continue
+                for rule in index.crossed(before[metric], value):
+                    alert = self._fire(rule, symbol, value, at)
+                    if alert is not None:
+                        alerts.append(alert)
+        return alerts
+
+    def _fire(self, rule, symbol, value, at):
+        key = (rule.rule_id, symbol)
+        last = self._last_fired.get(key)
+        if last is not None and rule.cooldown and (at - last).total_seconds() < rule.cooldown:
+            return None
+        self._last_fired[key] = at
+        return {
+            'rule_id': rule.rule_id,
+            'type': rule.rule_id,
+            'crypto_symbol': symbol,
+            'metric': rule.metric,
+            'direction': rule.direction,
+            'threshold': rule.threshold,
+            'value': value,
+            'message': rule.describe(symbol, value),
+            'severity': rule.severity,
+            'timestamp': at
+        }
+
+    def state(self, symbol):
+        with self._lock:
+            state = self._states.get(symbol)
+            return state.snapshot() if state is not None else None
+
+    def states(self):
+        """Snapshot of every tracked coin's state, by symbol"""
+        with self._lock:
+            return {symbol: state.snapshot() for symbol, state in self._states.items()}
+
+
+# Global alert engine instance
+sentiment_alert_engine = None
+
+
+def get_sentiment_alert_engine():
+    """Get sentiment alert engine instance"""
+    global sentiment_alert_engine
+    if sentiment_alert_engine is None:
+        sentiment_alert_engine = SentimentAlertEngine()
+    return sentiment_alert_engine
@@ -0,0 +1,141 @@
+import os
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+SENTIMENT_CACHE_SIZE = int(os.getenv('NEUROCRYPT_SENTIMENT_CACHE_SIZE', '50000'))
+# Optional SQLite file that keeps scores across restarts; unset means memory only
+SENTIMENT_CACHE_DB = os.getenv('NEUROCRYPT_SENTIMENT_CACHE_DB')
+# Bump when the scoring itself changes so old scores stop matching
+SCORER_VERSION = 'blend-v2'
+
+
+def text_key(cleaned_text, version=SCORER_VERSION):
+    """Cache key for an already-cleaned text: a 128-bit BLAKE2b digest of version + text"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(version.encode())
+    digest.update(b'\0')
+    digest.update(cleaned_text.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class SentimentCache:
+    """Bounded LRU of sentiment scores keyed by a hash of the cleaned text.
+
+    Lookups that miss memory fall through to an optional SQLite key-value file, and every
+    new score is written to both, so repeated texts (templated article bodies, reposted
+    headlines) are scored once per process, or once ever with a store. Keys are digests,
+    so memory use doesn't grow with article length. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries=SENTIMENT_CACHE_SIZE, store_path=SENTIMENT_CACHE_DB):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._store = None
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        if store_path:
+            self._store = sqlite3.connect(store_path, check_same_thread=False)
+            self._store.execute(
+                'CREATE TABLE IF NOT EXISTS sentiment_scores (key TEXT PRIMARY KEY, score REAL NOT NULL)'
+            )
+            self._store.commit()
+
+    def _remember(self, key, score):
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys):
+        """{key: score} for the keys that are cached; counts one hit or miss per key"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                score = self._entries.get(key)
+                if score is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = score
+            self.hits += len(found)
+
+            if missing and self._store is not None:
+                unique_missing = list(dict.fromkeys(missing))
+                # Stay under SQLite's bound-parameter limit
+                for i in range(0, len(unique_missing), 500):
+                    chunk = unique_missing[i:i + 500]
+                    rows = self._store.execute(
+                        f"SELECT key, score FROM sentiment_scores WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, score in rows:
+                        self._remember(key, score)
+                        found[key] = score
+                store_found = [key for key in missing if key in found]
+                self.store_hits += len(store_found)
+                missing = [key for key in missing if key not in found]
+            self.misses += len(missing)
+        return found
+
+    def get(self, key):
+        """Cached score for `key`, or None"""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, scores):
+        """Cache {key: score} in memory and, if configured, in the store"""
+        if not scores:
+            return
+        with self._lock:
+            for key, score in scores.items():
+                self._remember(key, float(score))
+            if self._store is not None:
+                self._store.executemany(
+                    'INSERT OR REPLACE INTO sentiment_scores (key, score) VALUES (?, ?)',
+                    [(key, float(score)) for key, score in scores.items()]
+                )
+                self._store.commit()
+
+    def put(self, key, score):
+        self.put_many({key: score})
+
+    def stats(self):
+        """Lookup counters and hit rate since start-up (store hits count as hits)"""
+        with self._lock:
+            lookups = self.hits + self.store_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'store_hits': self.store_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.store_hits) / lookups if lookups else 0.0,
+                'persistent': self._store is not None
+            }
+
+    def clear(self):
+        """Drop the in-memory entries and reset the counters (the store is kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.store_hits = self.misses = 0
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+# Global sentiment cache instance
+sentiment_cache = None
+
+
+def get_sentiment_cache():
+    """Get sentiment cache instance"""
+    global sentiment_cache
+    if sentiment_cache is None:
+        sentiment_cache = SentimentCache()
+    return sentiment_cache
@@ -0,0 +1,299 @@
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+import numpy as np
+
+from utils.database import get_database
+from utils.sentiment_analyzer import SentimentAnalyzer
+from utils.sentiment_cache import text_key
+
+SCORE_BATCH_SIZE = 64
+WRITE_BATCH_SIZE = 500
+MAX_BATCH_WAIT = 0.5
+QUEUE_SIZE = 1000
+# Recently seen (symbol, source, text) keys, so re-polled articles aren't counted twice
+SEEN_KEYS = 100_000
+LATENCY_SAMPLES = 2000
+# A failed bulk write is retried this many times, backing off WRITE_RETRY_DELAY * 2**attempt seconds
+WRITE_RETRIES = 3
+WRITE_RETRY_DELAY = 0.5
+
+_STOP = object()
+
+
+class StageMetrics:
+    """Thread-safe counters and recent latencies for one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.batches = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record(self, items, busy_seconds, latencies=()):
+        with self._lock:
+            self.items += items
+            self.batches += 1
+            self.busy_seconds += busy_seconds
+            self.latencies.extend(latencies)
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = np.array(self.latencies) if self.latencies else None
+            return {
+                'items': self.items,
+                'batches': self.batches,
+                'errors': self.errors,
+                'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+                'busy_seconds': self.busy_seconds,
+                'items_per_busy_second': self.items / self.busy_seconds if self.busy_seconds else 0.0,
+                'latency_p50_ms': float(np.percentile(latencies, 50) * 1000) if latencies is not None else None,
+                'latency_p95_ms': float(np.percentile(latencies, 95) * 1000) if latencies is not None else None
+            }
+
+
+def news_fetcher(crypto_name, sources=('All',), days_back=1):
+    """Fetcher yielding pipeline records for a coin's recent news articles"""
+    from utils.data_fetcher import get_coin_symbol
+    from utils.news_scraper import scrape_crypto_news
+
+    def fetch():
+        for article in scrape_crypto_news(crypto_name, sources=list(sources), days_back=days_back):
+            try:
+                published = datetime.strptime(article.get('published', ''), '%Y-%m-%dT%H:%M:%SZ')
+            except ValueError:
+                published = None
+            yield {
+                'crypto_symbol': get_coin_symbol(crypto_name),
+                'source': 'news',
+                'text': article.get('content') or article.get('title', ''),
+                'title': article.get('title'),
+                'timestamp': published
+            }
+
+    fetch.__name__ = f'news:{crypto_name}'
+    return fetch
+
+
+class SentimentPipeline:
+    """Fetch -> score -> store pipeline for sentiment texts, running on background threads.
+
+    Fetchers are zero-argument callables returning an iterable of records (dicts with
+    crypto_symbol, source and text, optionally title and timestamp); anything can also
+    push records with `submit`. Scorer threads pull micro-batches of up to `batch_size`
+    records (or whatever arrived within `max_batch_wait` seconds) and score them with one
+    SentimentAnalyzer.analyze_batch call; a writer thread bulk-ingests scored records into
+    sentiment_data and the rollups, then hands each written batch to subscribers. A failed
+    write is retried with backoff; a batch that still fails is dropped and forgotten by the
+    duplicate filter, so the next poll can submit its records again.
+
+    The queues between stages are bounded, so a slow scorer or database blocks the stage
+    in front of it instead of buffering without limit. `metrics()` reports per-stage
+    throughput, latency since the record was submitted, and current queue depths.
+    """
+
+    def __init__(self, analyzer=None, db=None, fetchers=(), batch_size=SCORE_BATCH_SIZE,
+                 write_batch_size=WRITE_BATCH_SIZE, max_batch_wait=MAX_BATCH_WAIT, queue_size=QUEUE_SIZE,
+                 scorer_workers=1, n_jobs=1, poll_interval=None):
+        self.analyzer = analyzer or SentimentAnalyzer()
+        self.db = db or get_database()
+        self.fetchers = list(fetchers)
+        self.batch_size = batch_size
+        self.write_batch_size = write_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.scorer_workers = scorer_workers
+        self.n_jobs = n_jobs
+        self.poll_interval = poll_interval
+
+        self.raw_queue = queue.Queue(maxsize=queue_size)
+        self.scored_queue = queue.Queue(maxsize=queue_size)
+        self.stages = {name: StageMetrics(name) for name in ('fetch', 'score', 'write')}
+        self.duplicates = 0
+        self._seen = OrderedDict()
+        self._seen_lock = threading.Lock()
+        self._subscribers = []
+        self._stop_fetching = threading.Event()
+        self._fetch_threads = []
+        self._scorer_threads = []
+        self._writer_thread = None
+
+    def subscribe(self, callback):
+        """Call `callback(records)` with every batch of scored records once it is stored"""
+        self._subscribers.append(callback)
+        return callback
+
+    @staticmethod
+    def _record_key(record):
+        return record['crypto_symbol'], record['source'], text_key(record.get('text') or '')
+
+    def submit(self, record, timeout=None):
+        """Queue one record for scoring; blocks while the queue is full. False if a duplicate"""
+        key = self._record_key(record)
+        with self._seen_lock:
+            if key in self._seen:
+                self.duplicates += 1
+                return False
+            self._seen[key] = None
+            if len(self._seen) > SEEN_KEYS:
+                self._seen.popitem(last=False)
+        self.raw_queue.put((time.monotonic(), record), timeout=timeout)
+        return True
+
+    def _forget(self, records):
+        """Drop records from the duplicate filter so a later poll can submit them again"""
+        with self._seen_lock:
+            for record in records:
+                self._seen.pop(self._record_key(record), None)
+
+    def start(self):
+        """Start the fetcher, scorer and writer threads"""
+        self._stop_fetching.clear()
+        self._writer_thread = threading.Thread(target=self._write_loop, name='sentiment-writer', daemon=True)
+        self._writer_thread.start()
+        self._scorer_threads = [
+            threading.Thread(target=self._score_loop, name=f'sentiment-scorer-{i}', daemon=True)
+            for i in range(self.scorer_workers)
+        ]
+        for thread in self._scorer_threads:
+            thread.start()
+        self._fetch_threads = [
+            threading.Thread(target=self._fetch_loop, args=(fetcher,),
+                             name=f"sentiment-fetch-{getattr(fetcher, '__name__', i)}", daemon=True)
+            for i, fetcher in enumerate(self.fetchers)
+        ]
+        for thread in self._fetch_threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop fetching, let queued records drain through scoring and writing, then return"""
+        self._stop_fetching.set()
+        for thread in self._fetch_threads:
+            thread.join(timeout)
+        for _ in self._scorer_threads:
+            self.raw_queue.put(_STOP)
+        for thread in self._scorer_threads:
+            thread.join(timeout)
+        self.scored_queue.put(_STOP)
+        if self._writer_thread is not None:
+            self._writer_thread.join(timeout)
+        return self.metrics()
+
+    def run_once(self):
+        """Run every fetcher once, drain the pipeline and return the metrics"""
+        poll_interval, self.poll_interval = self.poll_interval, None
+        try:
+            self.start()
+            for thread in self._fetch_threads:
+                thread.join()
+            return self.stop()
+        finally:
+            self.poll_interval = poll_interval
+
+    def metrics(self):
+        return {
+            'stages': {name: stage.snapshot() for name, stage in self.stages.items()},
+            'queue_depth': {'raw': self.raw_queue.qsize(), 'scored': self.scored_queue.qsize()},
+            'duplicates': self.duplicates
+        }
+
+    def _fetch_loop(self, fetcher):
+        while not self._stop_fetching.is_set():
+            started = time.monotonic()
+            count = 0
+            try:
+                for record in fetcher():
+                    if self._stop_fetching.is_set():
+                        break
+                    count += self.submit(record)
+                self.stages['fetch'].record(count, time.monotonic() - started)
+            except Exception as e:
+                self.stages['fetch'].record_error()
+                print(f"Error fetching sentiment texts: {str(e)}")
+            if self.poll_interval is None:
+                return
+            self._stop_fetching.wait(self.poll_interval)
+
+    def _next_batch(self, source_queue, max_items):
+        """Block for one item, then take more until `max_items` or `max_batch_wait` passes"""
+        first = source_queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_batch_wait
+        while len(batch) < max_items:
+            remaining = deadline - time.monotonic()
+            try:
+                item = source_queue.get(timeout=remaining) if remaining > 0 else source_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _score_loop(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch(self.raw_queue, self.batch_size)
+            if not batch:
+                continue
+            started = time.monotonic()
+            try:
+                scores = self.analyzer.analyze_batch([record.get('text') for _, record in batch], n_jobs=self.n_jobs)
+            except Exception as e:
+                self.stages['score'].record_error()
+                print(f"Error scoring sentiment batch: {str(e)}")
+                self._forget([record for _, record in batch])
+                continue
+            now = time.monotonic()
+            for (submitted, record), score in zip(batch, scores):
+                self.scored_queue.put((submitted, record, float(score)))
+            self.stages['score'].record(len(batch), now - started, [now - submitted for submitted, _ in batch])
+
+    def _write_loop(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch(self.scored_queue, self.write_batch_size)
+            if not batch:
+                continue
+            started = time.monotonic()
+            rows = [{
+                'crypto_symbol': record['crypto_symbol'],
+                'source': record['source'],
+                'sentiment_score': score,
+                'sentiment_label': self.analyzer.get_sentiment_label(score),
+                'article_title': (record.get('title') or '')[:200] or None,
+                'article_content': record.get('text'),
+                'timestamp': record.get('timestamp') or datetime.utcnow()
+            } for _, record, score in batch]
+            written = self.db.ingest_sentiment_batch(rows)
+            for attempt in range(WRITE_RETRIES):
+                if written == len(rows):
+                    break
+                # ingest_sentiment_batch is one transaction, so a failed batch stored nothing
+                self.stages['write'].record_error()
+                time.sleep(WRITE_RETRY_DELAY * 2 ** attempt)
+                written = self.db.ingest_sentiment_batch(rows)
+            now = time.monotonic()
+            if written != len(rows):
+                self.stages['write'].record_error()
+                self._forget([record for _, record, _ in batch])
+                print(f"Error storing sentiment batch of {len(rows)} records; dropped after {WRITE_RETRIES} retries")
+                continue
+            self.stages['write'].record(written, now - started, [now - submitted for submitted, _, _ in batch])
+            for callback in self._subscribers:
+                try:
+                    callback(rows)
+                except Exception as e:
+                    print(f"Error in sentiment subscriber: {str(e)}")
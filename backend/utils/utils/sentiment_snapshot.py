@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from utils.data_fetcher import get_coin_symbol
+from utils.database import SENTIMENT_SOURCE_WEIGHTS, get_database
+from utils.forecast_cache import _to_builtin, get_forecast_coins, make_etag
+from utils.sentiment_alerts import NEWS_SOURCES, fear_greed_index
+from utils.sentiment_analyzer import SentimentAnalyzer
+
+SNAPSHOT_WINDOW_HOURS = int(os.getenv('SENTIMENT_SNAPSHOT_WINDOW_HOURS', '24'))
+SNAPSHOT_REFRESH_SECONDS = int(os.getenv('SENTIMENT_SNAPSHOT_REFRESH_SECONDS', '300'))
+
+
+def _weighted_mean(summaries, weights=None):
+    """Count-weighted mean score over per-source summaries, each source scaled by `weights`"""
+    weights = weights or {}
+    total_weight = sum(weights.get(source, 1.0) * s['sample_count'] for source, s in summaries.items())
+    if not total_weight:
+        return None
+    return sum(
+        weights.get(source, 1.0) * s['sample_count'] * s['mean_score'] for source, s in summaries.items()
+    ) / total_weight
+
+
+def build_coin_snapshot(coin, sources, analyzer, generated_at, window_hours, live_state=None):
+    """Current-sentiment payload for one coin from its per-source rollup summaries
+
+    `sources` is the coin's entry from Database.get_sentiment_source_summaries. Coins with
+    no scored texts in the window fall back to SentimentAnalyzer.get_current_sentiment and
+    are flagged `simulated`. `live_state` (a SentimentAlertEngine state) supplies the
+    streaming fear/greed value when available.
+    """
+    payload = {
+        'coin': coin,
+        'symbol': get_coin_symbol(coin),
+        'generated_at': generated_at.isoformat(),
+        'window_hours': window_hours
+    }
+    if not sources:
+        current = analyzer.get_current_sentiment(coin)
+        payload.update({
+            'simulated': True,
+            'overall_score': current['overall_score'],
+            'news_sentiment': current['news_sentiment'],
+            'social_sentiment': current['social_sentiment'],
+            'fear_greed_index': current['fear_greed_index'],
+            'sample_count': 0,
+            'shares': None,
+            'sources': [],
+            'updated_at': None
+        })
+    else:
+        overall = _weighted_mean(sources, SENTIMENT_SOURCE_WEIGHTS)
+        news = _weighted_mean({s: v for s, v in sources.items() if s in NEWS_SOURCES})
+        social = _weighted_mean({s: v for s, v in sources.items() if s not in NEWS_SOURCES})
+        count = sum(s['sample_count'] for s in sources.values())
+        positive = sum(s['positive_count'] for s in sources.values())
+        negative = sum(s['negative_count'] for s in sources.values())
+        payload.update({
+            'simulated': False,
+            'overall_score': overall,
+            'news_sentiment': news if news is not None else 0.0,
+            'social_sentiment': social if social is not None else 0.0,
+            'fear_greed_index': int(round(fear_greed_index(overall))),
+            'sample_count': count,
+            'shares': {
+                'positive': round(100.0 * positive / count, 1),
+                'negative': round(100.0 * negative / count, 1),
+                'neutral': round(100.0 * (count - positive - negative) / count, 1)
+            },
+            'sources': [{
+                'source': source,
+                'sample_count': summary['sample_count'],
+                'mean_score': summary['mean_score'],
+                'label': analyzer.get_sentiment_label(summary['mean_score'])
+            } for source, summary in sorted(sources.items(), key=lambda item: -item[1]['sample_count'])],
+            'updated_at': max(s['updated_at'] for s in sources.values()).isoformat()
+        })
+    if live_state and live_state.get('fear_greed') is not None:
+        payload['fear_greed_index'] = int(round(live_state['fear_greed']))
+    payload['label'] = analyzer.get_sentiment_label(payload['overall_score'])
+    return _to_builtin(payload)
+
+
+class SentimentSnapshotService:
+    """Current sentiment for every tracked coin, recomputed on a schedule and read from memory.
+
+    `refresh()` reads the last `window_hours` of rollups for all coins in one grouped query,
+    builds each coin's payload and swaps in a new table of serialized bodies and ETags, so
+    serving a dashboard is a dict lookup however many coins it shows. A table older than
+    `max_age` seconds is refreshed by the first request that notices, for callers without
+    a scheduler; concurrent requests keep serving the old table meanwhile. Coins asked for
+    with `current()` that aren't tracked yet are computed on their own and added to the table.
+    """
+
+    def __init__(self, coins=None, analyzer=None, db=None, window_hours=SNAPSHOT_WINDOW_HOURS,
+                 max_age=SNAPSHOT_REFRESH_SECONDS, alert_engine=None):
+        self.coins = [coin.lower() for coin in (coins or get_forecast_coins())]
+        self.analyzer = analyzer or SentimentAnalyzer()
+        self.db = db or get_database()
+        self.window_hours = window_hours
+        self.max_age = max_age
+        self.alert_engine = alert_engine
+        self._table = None
+        self._refreshed = None
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, now=None):
+        """Recompute every tracked coin's snapshot; returns a summary of the run"""
+        with self._refresh_lock:
+            return self._refresh(now)
+
+    def _refresh(self, now=None):
+        started = time.perf_counter()
+        generated_at = now or datetime.utcnow()
+        summaries = self.db.get_sentiment_source_summaries(generated_at - timedelta(hours=self.window_hours))
+        live_states = self.alert_engine.states() if self.alert_engine is not None else {}
+
+        coins = {}
+        for coin in list(self.coins):
+            payload = self._build(coin, summaries, generated_at, live_states)
+            if payload is not None:
+                coins[coin] = payload
+
+        self._table = self._make_table(generated_at, coins)
+        self._refreshed = time.monotonic()
+        return {
+            'coins': len(coins),
+            'simulated': sum(payload['simulated'] for payload in coins.values()),
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def _build(self, coin, summaries, generated_at, live_states):
+        symbol = get_coin_symbol(coin)
+        try:
+            return build_coin_snapshot(coin, summaries.get(symbol), self.analyzer, generated_at,
+                                       self.window_hours, live_states.get(symbol))
+        except Exception as e:
+            print(f"Error building sentiment snapshot for {coin}: {str(e)}")
+            return None
+
+    def _make_table(self, generated_at, coins):
+        document = {'generated_at': generated_at.isoformat(), 'window_hours': self.window_hours, 'coins': coins}
+        # Serialize once per refresh; requests just hand out the bytes
+        body = json.dumps(document, separators=(',', ':')).encode()
+        entries = {}
+        for coin, payload in coins.items():
+            coin_body = json.dumps(payload, separators=(',', ':')).encode()
+            entries[coin] = (coin_body, make_etag(coin_body))
+            entries.setdefault(payload['symbol'].lower(), entries[coin])
+        return {'generated_at': generated_at, 'body': body, 'etag': make_etag(body), 'coins': coins,
+                'entries': entries}
+
+    def _stale(self):
+        return bool(self.max_age) and time.monotonic() - self._refreshed > self.max_age
+
+    def _current_table(self):
+        if self._table is None:
+            with self._refresh_lock:
+                if self._table is None:
+                    self._refresh()
+        elif self._stale() and self._refresh_lock.acquire(blocking=False):
+            # One request refreshes; the rest keep serving the old table until it is swapped
+            try:
+                if self._stale():
+                    self._refresh()
+            finally:
+                self._refresh_lock.release()
+        return self._table
+
+    def _add_coin(self, coin):
+        """Compute one untracked coin and add it to the current table"""
+        with self._refresh_lock:
+            if coin in self.coins:
+                return
+            self.coins.append(coin)
+            if self._table is None:
+                self._refresh()
+                return
+            symbol = get_coin_symbol(coin)
+            generated_at = datetime.utcnow()
+            summaries = self.db.get_sentiment_source_summaries(
+                generated_at - timedelta(hours=self.window_hours), symbols=[symbol]
+            )
+            live_states = {symbol: self.alert_engine.state(symbol)} if self.alert_engine is not None else {}
+            payload = self._build(coin, summaries, generated_at, live_states)
+            if payload is not None:
+                coins = dict(self._table['coins'], **{coin: payload})
+                self._table = self._make_table(self._table['generated_at'], coins)
+
+    def get(self, coin=None):
+        """(body, etag) for all coins, or for one coin id or symbol; None if it isn't tracked"""
+        table = self._current_table()
+        if coin is None:
+            return table['body'], table['etag']
+        return table['entries'].get(coin.lower())
+
+    def current(self, coin):
+        """One coin's snapshot as a dict, tracking and computing the coin if it is new"""
+        coin = coin.lower()
+        if coin not in self.coins:
+            self._add_coin(coin)
+        return self._current_table()['coins'].get(coin)
+
+    def table(self):
+        """Every tracked coin's snapshot, by coin id"""
+        return dict(self._current_table()['coins'])
+
+    def run_forever(self, interval_seconds, stop_event=None):
+        """Refresh every `interval_seconds` until `stop_event` is set"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            started = time.monotonic()
+            try:
+                print(f"Sentiment snapshot refreshed: {self.refresh()}")
+            except Exception as e:
+                print(f"Error refreshing sentiment snapshot: {str(e)}")
+            stop_event.wait(max(0.0, interval_seconds - (time.monotonic() - started)))
+
+    def start(self, interval_seconds):
+        """Refresh on a daemon thread; returns the Event that stops it"""
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=self.run_forever, args=(interval_seconds, stop_event),
+            name='sentiment-snapshot', daemon=True
+        )
+        thread.start()
+        return stop_event
+
+
+# Global snapshot service instance
+sentiment_snapshot_service = None
+
+
+def get_sentiment_snapshot_service():
+    """Get sentiment snapshot service instance"""
+    global sentiment_snapshot_service
+    if sentiment_snapshot_service is None:
+        sentiment_snapshot_service = SentimentSnapshotService()
+    return sentiment_snapshot_service
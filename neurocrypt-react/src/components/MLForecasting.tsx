@@ -3,7 +3,25 @@
 import { useState, useEffect } from 'react'
 import { Bot, TrendingUp, TrendingDown, Calendar, Target, BarChart3, Brain, Zap, Shield, AlertTriangle } from 'lucide-react'
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, BarChart, Bar, ComposedChart, Legend } from 'recharts'
-import { getTopCryptoPrices } from '@/lib/api'
+import { getForecast, getTopCryptoPrices } from '@/lib/api'
+
+// Binance pairs and model names as the coin ids and model types backend/forecast_api.py serves
+const FORECAST_COIN_IDS: Record<string, string> = {
+  BTCUSDT: 'bitcoin',
+  ETHUSDT: 'ethereum',
+  BNBUSDT: 'binancecoin',
+  ADAUSDT: 'cardano',
+  SOLUSDT: 'solana'
+}
+const FORECAST_MODEL_TYPES: Record<string, string> = {
+  'Ensemble Model': 'ensemble',
+  'LSTM Neural Network': 'lstm',
+  'Random Forest': 'random_forest',
+  'XGBoost': 'xgboost'
+}
+
+const formatMetric = (value: number | undefined, digits: number) =>
+  value === undefined || value === null ? '—' : value.toFixed(digits)
 
 export default function MLForecasting() {
   const [selectedCrypto, setSelectedCrypto] = useState<string>('BTCUSDT')
@@ -74,6 +92,31 @@ export default function MLForecasting() {
       
       setHistoricalData(historical)
 
+      // Precomputed forecast from the backend when it has one for this coin and model
+      const coinId = FORECAST_COIN_IDS[selectedCrypto]
+      const forecastModel = FORECAST_MODEL_TYPES[modelType]
+      if (coinId && forecastModel) {
+        try {
+          const forecast = await getForecast(coinId, forecastModel)
+          setModelMetrics(forecast.metrics)
+          setPredictionData({
+            predictions: forecast.dates.slice(0, predictionDays).map((date, i) => ({
+              date,
+              price: forecast.predictions[i]
+            })),
+            ...forecast.metrics,
+            current_price: forecast.last_price,
+            confidence: forecast.confidence ?? 0,
+            volatility: forecast.volatility ?? 0,
+            generated_at: forecast.generated_at,
+            simulated: false
+          })
+          return
+        } catch (error) {
+          console.warn('Forecast service unavailable, showing a simulated forecast:', error)
+        }
+      }
+
       // Simulate ML prediction results based on real data
       const currentPrice = historical[historical.length - 1].price
       const predictions = []
@@ -103,7 +146,9 @@ export default function MLForecasting() {
       setModelMetrics(metrics)
       setPredictionData({
         predictions: predictions,
-        ...metrics
+        ...metrics,
+        current_price: currentPrice,
+        simulated: true
       })
 
     } catch (error) {
@@ -252,6 +297,9 @@ export default function MLForecasting() {
                                   <h2 className="text-2xl font-bold ml-3">
                   {modelType} Predictions: {selectedCryptoData?.symbol || selectedCrypto}
                 </h2>
+                  {predictionData.simulated && (
+                    <span className="ml-3 px-2 py-1 text-xs bg-yellow-900/40 text-yellow-400 rounded">Simulated</span>
+                  )}
                 </div>
                 <div className="text-right">
                   <div className="text-sm text-gray-400">Model Confidence</div>
@@ -266,7 +314,7 @@ export default function MLForecasting() {
                 <div className="bg-gray-700 rounded-lg p-4 text-center">
                   <div className="text-sm text-gray-400 mb-1">Current Price</div>
                   <div className="text-xl font-bold">
-                    ${historicalData[historicalData.length - 1]?.price.toLocaleString()}
+                    ${predictionData.current_price?.toLocaleString()}
                   </div>
                 </div>
                 <div className="bg-gray-700 rounded-lg p-4 text-center">
@@ -278,7 +326,7 @@ export default function MLForecasting() {
                 <div className="bg-gray-700 rounded-lg p-4 text-center">
                   <div className="text-sm text-gray-400 mb-1">Price Change</div>
                   <div className="text-xl font-bold text-green-400">
-                    +{((predictionData.predictions[predictionData.predictions.length - 1]?.price / historicalData[historicalData.length - 1]?.price - 1) * 100).toFixed(2)}%
+                    +{((predictionData.predictions[predictionData.predictions.length - 1]?.price / predictionData.current_price - 1) * 100).toFixed(2)}%
                   </div>
                 </div>
                 <div className="bg-gray-700 rounded-lg p-4 text-center">
@@ -348,27 +396,27 @@ export default function MLForecasting() {
               <div className="grid grid-cols-2 md:grid-cols-3 gap-4">
                 <div className="bg-gray-700 rounded-lg p-4">
                   <div className="text-sm text-gray-400 mb-1">RMSE</div>
-                  <div className="text-lg font-bold">{predictionData.rmse.toFixed(2)}</div>
+                  <div className="text-lg font-bold">{formatMetric(predictionData.rmse, 2)}</div>
                 </div>
                 <div className="bg-gray-700 rounded-lg p-4">
                   <div className="text-sm text-gray-400 mb-1">MAE</div>
-                  <div className="text-lg font-bold">{predictionData.mae.toFixed(2)}</div>
+                  <div className="text-lg font-bold">{formatMetric(predictionData.mae, 2)}</div>
                 </div>
                 <div className="bg-gray-700 rounded-lg p-4">
                   <div className="text-sm text-gray-400 mb-1">R² Score</div>
-                  <div className="text-lg font-bold">{predictionData.r2_score.toFixed(3)}</div>
+                  <div className="text-lg font-bold">{formatMetric(predictionData.r2_score, 3)}</div>
                 </div>
                 <div className="bg-gray-700 rounded-lg p-4">
                   <div className="text-sm text-gray-400 mb-1">MAPE</div>
-                  <div className="text-lg font-bold">{predictionData.mape.toFixed(2)}%</div>
+                  <div className="text-lg font-bold">{formatMetric(predictionData.mape, 2)}%</div>
                 </div>
                 <div className="bg-gray-700 rounded-lg p-4">
                   <div className="text-sm text-gray-400 mb-1">Sharpe Ratio</div>
-                  <div className="text-lg font-bold">{predictionData.sharpe_ratio.toFixed(2)}</div>
+                  <div className="text-lg font-bold">{formatMetric(predictionData.sharpe_ratio, 2)}</div>
                 </div>
                 <div className="bg-gray-700 rounded-lg p-4">
                   <div className="text-sm text-gray-400 mb-1">Max Drawdown</div>
-                  <div className="text-lg font-bold">{predictionData.max_drawdown.toFixed(2)}%</div>
+                  <div className="text-lg font-bold">{formatMetric(predictionData.max_drawdown, 2)}%</div>
                 </div>
               </div>
             </div>
@@ -474,7 +522,7 @@ export default function MLForecasting() {
         {/* Footer */}
         <div className="text-center py-8 text-gray-400 text-sm">
           <div className="flex items-center justify-center space-x-4">
-            <span>Model Last Updated: {new Date().toLocaleDateString()}</span>
+            <span>Model Last Updated: {new Date(predictionData?.generated_at ?? Date.now()).toLocaleDateString()}</span>
             <span>•</span>
             <span>Data Points Used: {historicalData.length}</span>
             <span>•</span>
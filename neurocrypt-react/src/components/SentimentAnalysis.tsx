@@ -2,6 +2,10 @@
 
 import { useState, useEffect } from 'react'
 import { MessageSquare, TrendingUp, TrendingDown, Activity, BarChart3 } from 'lucide-react'
+import { getSentimentSnapshot, SentimentSnapshot } from '@/lib/api'
+
+// Snapshot labels as the market moods shown on this page
+const MOODS: Record<string, string> = { Positive: 'Bullish', Negative: 'Bearish', Neutral: 'Neutral' }
 
 export default function SentimentAnalysis() {
   const [cryptos, setCryptos] = useState<any[]>([]) // Placeholder for cryptos data
@@ -12,6 +16,7 @@ export default function SentimentAnalysis() {
     neutral: 15,
     overall: 'Bullish'
   })
+  const [snapshot, setSnapshot] = useState<SentimentSnapshot | null>(null)
 
   useEffect(() => {
     // fetchCryptos() // Removed as per edit hint
@@ -19,6 +24,21 @@ export default function SentimentAnalysis() {
 
   // Removed fetchCryptos function
 
+  useEffect(() => {
+    let cancelled = false
+    getSentimentSnapshot(selectedCrypto)
+      .then((data) => {
+        if (cancelled) return
+        setSnapshot(data)
+        setSentimentData((previous) => ({
+          ...(data.shares ?? previous),
+          overall: MOODS[data.label] ?? 'Neutral'
+        }))
+      })
+      .catch(() => setSnapshot(null))
+    return () => { cancelled = true }
+  }, [selectedCrypto])
+
   const getSentimentColor = (sentiment: string) => {
     switch (sentiment.toLowerCase()) {
       case 'bullish':
@@ -38,6 +58,15 @@ export default function SentimentAnalysis() {
     { source: 'Discord', sentiment: 'Bullish', score: 75, volume: 320000 }
   ]
 
+  const sourceSentiment = snapshot && snapshot.sources.length > 0
+    ? snapshot.sources.map((source) => ({
+        source: source.source.charAt(0).toUpperCase() + source.source.slice(1),
+        sentiment: MOODS[source.label] ?? 'Neutral',
+        score: Math.round(50 + 50 * source.mean_score),
+        volume: source.sample_count
+      }))
+    : mockSentimentData
+
   return (
     <div className="min-h-screen bg-gray-900 pt-16">
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
@@ -104,7 +133,7 @@ export default function SentimentAnalysis() {
           <div className="bg-gray-800 rounded-lg p-6">
             <h2 className="text-xl font-semibold text-white mb-4">Sentiment by Source</h2>
             <div className="space-y-3">
-              {mockSentimentData.map((source, index) => (
+              {sourceSentiment.map((source, index) => (
                 <div key={index} className="bg-gray-700 rounded-lg p-3">
                   <div className="flex items-center justify-between mb-2">
                     <span className="text-white font-medium">{source.source}</span>
@@ -254,4 +254,74 @@ export async function getCryptoHistory(symbol: string, interval: string = '1d',
   }))
 }
 
-// Remove getTopStockPrices from here; move Finnhub logic to /api/stock API route for server-side execution 
\ No newline at end of file
+// Remove getTopStockPrices from here; move Finnhub logic to /api/stock API route for server-side execution 
+// Precomputed ML forecasts served by backend/forecast_api.py
+const FORECAST_API_URL = process.env.NEXT_PUBLIC_FORECAST_API_URL || 'http://localhost:5003'
+
+export interface ForecastData {
+  coin: string
+  model_type: string
+  generated_at: string
+  last_price: number
+  dates: string[]
+  predictions: number[]
+  confidence: number | null
+  volatility: number | null
+  metrics: Record<string, number>
+  intervals?: { p5: number[], p50: number[], p95: number[] }
+}
+
+// Last response per URL, so unchanged forecasts come back as an empty 304
+const forecastCache = new Map<string, { etag: string, data: ForecastData }>()
+
+export async function getForecast(coin: string, modelType: string): Promise<ForecastData> {
+  const url = `${FORECAST_API_URL}/forecast/${coin}/${modelType}`
+  const cached = forecastCache.get(url)
+  const response = await fetch(url, {
+    headers: cached ? { 'If-None-Match': cached.etag } : {},
+    cache: 'no-store'
+  })
+  if (response.status === 304 && cached) return cached.data
+  if (!response.ok) throw new Error(`No ${modelType} forecast available for ${coin}`)
+  const data: ForecastData = await response.json()
+  const etag = response.headers.get('ETag')
+  if (etag) forecastCache.set(url, { etag, data })
+  return data
+}
+
+// Current sentiment per coin, refreshed on a schedule by backend/sentiment_api.py
+const SENTIMENT_API_URL = process.env.NEXT_PUBLIC_SENTIMENT_API_URL || 'http://localhost:5004'
+
+export interface SentimentSnapshot {
+  coin: string
+  symbol: string
+  generated_at: string
+  window_hours: number
+  simulated: boolean
+  overall_score: number
+  label: 'Positive' | 'Negative' | 'Neutral'
+  news_sentiment: number
+  social_sentiment: number
+  fear_greed_index: number
+  sample_count: number
+  shares: { positive: number, negative: number, neutral: number } | null
+  sources: { source: string, sample_count: number, mean_score: number, label: string }[]
+  updated_at: string | null
+}
+
+const sentimentCache = new Map<string, { etag: string, data: SentimentSnapshot }>()
+
+export async function getSentimentSnapshot(coin: string): Promise<SentimentSnapshot> {
+  const url = `${SENTIMENT_API_URL}/sentiment/snapshot/${coin}`
+  const cached = sentimentCache.get(url)
+  const response = await fetch(url, {
+    headers: cached ? { 'If-None-Match': cached.etag } : {},
+    cache: 'no-store'
+  })
+  if (response.status === 304 && cached) return cached.data
+  if (!response.ok) throw new Error(`No sentiment snapshot available for ${coin}`)
+  const data: SentimentSnapshot = await response.json()
+  const etag = response.headers.get('ETag')
+  if (etag) sentimentCache.set(url, { etag, data })
+  return data
+}